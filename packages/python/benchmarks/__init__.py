@@ -0,0 +1,12 @@
+"""
+Benchmarks
+
+This package contains deterministic generators of synthetic DDPs for every platform in port.platforms,
+and a runner that times validation, extraction and serialization of these DDPs at multiple sizes.
+benchmarks.startup profiles the imports before the first prompt against an import budget.
+
+Usage::
+
+    python -m benchmarks --scales 1 10 100
+    python -m benchmarks.startup
+"""
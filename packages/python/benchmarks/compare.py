@@ -0,0 +1,249 @@
+"""
+Benchmark comparator
+
+Runs the benchmarks, saves the results in the results store and compares wall time and peak memory
+per case, scale and stage against a baseline. Exits with 1 if any stage regressed.
+
+A stage regressed when the difference with the baseline exceeds all of:
+
+* a relative threshold (--time-threshold, --memory-threshold)
+* an absolute minimum (--min-time, --min-memory), small stages are dominated by noise
+* for wall time only: --noise-factor times the spread of the samples of the baseline or the current run
+
+Usage::
+
+    python -m benchmarks --save                      # on the baseline commit
+    python -m benchmarks.compare --baseline main     # on the commit under test
+    python -m benchmarks.compare --baseline main --current HEAD   # compare stored results, without running
+"""
+from dataclasses import dataclass
+from typing import Any
+import argparse
+import statistics
+import sys
+
+from benchmarks import runner, store
+
+
+OK = "ok"
+REGRESSION = "REGRESSION"
+IMPROVED = "improved"
+NEW = "new"
+MISSING = "missing"
+
+
+@dataclass
+class Thresholds:
+    time: float = 0.10
+    memory: float = 0.10
+    min_time: float = 0.002
+    min_memory: int = 256 * 1024
+    noise_factor: float = 3.0
+
+
+@dataclass
+class Comparison:
+    case: str
+    scale: int
+    stage: str
+    metric: str
+    baseline: float | None
+    current: float | None
+    status: str
+
+    @property
+    def change(self) -> float | None:
+        if not self.baseline or self.current is None:
+            return None
+        return (self.current - self.baseline) / self.baseline
+
+
+def spread(samples: list[float]) -> float:
+    """
+    Robust estimate of the standard deviation of samples: the scaled median absolute deviation
+    A single outlier, for example a garbage collection, does not widen the threshold
+    """
+    if len(samples) < 2:
+        return 0.0
+    median = statistics.median(samples)
+    return 1.4826 * statistics.median(abs(sample - median) for sample in samples)
+
+
+def classify(baseline: float, current: float, allowed: float) -> str:
+    if current - baseline > allowed:
+        return REGRESSION
+    if baseline - current > allowed:
+        return IMPROVED
+    return OK
+
+
+def index(report: dict[str, Any]) -> dict[tuple[str, int, str], dict[str, Any]]:
+    return {
+        (result["case"], result["scale"], stage): stage_result
+        for result in report["results"]
+        for stage, stage_result in result["stages"].items()
+    }
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    thresholds: Thresholds = Thresholds(),
+) -> list[Comparison]:
+    """
+    Compares two reports of benchmarks.runner, see the module docstring for when a stage regressed
+    """
+    baseline_index = index(baseline)
+    current_index = index(current)
+
+    comparisons = []
+    for key in sorted(baseline_index.keys() | current_index.keys()):
+        case, scale, stage = key
+        b = baseline_index.get(key)
+        c = current_index.get(key)
+
+        if b is None or c is None:
+            status = NEW if b is None else MISSING
+            comparisons.append(Comparison(case, scale, stage, "time", b and b["seconds"], c and c["seconds"], status))
+            continue
+
+        noise = max(spread(b["samples"]), spread(c["samples"]))
+        allowed = max(b["seconds"] * thresholds.time, thresholds.noise_factor * noise, thresholds.min_time)
+        status = classify(b["seconds"], c["seconds"], allowed)
+        comparisons.append(Comparison(case, scale, stage, "time", b["seconds"], c["seconds"], status))
+
+        if b.get("peak_bytes") is not None and c.get("peak_bytes") is not None:
+            allowed = max(b["peak_bytes"] * thresholds.memory, thresholds.min_memory)
+            status = classify(b["peak_bytes"], c["peak_bytes"], allowed)
+            comparisons.append(Comparison(case, scale, stage, "memory", b["peak_bytes"], c["peak_bytes"], status))
+
+    return comparisons
+
+
+def format_value(metric: str, value: float | None) -> str:
+    if value is None:
+        return "-"
+    if metric == "time":
+        return f"{value * 1000:.2f} ms"
+    return f"{value / 2**20:.2f} MiB"
+
+
+def format_table(comparisons: list[Comparison]) -> str:
+    header = ("case", "scale", "stage", "metric", "baseline", "current", "change", "status")
+    rows = [header]
+    for comparison in comparisons:
+        change = "-" if comparison.change is None else f"{comparison.change:+.1%}"
+        rows.append((
+            comparison.case,
+            f"{comparison.scale}x",
+            comparison.stage,
+            comparison.metric,
+            format_value(comparison.metric, comparison.baseline),
+            format_value(comparison.metric, comparison.current),
+            change,
+            comparison.status,
+        ))
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = [
+        "  ".join(cell.ljust(width) if i < 4 else cell.rjust(width) for i, (cell, width) in enumerate(zip(row, widths)))
+        for row in rows
+    ]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.compare",
+        description="Compare benchmark results against a baseline",
+    )
+    parser.add_argument("--baseline", required=True, help="commit or path of the baseline results")
+    parser.add_argument(
+        "--current",
+        help="commit or path of stored results to compare, instead of running the benchmarks",
+    )
+    parser.add_argument(
+        "--no-save",
+        action="store_true",
+        help="do not save the results of the run in the results store",
+    )
+    parser.add_argument(
+        "--save-dirty",
+        action="store_true",
+        help="save the results of a working tree with uncommitted changes, as <commit>-dirty.json",
+    )
+    parser.add_argument("--all", action="store_true", help="show all comparisons, not only the ones that changed")
+    parser.add_argument(
+        "--time-threshold",
+        type=float,
+        default=Thresholds.time,
+        help="allowed relative increase of wall time (default: 0.10)",
+    )
+    parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=Thresholds.memory,
+        help="allowed relative increase of peak memory (default: 0.10)",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=Thresholds.min_time,
+        help="differences in seconds below this are ignored (default: 0.002)",
+    )
+    parser.add_argument(
+        "--min-memory",
+        type=int,
+        default=Thresholds.min_memory,
+        help="differences in bytes below this are ignored (default: 262144)",
+    )
+    parser.add_argument(
+        "--noise-factor",
+        type=float,
+        default=Thresholds.noise_factor,
+        help="allowed increase in spreads of the samples (default: 3)",
+    )
+    runner.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        baseline = store.load(args.baseline)
+        if args.current:
+            current = store.load(args.current)
+        else:
+            current = runner.run_from_arguments(args, parser)
+            if not args.no_save and store.current_commit()[1] and not args.save_dirty:
+                print("Results not saved, the working tree has uncommitted changes, see --save-dirty")
+            elif not args.no_save:
+                print(f"Saved results to {store.save(current, allow_dirty=args.save_dirty)}")
+    except ValueError as e:
+        parser.error(str(e))
+
+    if baseline["environment"] != current["environment"]:
+        print(
+            "Warning: results were measured in different environments: "
+            f"{baseline['environment']} and {current['environment']}"
+        )
+
+    thresholds = Thresholds(
+        args.time_threshold, args.memory_threshold, args.min_time, args.min_memory, args.noise_factor,
+    )
+    comparisons = compare(baseline, current, thresholds)
+    shown = comparisons if args.all else [c for c in comparisons if c.status != OK]
+
+    print()
+    if shown:
+        print(format_table(shown))
+    else:
+        print("No changes beyond the thresholds")
+
+    regressions = [c for c in comparisons if c.status == REGRESSION]
+    against = baseline.get("commit", args.baseline)
+    print(f"\n{len(regressions)} regressions in {len(comparisons)} comparisons against {against}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
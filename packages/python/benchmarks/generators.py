@@ -0,0 +1,579 @@
+"""
+Synthetic DDP generators
+
+Every generator writes a DDP of n items to path and returns path.
+The DDPs follow the structure the extraction functions in port.platforms expect,
+the content is generated from a seeded random number generator, so the same (n, seed) always produces the same file.
+
+Strings in Meta DDPs (Facebook and Instagram) are encoded the way Meta encodes them:
+utf-8 bytes escaped as latin-1 code points, so the mojibake repair in the extraction is exercised.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+import json
+import random
+import re
+import zipfile
+
+from port.platforms.whatsapp import SIMPLIFIED_REGEXES
+
+
+START = datetime(2023, 1, 1, 8, 0, 0, tzinfo=timezone.utc)
+
+WORDS = [
+    "data", "donation", "research", "privacy", "video", "music", "holiday", "coffee", "weather", "football",
+    "recipe", "election", "science", "travel", "concert", "book", "movie", "game", "school", "work",
+    "café", "naïve", "über", "smörgåsbord", "jalapeño",
+]
+
+EMOJIS = ["😀", "😂", "👍", "❤️", "🎉", "🙈", "🔥", "🥳"]
+
+NAMES = ["Anna de Vries", "Bram Jansen", "Chloé Bakker", "Daan Visser", "Eva Smit", "Finn Meijer"]
+
+
+def words(rng: random.Random, k: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(k))
+    if rng.random() < 0.2:
+        text += " " + rng.choice(EMOJIS)
+    return text
+
+
+def timestamp(i: int) -> int:
+    return int((START + timedelta(minutes=7 * i)).timestamp())
+
+
+def iso(i: int) -> str:
+    return (START + timedelta(minutes=7 * i)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def meta_string(s: str) -> str:
+    """
+    Encodes a string the way Meta does in its DDPs
+    """
+    return s.encode("utf-8").decode("latin1")
+
+
+def write_zip(path: str, members: dict[str, str | bytes]) -> str:
+    """
+    Writes members to a zip, with a fixed modification time so the zip is identical byte for byte on every run
+    """
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, content in members.items():
+            info = zipfile.ZipInfo(name, date_time=START.timetuple()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(info, content)
+    return path
+
+
+def chatgpt(path: str, n: int, seed: int = 0) -> str:
+    """
+    conversations.json with n conversations of 1 to 4 question answer pairs
+    """
+    rng = random.Random(seed)
+    conversations = []
+
+    for i in range(n):
+        mapping = {
+            f"root-{i}": {"id": f"root-{i}", "message": None, "parent": None, "children": []},
+        }
+        parent = f"root-{i}"
+        for turn in range(rng.randint(1, 4)):
+            for role in ("user", "assistant"):
+                node = f"{role}-{i}-{turn}"
+                mapping[parent]["children"].append(node)
+                mapping[node] = {
+                    "id": node,
+                    "message": {
+                        "id": node,
+                        "author": {"role": role, "name": None, "metadata": {}},
+                        "create_time": timestamp(i) + turn,
+                        "content": {"content_type": "text", "parts": [words(rng, rng.randint(5, 60))]},
+                        "metadata": {"model_slug": "gpt-4o"} if role == "assistant" else {},
+                    },
+                    "parent": parent,
+                    "children": [],
+                }
+                parent = node
+
+        conversations.append({
+            "title": words(rng, 3),
+            "create_time": timestamp(i),
+            "mapping": mapping,
+            "current_node": parent,
+        })
+
+    return write_zip(path, {
+        "conversations.json": json.dumps(conversations),
+        "user.json": json.dumps({"id": "user-benchmark"}),
+        "message_feedback.json": "[]",
+    })
+
+
+def whatsapp_formats() -> list[str]:
+    """
+    Returns the line templates of all SIMPLIFIED_REGEXES, except the catch all fallback
+    """
+    templates = []
+    for simplified_regex in SIMPLIFIED_REGEXES:
+        if "(?P<" in simplified_regex:
+            continue
+        template = simplified_regex.removeprefix("^").removesuffix("$")
+        template = template.replace(r"\[", "[").replace(r"\]", "]")
+        templates.append(template)
+    return templates
+
+
+def whatsapp_line(template: str, moment: datetime, name: str, message: str) -> str:
+    hour = moment.hour
+    if "%P" in template:
+        hour = hour % 12 or 12
+
+    codes = {
+        "%d": f"{moment.day:02d}",
+        "%m": f"{moment.month:02d}",
+        "%y": f"{moment.year % 100:02d}",
+        "%H": f"{hour:02d}",
+        "%M": f"{moment.minute:02d}",
+        "%S": f"{moment.second:02d}",
+        "%P": "PM" if moment.hour >= 12 else "AM",
+        "%name": name,
+        "%chat_message": message,
+    }
+    return re.sub(r"%\w+", lambda m: codes[m.group(0)], template)
+
+
+def whatsapp(path: str, n: int, seed: int = 0, chat_format: int = 0) -> str:
+    """
+    Group chat of n messages in the format whatsapp_formats()[chat_format], zipped as exported by WhatsApp
+
+    Every tenth message continues on a second line.
+    """
+    rng = random.Random(seed)
+    template = whatsapp_formats()[chat_format]
+    names = NAMES[:4]
+
+    lines = []
+    for i in range(n):
+        moment = START + timedelta(minutes=7 * i)
+        lines.append(whatsapp_line(template, moment, rng.choice(names), words(rng, rng.randint(1, 25))))
+        if i % 10 == 9:
+            lines.append(words(rng, rng.randint(1, 10)))
+
+    return write_zip(path, {"_chat.txt": "\n".join(lines) + "\n"})
+
+
+def netflix(path: str, n: int, seed: int = 0) -> str:
+    """
+    Netflix DDP with two profiles, n viewing activities and n / 4 ratings
+    """
+    rng = random.Random(seed)
+    profiles = ["Benchmark", "Kids"]
+    titles = [f"Series {i}: Season 1: Episode {j}" for i in range(20) for j in range(1, 9)]
+
+    viewing_activity = [
+        "Profile Name,Start Time,Duration,Attributes,Title,Supplemental Video Type,Device Type,"
+        "Bookmark,Latest Bookmark,Country"
+    ]
+    for i in range(n):
+        moment = (START + timedelta(minutes=53 * i)).strftime("%Y-%m-%d %H:%M:%S")
+        duration = f"{rng.randint(0, 2):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+        video_type = rng.choice(["", "", "", "", "TRAILER", "HOOK"])
+        viewing_activity.append(
+            f"{rng.choice(profiles)},{moment},{duration},,\"{rng.choice(titles)}\",{video_type},"
+            f"Chrome PC (Cadmium),{duration},{duration},NL (Netherlands)"
+        )
+
+    ratings = [
+        "Profile Name,Title Name,Rating Type,Star Value,Thumbs Value,Device Model,Event Utc Ts,Region View Date"
+    ]
+    for i in range(max(n // 4, 1)):
+        moment = (START + timedelta(hours=31 * i)).strftime("%Y-%m-%d %H:%M:%S")
+        ratings.append(
+            f"{rng.choice(profiles)},\"{rng.choice(titles)}\",thumb,,{rng.randint(0, 3)},Chrome PC (Cadmium),{moment},"
+        )
+
+    return write_zip(path, {
+        "netflix-report/CONTENT_INTERACTION/ViewingActivity.csv": "\n".join(viewing_activity) + "\n",
+        "netflix-report/CONTENT_INTERACTION/Ratings.csv": "\n".join(ratings) + "\n",
+        "netflix-report/CONTENT_INTERACTION/MyList.csv": "Profile Name,Title Name,Country,Utc Title Add Date\n",
+        "netflix-report/CONTENT_INTERACTION/SearchHistory.csv": (
+            "Profile Name,Country Iso Code,Device,Is Kids,Query Typed,Displayed Name,Action,Section,Utc Timestamp\n"
+        ),
+    })
+
+
+def facebook(path: str, n: int, seed: int = 0) -> str:
+    """
+    Facebook DDP with n items in every supported JSON file
+    """
+    rng = random.Random(seed)
+
+    def meta_words(k: int) -> str:
+        return meta_string(words(rng, k))
+
+    def named(key: str) -> dict[str, Any]:
+        return {key: [{"name": meta_string(rng.choice(NAMES)), "timestamp": timestamp(i)} for i in range(n)]}
+
+    activity = "your_facebook_activity"
+    members = {
+        f"{activity}/search/your_search_history.json": {"searches_v2": [
+            {
+                "timestamp": timestamp(i),
+                "attachments": [{"data": [{"text": meta_words(2)}]}],
+                "data": [{"text": meta_words(2)}],
+                "title": "You searched Facebook",
+            }
+            for i in range(n)
+        ]},
+        f"{activity}/comments_and_reactions/likes_and_reactions_1.json": [
+            {
+                "timestamp": timestamp(i),
+                "data": [{"reaction": {
+                    "reaction": rng.choice(["LIKE", "LOVE", "HAHA"]),
+                    "actor": meta_string(NAMES[0]),
+                }}],
+                "title": meta_words(6),
+            }
+            for i in range(n)
+        ],
+        f"{activity}/comments_and_reactions/comments.json": {"comments_v2": [
+            {
+                "timestamp": timestamp(i),
+                "data": [{"comment": {
+                    "timestamp": timestamp(i),
+                    "comment": meta_words(12),
+                    "author": meta_string(NAMES[0]),
+                }}],
+                "title": meta_words(6),
+            }
+            for i in range(n)
+        ]},
+        f"{activity}/pages/pages_you_ve_liked.json": {"page_likes_v2": [
+            {"name": meta_words(2), "url": f"https://www.facebook.com/page{i}", "timestamp": timestamp(i)}
+            for i in range(n)
+        ]},
+        f"{activity}/pages/pages_and_profiles_you_follow.json": {"pages_followed_v2": [
+            {"timestamp": timestamp(i), "data": [{"name": meta_words(2)}], "title": meta_words(2)} for i in range(n)
+        ]},
+        f"{activity}/groups/your_group_membership_activity.json": {"groups_joined_v2": [
+            {"timestamp": timestamp(i), "data": [{"name": meta_words(2)}], "title": meta_words(4)} for i in range(n)
+        ]},
+        f"{activity}/posts/your_posts__check_ins__photos_and_videos_1.json": [
+            {"timestamp": timestamp(i), "data": [{"post": meta_words(20)}], "title": meta_words(4)} for i in range(n)
+        ],
+        "logged_information/notifications/notifications.json": {"notifications_v2": [
+            {
+                "timestamp": timestamp(i),
+                "unread": rng.random() < 0.5,
+                "href": f"https://www.facebook.com/n/{i}",
+                "text": meta_words(10),
+            }
+            for i in range(n)
+        ]},
+        "logged_information/other_logged_information/ads_interests.json": {
+            "topics_v2": [meta_words(2) for _ in range(n)],
+        },
+        "logged_information/interactions/recently_viewed.json": {"recently_viewed": [
+            {
+                "name": "Facebook Watch Videos and Shows",
+                "description": "Videos and shows you've visited or viewed",
+                "children": [
+                    {"name": "Time Viewed", "entries": [
+                        {
+                            "timestamp": timestamp(i),
+                            "data": {"uri": f"https://www.facebook.com/watch/?v={i}", "name": meta_words(5)},
+                        }
+                        for i in range(n)
+                    ]},
+                ],
+            },
+        ]},
+        "connections/friends/your_friends.json": named("friends_v2"),
+        "connections/followers/who_you_ve_followed.json": named("following_v3"),
+        "personal_information/profile_information/profile_information.json": {
+            "profile_v2": {"name": {"full_name": meta_string(NAMES[0])}},
+        },
+        "preferences/preferences/timezone.json": {"timezone_v2": "Europe/Amsterdam"},
+    }
+
+    return write_zip(path, {name: json.dumps(content) for name, content in members.items()})
+
+
+def instagram(path: str, n: int, seed: int = 0) -> str:
+    """
+    Instagram DDP with n items in every supported JSON file
+    """
+    rng = random.Random(seed)
+    accounts = [f"account_{i}" for i in range(50)]
+
+    def string_map_data(key: str) -> dict[str, Any]:
+        return {key: [
+            {"string_map_data": {"Author": {"value": rng.choice(accounts)}, "Time": {"timestamp": timestamp(i)}}}
+            for i in range(n)
+        ]}
+
+    def string_list_data(key: str, title: bool = False) -> dict[str, Any]:
+        return {key: [
+            {
+                "title": rng.choice(accounts) if title else "",
+                "media_list_data": [],
+                "string_list_data": [{
+                    "href": f"https://www.instagram.com/p/{i}",
+                    "value": "👍" if title else rng.choice(accounts),
+                    "timestamp": timestamp(i),
+                }],
+            }
+            for i in range(n)
+        ]}
+
+    members = {
+        "ads_information/ads_and_topics/posts_viewed.json": string_map_data("impressions_history_posts_seen"),
+        "ads_information/ads_and_topics/videos_watched.json": string_map_data("impressions_history_videos_watched"),
+        "ads_information/ads_and_topics/ads_viewed.json": string_map_data("impressions_history_ads_seen"),
+        "connections/followers_and_following/following.json": string_list_data("relationships_following"),
+        "your_instagram_activity/likes/liked_posts.json": string_list_data("likes_media_likes", title=True),
+        "your_instagram_activity/likes/liked_comments.json": string_list_data("likes_comment_likes", title=True),
+        "your_instagram_activity/comments/post_comments_1.json": [
+            {
+                "media_list_data": [{"uri": ""}],
+                "string_map_data": {
+                    "Comment": {"value": meta_string(words(rng, 8))},
+                    "Media Owner": {"value": rng.choice(accounts)},
+                    "Time": {"timestamp": timestamp(i)},
+                },
+            }
+            for i in range(n)
+        ],
+        "personal_information/personal_information/personal_information.json": {"profile_user": []},
+    }
+
+    return write_zip(path, {name: json.dumps(content).encode("utf-8") for name, content in members.items()})
+
+
+def x_js(file: str, items: list[Any]) -> str:
+    """
+    Formats items as an X .js file, for example: window.YTD.tweets.part0 = [...]
+    """
+    variable = file.removesuffix(".js").replace("-", "_")
+    return f"window.YTD.{variable}.part0 = " + json.dumps(items, indent=2, ensure_ascii=False)
+
+
+def x(path: str, n: int, seed: int = 0) -> str:
+    """
+    X DDP with n items in every supported .js file
+    """
+    rng = random.Random(seed)
+
+    def user(i: int) -> dict[str, str]:
+        return {"accountId": str(1000 + i), "userLink": f"https://twitter.com/intent/user?user_id={1000 + i}"}
+
+    members = {
+        "tweets.js": [
+            {"tweet": {
+                "id_str": str(i),
+                "created_at": (START + timedelta(minutes=7 * i)).strftime("%a %b %d %H:%M:%S +0000 %Y"),
+                "full_text": words(rng, rng.randint(3, 40)),
+                "retweeted": rng.random() < 0.1,
+                "entities": {"hashtags": [], "user_mentions": [], "urls": []},
+                "favorite_count": str(rng.randint(0, 99)),
+            }}
+            for i in range(n)
+        ],
+        "like.js": [
+            {"like": {
+                "tweetId": str(i),
+                "fullText": words(rng, 20),
+                "expandedUrl": f"https://twitter.com/i/web/status/{i}",
+            }}
+            for i in range(n)
+        ],
+        "follower.js": [{"follower": user(i)} for i in range(n)],
+        "following.js": [{"following": user(i)} for i in range(n)],
+        "block.js": [{"blocking": user(i)} for i in range(n)],
+        "mute.js": [{"muting": user(i)} for i in range(n)],
+        "tweet-headers.js": [
+            {"tweet": {"tweet_id": str(i), "user_id": "1", "created_at": iso(i)}} for i in range(n)
+        ],
+        "user-link-clicks.js": [
+            {"userInteractionsData": {"linkClick": {
+                "tweetId": str(i),
+                "finalUrl": f"https://example.org/{i}",
+                "timeStampOfInteraction": iso(i),
+            }}}
+            for i in range(n)
+        ],
+        "ad-engagements.js": [
+            {"ad": {"adsUserData": {"adEngagements": {"engagements": [
+                {"impressionAttributes": {
+                    "promotedTweetInfo": {"tweetId": str(i), "tweetText": words(rng, 15)},
+                    "impressionTime": iso(i),
+                }}
+            ]}}}}
+            for i in range(n)
+        ],
+        "personalization.js": [
+            {"p13nData": {"interests": {"interests": [
+                {"name": words(rng, 2), "isDisabled": rng.random() < 0.1} for _ in range(n)
+            ]}}}
+        ],
+        "account.js": [{"account": {"username": "benchmark", "accountId": "1"}}],
+    }
+
+    return write_zip(path, {f"data/{file}": x_js(file, items) for file, items in members.items()})
+
+
+def tiktok(path: str, n: int, seed: int = 0) -> str:
+    """
+    TikTok txt DDP with n entries in every supported file
+    """
+    rng = random.Random(seed)
+
+    def date(i: int) -> str:
+        return (START + timedelta(minutes=7 * i)).strftime("%Y-%m-%d %H:%M:%S")
+
+    def video(i: int) -> str:
+        return f"https://www.tiktokv.com/share/video/{7000000000000000000 + i}/"
+
+    def entries(fields: Callable[[int], list[str]]) -> str:
+        return "\n\n".join("\n".join(fields(i)) for i in range(n)) + "\n"
+
+    activity = "TikTok_Data/Activity"
+    members = {
+        f"{activity}/Browsing History.txt": entries(lambda i: [f"Date: {date(i)}", f"Link: {video(i)}"]),
+        f"{activity}/Like List.txt": entries(lambda i: [f"Date: {date(i)}", f"Link: {video(i)}"]),
+        f"{activity}/Favorite Videos.txt": entries(lambda i: [f"Date: {date(i)}", f"Link: {video(i)}"]),
+        f"{activity}/Favorite HashTags.txt": entries(
+            lambda i: [f"Date: {date(i)}", f"HashTag Link: https://www.tiktok.com/tag/{rng.choice(WORDS)}"]
+        ),
+        f"{activity}/Follower.txt": entries(lambda i: [f"Date: {date(i)}", f"Username: user{i}"]),
+        f"{activity}/Following.txt": entries(lambda i: [f"Date: {date(i)}", f"Username: user{i}"]),
+        f"{activity}/Hashtag.txt": entries(
+            lambda i: [f"Hashtag Name: {rng.choice(WORDS)}", f"Hashtag Link: https://www.tiktok.com/tag/{i}"]
+        ),
+        f"{activity}/Searches.txt": entries(lambda i: [f"Date: {date(i)}", f"Search Term: {words(rng, 2)}"]),
+        f"{activity}/Share History.txt": entries(lambda i: [
+            f"Date: {date(i)}",
+            "Shared Content: video",
+            f"Link: {video(i)}",
+            f"Method: {rng.choice(['whatsapp', 'copy', 'sms'])}",
+        ]),
+        f"{activity}/Login History.txt": entries(
+            lambda i: [f"Date: {date(i)}", "IP: 127.0.0.1", "DeviceModel: iPhone", "System: iOS 17"]
+        ),
+        "TikTok_Data/App Settings/Settings.txt": (
+            "Interests: " + "|".join(rng.choice(WORDS) for _ in range(max(n // 10, 1))) + "\n"
+        ),
+        "TikTok_Data/Profile/Profile Info.txt": "Profile Information\nUsername: benchmark\n",
+    }
+
+    return write_zip(path, members)
+
+
+def linkedin(path: str, n: int, seed: int = 0) -> str:
+    """
+    LinkedIn CSV DDP with n rows in every supported file, Connections.csv and Member_Follows.csv start with notes
+    """
+    rng = random.Random(seed)
+
+    def date(i: int) -> str:
+        return (START + timedelta(minutes=7 * i)).strftime("%Y-%m-%d %H:%M:%S")
+
+    def csv(header: str, row: Callable[[int], str], notes: bool = False) -> str:
+        lines = [header] + [row(i) for i in range(n)]
+        text = "\n".join(lines) + "\n"
+        if notes:
+            text = (
+                'Notes:\n"When exporting your connection data, '
+                'you may notice that some of the email addresses are missing."\n\n'
+                + text
+            )
+        return text
+
+    members = {
+        "Connections.csv": csv(
+            "First Name,Last Name,URL,Email Address,Company,Position,Connected On",
+            lambda i: (
+                f"{rng.choice(NAMES).split()[0]},Benchmark{i},https://www.linkedin.com/in/user{i},,"
+                f"Company {i % 40},{rng.choice(WORDS)},{(START + timedelta(days=i)).strftime('%d %b %Y')}"
+            ),
+            notes=True,
+        ),
+        "Member_Follows.csv": csv(
+            "Date,FullName,Status",
+            lambda i: f"{date(i)},{rng.choice(NAMES)},Active",
+            notes=True,
+        ),
+        "Company Follows.csv": csv("Organization,Followed On", lambda i: f"Company {i},{date(i)}"),
+        "Reactions.csv": csv(
+            "Date,Type,Link",
+            lambda i: (
+                f"{date(i)},{rng.choice(['LIKE', 'PRAISE', 'EMPATHY'])},"
+                f"https://www.linkedin.com/feed/update/urn:li:activity:{i}"
+            ),
+        ),
+        "Ads Clicked.csv": csv("Ad clicked Date,Ad Title/Id", lambda i: f"{date(i)},{i}"),
+        "SearchQueries.csv": csv("Time,Search Query", lambda i: f"{date(i)},{words(rng, 2)}"),
+        "Shares.csv": csv(
+            "Date,ShareLink,ShareCommentary,SharedUrl,MediaUrl,Visibility",
+            lambda i: (
+                f"{date(i)},https://www.linkedin.com/feed/update/urn:li:share:{i},\"{words(rng, 20)}\",,,MEMBER_NETWORK"
+            ),
+        ),
+        "Comments.csv": csv(
+            "Date,Link,Message",
+            lambda i: f"{date(i)},https://www.linkedin.com/feed/update/urn:li:activity:{i},\"{words(rng, 12)}\"",
+        ),
+        "Profile.csv": "First Name,Last Name\nBenchmark,User\n",
+    }
+
+    return write_zip(path, members)
+
+
+def youtube(path: str, n: int, seed: int = 0) -> str:
+    """
+    English YouTube Takeout with n watched videos, n searches and n / 10 subscriptions
+    """
+    rng = random.Random(seed)
+    root = "Takeout/YouTube and YouTube Music"
+
+    watch_history = [
+        {
+            "header": "YouTube",
+            "title": f"Watched {words(rng, 5)}",
+            "titleUrl": f"https://www.youtube.com/watch?v={i:011d}",
+            "subtitles": [{"name": f"Channel {i % 50}", "url": f"https://www.youtube.com/channel/{i % 50}"}],
+            "time": iso(i), "products": ["YouTube"], "activityControls": ["YouTube watch history"],
+        }
+        for i in range(n)
+    ]
+    search_history = [
+        {
+            "header": "YouTube",
+            "title": f"Searched for {words(rng, 2)}",
+            "titleUrl": f"https://www.youtube.com/results?search_query={i}",
+            "time": iso(i), "products": ["YouTube"], "activityControls": ["YouTube search history"],
+        }
+        for i in range(n)
+    ]
+    subscriptions = ["Channel Id,Channel Url,Channel Title"] + [
+        f"UC{i:022d},http://www.youtube.com/channel/UC{i:022d},Channel {i}" for i in range(max(n // 10, 1))
+    ]
+
+    return write_zip(path, {
+        f"{root}/history/watch-history.json": json.dumps(watch_history),
+        f"{root}/history/search-history.json": json.dumps(search_history),
+        f"{root}/subscriptions/subscriptions.csv": "\n".join(subscriptions) + "\n",
+    })
+
+
+GENERATORS: dict[str, Callable[..., str]] = {
+    "chatgpt": chatgpt,
+    "facebook": facebook,
+    "instagram": instagram,
+    "linkedin": linkedin,
+    "netflix": netflix,
+    "tiktok": tiktok,
+    "whatsapp": whatsapp,
+    "x": x,
+    "youtube": youtube,
+}
@@ -0,0 +1,345 @@
+"""
+Benchmark runner
+
+Times the three stages a DDP goes through in a data donation flow:
+
+* validation: FlowBuilder.validate_file
+* extraction: FlowBuilder.extract_data, including the extraction progress pages
+* serialization: rendering the consent form with the extracted tables to a JSON string, as it is send to the browser
+
+Every stage is run once to warm up and then timed repeat times, the median wall time is reported.
+Validation and extraction are measured cold: the cached index of the zip is cleared before every run,
+otherwise the warm-up would build it and the timed runs would measure a lookup, see port.helpers.zip_index.
+Peak memory is measured with tracemalloc in a separate run, so tracing does not distort the timings.
+In that run the memory of every extracted table is measured as well, see FlowBuilder.measure_memory.
+
+Usage::
+
+    python -m benchmarks --scales 1 10 100 --output results.json
+    python -m benchmarks --case "whatsapp*" --scales 1 10
+    python -m benchmarks --save
+
+See benchmarks.compare to compare the results against a baseline.
+"""
+from dataclasses import dataclass, field, asdict
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Generator
+import argparse
+import fnmatch
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import port.helpers.memory as memory_helpers
+import port.helpers.port_helpers as ph
+import port.helpers.zip_index as zip_index
+import port.platforms.registry as registry
+from port.batch import answer
+from port.platforms.flow_builder import FlowBuilder
+
+from benchmarks import generators, store
+
+logger = logging.getLogger(__name__)
+
+
+STAGES = ["validation", "extraction", "serialization"]
+
+
+@dataclass
+class Case:
+    """
+    A benchmark case: a platform flow and a generator of synthetic DDPs for that platform
+    """
+    name: str
+    platform: str
+    generate: Callable[..., str]
+
+
+def default_cases() -> list[Case]:
+    """
+    Returns a case for every platform, and a case for every other chat format WhatsApp uses: whatsapp-<i>
+    """
+    cases = [Case(name, name, generate) for name, generate in generators.GENERATORS.items()]
+    for i in range(1, len(generators.whatsapp_formats())):
+        cases.append(Case(f"whatsapp-{i}", "whatsapp", partial(generators.whatsapp, chat_format=i)))
+    return cases
+
+
+@dataclass
+class StageResult:
+    """
+    Attributes:
+        seconds: median wall time of the samples
+        samples: wall time of every repeat
+        peak_bytes: peak memory allocated during the stage as traced by tracemalloc, None if not measured
+    """
+    seconds: float
+    samples: list[float]
+    peak_bytes: int | None = None
+
+
+@dataclass
+class CaseResult:
+    """
+    Attributes:
+        case: name of the case
+        platform: name of the platform module
+        scale: multiplier of the base number of items
+        n: number of items in the generated DDP
+        file_bytes: size of the generated DDP
+        tables: number of extracted tables
+        rows: total number of rows in the extracted tables
+        stages: results per stage
+        tables_memory: memory measured per extracted table, see port.helpers.memory.MemoryMeasurement
+    """
+    case: str
+    platform: str
+    scale: int
+    n: int
+    file_bytes: int
+    tables: int = 0
+    rows: int = 0
+    stages: dict[str, StageResult] = field(default_factory=dict)
+    tables_memory: list[dict[str, Any]] = field(default_factory=list)
+
+
+def drain(result: Any, file: str) -> Any:
+    """
+    Runs extract_data to completion when it is a generator, answering the pages it renders
+    """
+    if not isinstance(result, Generator):
+        return result
+
+    try:
+        command = result.send(None)
+        while True:
+            command = result.send(answer(command.toDict(), file))
+    except StopIteration as e:
+        return e.value
+
+
+def measure(
+    fn: Callable[[], Any],
+    repeat: int,
+    memory: bool,
+    memory_fn: Callable[[], Any] | None = None,
+    setup: Callable[[], Any] | None = None,
+) -> tuple[Any, StageResult]:
+    """
+    Calls fn once to warm up, then repeat times and returns the last return value with its timings
+    Peak memory is measured in a separate call of memory_fn, which defaults to fn
+    setup is called before every call of fn and memory_fn, outside of the measurement
+    """
+    setup = setup or (lambda: None)
+    setup()
+    fn()
+    samples = []
+    value = None
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        value = fn()
+        samples.append(time.perf_counter() - start)
+
+    peak_bytes = None
+    if memory:
+        setup()
+        memory_helpers.start()
+        try:
+            (memory_fn or fn)()
+            peak_bytes = memory_helpers.peak_bytes()
+        finally:
+            memory_helpers.stop()
+
+    return value, StageResult(seconds=statistics.median(samples), samples=samples, peak_bytes=peak_bytes)
+
+
+def run_case(case: Case, scale: int, base: int, directory: str, repeat: int = 3, memory: bool = True) -> CaseResult:
+    """
+    Generates a DDP of base * scale items and benchmarks every stage on it
+    """
+    n = base * scale
+    file = case.generate(str(Path(directory) / f"{case.name}-{scale}x.zip"), n)
+    result = CaseResult(case=case.name, platform=case.platform, scale=scale, n=n, file_bytes=Path(file).stat().st_size)
+
+    flow: FlowBuilder = registry.flow_class(case.platform)("benchmark")
+
+    validation, result.stages["validation"] = measure(
+        partial(flow.validate_file, file), repeat, memory, setup=zip_index.clear_cache
+    )
+    if validation.get_status_code_id() != 0:
+        raise ValueError(f"Generated DDP for {case.name} did not pass validation")
+
+    def extract() -> Any:
+        return drain(flow.extract_data(file, validation), file)
+
+    def extract_measuring_tables() -> Any:
+        flow.measure_memory = True
+        flow.memory_measurements = []
+        try:
+            return extract()
+        finally:
+            flow.measure_memory = False
+
+    tables, result.stages["extraction"] = measure(
+        extract, repeat, memory, extract_measuring_tables, setup=zip_index.clear_cache
+    )
+    result.tables_memory = [measurement.toDict() for measurement in flow.memory_measurements]
+    flow.table_list = tables or []
+    result.tables = len(flow.table_list)
+    result.rows = sum(len(table.data_frame) for table in flow.table_list)
+
+    def serialize() -> str:
+        page = ph.render_page(flow.UI_TEXT["review_data_header"], flow.generate_review_data_prompt())
+        return json.dumps(page.toDict())
+
+    _, result.stages["serialization"] = measure(serialize, repeat, memory)
+
+    return result
+
+
+def run(
+    cases: list[Case],
+    scales: list[int],
+    base: int,
+    repeat: int = 3,
+    memory: bool = True,
+    tables_memory: bool = False,
+) -> list[CaseResult]:
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for case in cases:
+            for scale in scales:
+                result = run_case(case, scale, base, directory, repeat, memory)
+                print_result(result)
+                if tables_memory:
+                    print_tables_memory(result)
+                results.append(result)
+    return results
+
+
+def print_result(result: CaseResult) -> None:
+    for stage in STAGES:
+        stage_result = result.stages[stage]
+        peak = "" if stage_result.peak_bytes is None else f"{stage_result.peak_bytes / 2**20:10.2f} MiB"
+        print(
+            f"{result.case:<14} {result.scale:>4}x {result.n:>8} {stage:<14} "
+            f"{stage_result.seconds * 1000:10.2f} ms {peak}"
+        )
+
+
+def print_tables_memory(result: CaseResult) -> None:
+    for measurement in result.tables_memory:
+        dataframe_bytes = measurement["dataframe_bytes"] or 0
+        print(
+            f"    {measurement['name']:<40} peak {measurement['peak_bytes'] / 2**20:8.2f} MiB"
+            f"  allocated {measurement['allocated_bytes'] / 2**20:8.2f} MiB"
+            f"  dataframe {dataframe_bytes / 2**20:8.2f} MiB"
+        )
+
+
+def environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def make_report(results: list[CaseResult], base: int, repeat: int) -> dict[str, Any]:
+    return {
+        "environment": environment(),
+        "base": base,
+        "repeat": repeat,
+        "results": [asdict(result) for result in results],
+    }
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds the arguments that select and configure the benchmark run, shared with python -m benchmarks.compare
+    """
+    parser.add_argument(
+        "--case",
+        nargs="*",
+        help="glob patterns selecting cases by name (default: one case per platform)",
+    )
+    parser.add_argument(
+        "--scales",
+        nargs="*",
+        type=int,
+        default=[1, 10, 100],
+        help="multipliers of --base (default: 1 10 100)",
+    )
+    parser.add_argument("--base", type=int, default=100, help="number of items at scale 1 (default: 100)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed runs per stage (default: 3)")
+    parser.add_argument("--no-memory", action="store_true", help="do not measure peak memory")
+    parser.add_argument("--tables-memory", action="store_true", help="print the memory measured per extracted table")
+
+
+def run_from_arguments(args: argparse.Namespace, parser: argparse.ArgumentParser) -> dict[str, Any]:
+    """
+    Runs the cases selected by args and returns the report
+    """
+    # extraction functions log errors for missing files, these are expected for synthetic DDPs
+    logging.basicConfig(level=logging.CRITICAL)
+
+    cases = default_cases()
+    if args.case:
+        cases = [case for case in cases if any(fnmatch.fnmatch(case.name, pattern) for pattern in args.case)]
+        if len(cases) == 0:
+            parser.error(f"No cases match: {' '.join(args.case)}")
+    else:
+        cases = [case for case in cases if case.name == case.platform]
+
+    results = run(cases, args.scales, args.base, args.repeat, not args.no_memory, args.tables_memory)
+    return make_report(results, args.base, args.repeat)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the platform flows on synthetic DDPs",
+    )
+    add_arguments(parser)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="save the results in the results store under the current commit",
+    )
+    parser.add_argument(
+        "--save-dirty",
+        action="store_true",
+        help="with --save, also save the results of a working tree with uncommitted changes, as <commit>-dirty.json",
+    )
+    parser.add_argument("--list", action="store_true", help="list the available cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case in default_cases():
+            print(case.name)
+        return 0
+
+    if args.save and not args.save_dirty and store.current_commit()[1]:
+        parser.error("The working tree has uncommitted changes, commit them or use --save-dirty")
+
+    report = run_from_arguments(args, parser)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.save:
+        path = store.save(report, allow_dirty=args.save_dirty)
+        print(f"Saved results to {path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Startup profile
+
+Profiles what happens before the participant sees the first prompt: importing port and rendering the first page
+of port.start(). Every module import is timed with python -X importtime, in a fresh interpreter.
+
+The report lists the port modules with their import times, the slowest other modules they pull in, and checks
+the startup against a budget. Exits with 1 if the budget is exceeded, so it can guard the import graph in CI:
+
+* --max-modules: number of modules imported on top of the bare interpreter
+* --max-seconds: wall time of the startup, the fastest of --repeat runs
+* --forbid: modules that must not be imported before the first prompt, by default the data stack
+
+Only CPython is profiled, the import times in Pyodide are higher but the import graph is the same.
+
+Usage::
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --platform whatsapp --max-modules 200 --json startup.json
+"""
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+PACKAGE_DIR = Path(__file__).parent.parent
+
+MAX_MODULES = 150
+MAX_SECONDS = 0.5
+FORBIDDEN = ["pandas", "numpy", "dateutil"]
+
+STARTUP_CODE = """
+import time
+start = time.perf_counter()
+import port
+port.start("startup", {platform!r}).send(None)
+print(time.perf_counter() - start)
+"""
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class ModuleImport:
+    """
+    Attributes:
+        name: name of the module
+        depth: number of imports this import is nested in
+        self_seconds: import time of the module itself
+        cumulative_seconds: import time of the module including the modules it imported
+    """
+    name: str
+    depth: int
+    self_seconds: float
+    cumulative_seconds: float
+
+
+@dataclass
+class StartupProfile:
+    """
+    Attributes:
+        platform: platform passed to port.start
+        seconds: fastest wall time of importing port and rendering the first page
+        modules: imports of modules that are not imported by the bare interpreter, in import order
+        violations: budget violations, empty if the startup is within budget
+    """
+    platform: str
+    seconds: float
+    modules: list[ModuleImport] = field(default_factory=list)
+    violations: list[str] = field(default_factory=list)
+
+
+def parse_importtime(stderr: str) -> list[ModuleImport]:
+    imports = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append(ModuleImport(name, len(indent) // 2, int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return imports
+
+
+def run_importtime(code: str) -> tuple[list[ModuleImport], str]:
+    """
+    Runs code in a fresh interpreter with -X importtime, returns the imports and the output of the code
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(PACKAGE_DIR), os.environ.get("PYTHONPATH")]))}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=PACKAGE_DIR, env=env,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    return parse_importtime(completed.stderr), completed.stdout
+
+
+def profile(platform: str, repeat: int = 3) -> StartupProfile:
+    """
+    Profiles the startup of a platform, the imports of the fastest of repeat runs are kept
+    """
+    baseline, _ = run_importtime("pass")
+    interpreter_modules = {module.name for module in baseline}
+
+    fastest = None
+    for _ in range(repeat):
+        imports, stdout = run_importtime(STARTUP_CODE.format(platform=platform))
+        seconds = float(stdout.strip().splitlines()[-1])
+        if fastest is None or seconds < fastest.seconds:
+            modules = [module for module in imports if module.name not in interpreter_modules]
+            fastest = StartupProfile(platform, seconds, modules)
+
+    assert fastest is not None
+    return fastest
+
+
+def check_budget(
+    result: StartupProfile,
+    max_modules: int | None,
+    max_seconds: float | None,
+    forbidden: list[str],
+) -> list[str]:
+    violations = []
+    if max_modules is not None and len(result.modules) > max_modules:
+        violations.append(f"{len(result.modules)} modules imported, the budget is {max_modules}")
+    if max_seconds is not None and result.seconds > max_seconds:
+        violations.append(f"startup took {result.seconds:.3f} s, the budget is {max_seconds:.3f} s")
+
+    names = {module.name for module in result.modules}
+    for package in forbidden:
+        if package in names:
+            violations.append(f"{package} is imported before the first prompt")
+    return violations
+
+
+def format_report(result: StartupProfile, top: int = 10) -> str:
+    port_modules = [module for module in result.modules if module.name.split(".")[0] == "port"]
+    other_modules = sorted(
+        (module for module in result.modules if module.name.split(".")[0] != "port"),
+        key=lambda module: module.self_seconds, reverse=True,
+    )
+
+    lines = [
+        f"Startup of {result.platform}: {result.seconds * 1000:.1f} ms, {len(result.modules)} modules imported",
+        "",
+    ]
+    lines.append(f"{'port module':<40} {'self':>10} {'cumulative':>12}")
+    for module in sorted(port_modules, key=lambda module: module.cumulative_seconds, reverse=True):
+        lines.append(
+            f"{module.name:<40} {module.self_seconds * 1000:7.2f} ms {module.cumulative_seconds * 1000:9.2f} ms"
+        )
+
+    lines.extend(["", f"{'slowest other modules':<40} {'self':>10}"])
+    for module in other_modules[:top]:
+        lines.append(f"{module.name:<40} {module.self_seconds * 1000:7.2f} ms")
+
+    lines.append("")
+    if result.violations:
+        lines.extend(f"OVER BUDGET: {violation}" for violation in result.violations)
+    else:
+        lines.append("Within budget")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.startup",
+        description="Profile the imports before the first prompt",
+    )
+    parser.add_argument("--platform", default="chatgpt", help="platform passed to port.start (default: chatgpt)")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs, the fastest is reported (default: 3)")
+    parser.add_argument(
+        "--max-modules",
+        type=int,
+        default=MAX_MODULES,
+        help=f"maximum number of imported modules (default: {MAX_MODULES})",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=MAX_SECONDS,
+        help=f"maximum startup wall time (default: {MAX_SECONDS})",
+    )
+    parser.add_argument(
+        "--forbid",
+        nargs="*",
+        default=FORBIDDEN,
+        help=f"modules that must not be imported (default: {' '.join(FORBIDDEN)})",
+    )
+    parser.add_argument("--top", type=int, default=10, help="number of other modules to list (default: 10)")
+    parser.add_argument("--json", help="write the profile as JSON to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        result = profile(args.platform, args.repeat)
+    except RuntimeError as e:
+        parser.error(f"Startup of {args.platform} failed: {e}")
+
+    result.violations = check_budget(result, args.max_modules, args.max_seconds, args.forbid)
+    print(format_report(result, args.top))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(asdict(result), f, indent=2)
+
+    return 1 if result.violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Benchmark results store
+
+Benchmark reports are stored as JSON, one file per commit: <results directory>/<commit hash>.json
+Reports of a working tree with uncommitted changes are only stored on request, as <commit hash>-dirty.json,
+so they never replace the results of the commit itself.
+The default results directory is benchmarks/results, it can be changed with the BENCHMARK_RESULTS environment variable.
+
+Results depend on the machine they were measured on, only compare results measured on the same machine.
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+import json
+import os
+import subprocess
+
+RESULTS_DIR = Path(os.environ.get("BENCHMARK_RESULTS", Path(__file__).parent / "results"))
+
+
+def git(*args: str) -> str:
+    completed = subprocess.run(["git", *args], capture_output=True, text=True, cwd=Path(__file__).parent)
+    if completed.returncode != 0:
+        raise ValueError(completed.stderr.strip() or f"git {' '.join(args)} failed")
+    return completed.stdout.strip()
+
+
+def current_commit() -> tuple[str, bool]:
+    """
+    Returns the hash of HEAD and whether the working tree has uncommitted changes
+    """
+    commit = git("rev-parse", "HEAD")
+    dirty = git("status", "--porcelain", "--untracked-files=no") != ""
+    return commit, dirty
+
+
+def save(report: dict[str, Any], results_dir: Path = RESULTS_DIR, allow_dirty: bool = False) -> Path:
+    """
+    Saves a report of benchmarks.runner under the current commit, overwriting earlier results for that commit
+
+    Args:
+        report (dict[str, Any]): The report.
+        results_dir (Path, optional): Directory of the results store.
+        allow_dirty (bool, optional): Save the report if the working tree has uncommitted changes,
+            as <commit hash>-dirty.json. Defaults to False.
+
+    Returns:
+        Path: The file the report was saved to.
+
+    Raises:
+        ValueError: If the working tree has uncommitted changes and allow_dirty is False.
+    """
+    commit, dirty = current_commit()
+    if dirty and not allow_dirty:
+        raise ValueError("The working tree has uncommitted changes, its results are not saved under the commit")
+
+    report = {
+        **report,
+        "commit": commit,
+        "dirty": dirty,
+        "created": datetime.now(timezone.utc).isoformat(),
+    }
+
+    results_dir.mkdir(parents=True, exist_ok=True)
+    path = results_dir / (f"{commit}-dirty.json" if dirty else f"{commit}.json")
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return path
+
+
+def load(reference: str, results_dir: Path = RESULTS_DIR) -> dict[str, Any]:
+    """
+    Loads a report by path or by commit
+
+    Args:
+        reference (str): Path to a report, or anything git can resolve to a commit, for example: main, HEAD~1 or a hash.
+        results_dir (Path, optional): Directory of the results store.
+
+    Raises:
+        ValueError: If there are no results for the reference.
+    """
+    path = Path(reference)
+    if not path.is_file():
+        commit = git("rev-parse", "--verify", f"{reference}^{{commit}}")
+        path = results_dir / f"{commit}.json"
+        if not path.is_file():
+            raise ValueError(
+                f"No benchmark results stored for {reference} ({commit}), run: python -m benchmarks --save"
+            )
+
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
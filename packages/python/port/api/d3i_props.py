@@ -1,9 +1,16 @@
-from dataclasses import dataclass
-from typing import Optional
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Optional, TYPE_CHECKING
 
-import pandas as pd
+from port.helpers.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 import port.api.props as props
+import port.helpers.sampling as sampling
 
 @dataclass
 class PropsUIPromptConsentFormTableViz:
@@ -18,6 +25,11 @@ class PropsUIPromptConsentFormTableViz:
         visualizations (Optional[list]): Optional visualizations to be shown.
         folded (Optional[bool]): Whether the table should be initially folded.
         delete_option (Optional[bool]): Whether to show a delete option for the table.
+        max_rows (Optional[int]): Maximum number of rows, larger tables are sampled. See apply_budget.
+        max_bytes (Optional[int]): Maximum memory usage of the data frame, larger tables are sampled. See apply_budget.
+        sampling (str): How larger tables are sampled: "head_tail" or "reservoir", see port.helpers.sampling.
+        sampled (bool): Set when the table was sampled, the participant is told in the description.
+        total_rows (Optional[int]): Number of rows before sampling.
 
     Examples::
 
@@ -52,6 +64,64 @@ class PropsUIPromptConsentFormTableViz:
     visualizations: Optional[list] = None
     folded: Optional[bool] = False
     delete_option: Optional[bool] = True
+    max_rows: Optional[int] = None
+    max_bytes: Optional[int] = None
+    sampling: str = sampling.HEAD_TAIL
+    sampled: bool = field(default=False, init=False)
+    total_rows: Optional[int] = field(default=None, init=False)
+    _unsampled_description: Optional[props.Translatable] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self.apply_budget()
+
+    def apply_budget(
+        self,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        strategy: Optional[str] = None,
+    ):
+        """
+        Samples the data frame when it exceeds the row or byte budget of the table
+
+        Arguments that are given replace the budget of the table.
+        A data frame that was sampled while it was extracted is marked as sampled, see sampling.mark_sampled.
+        A table that is already sampled is sampled again only if it is still over budget.
+        Tables given as a dictionary are left as they are.
+        """
+        self.max_rows = max_rows if max_rows is not None else self.max_rows
+        self.max_bytes = max_bytes if max_bytes is not None else self.max_bytes
+        self.sampling = strategy or self.sampling
+
+        if not isinstance(self.data_frame, pd.DataFrame):
+            return
+
+        result = sampling.apply_budget(self.data_frame, self.max_rows, self.max_bytes, self.sampling)
+        if result.sampled:
+            if not self.sampled:
+                self._unsampled_description = self.description
+            self.data_frame = result.data_frame
+            self.sampled = True
+            self.total_rows = result.total_rows
+            self.description = self._sampled_description()
+
+    def _sampled_description(self) -> props.Translatable:
+        shown = len(self.data_frame)
+        note = {
+            "en": (
+                "This table is too large to show completely, "
+                f"{shown} of its {self.total_rows} rows are shown and can be donated."
+            ),
+            "nl": (
+                "Deze tabel is te groot om volledig te tonen, "
+                f"{shown} van de {self.total_rows} rijen worden getoond en kunnen worden gedoneerd."
+            ),
+        }
+        if self._unsampled_description is None:
+            return props.Translatable(note)
+        translations = dict(self._unsampled_description.translations)
+        for language, text in note.items():
+            translations[language] = f"{translations[language]} {text}" if translations.get(language) else text
+        return props.Translatable(translations)  # pyright: ignore
 
     def translate_data_frame(self):
         if isinstance(self.data_frame, pd.DataFrame):
@@ -75,6 +145,7 @@ class PropsUIPromptConsentFormTableViz:
         dict["visualizations"] = self.visualizations if self.visualizations else None
         dict["folded"] = self.folded
         dict["delete_option"] = self.delete_option
+        dict["sampled"] = self.sampled
         return dict
 
 
@@ -1,7 +1,13 @@
+from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional, TypedDict, Union, Any
+from typing import Optional, TypedDict, Union, Any, TYPE_CHECKING
 
-import pandas as pd
+from port.helpers.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 
 class Translations(TypedDict):
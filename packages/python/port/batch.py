@@ -0,0 +1,355 @@
+"""
+Offline batch runner
+
+This module drives the data donation flow of a platform headlessly, without the browser.
+It can be used to (re)process a directory of DDPs, for example when extraction logic has changed.
+
+Every prompt in the flow is answered with a scripted payload:
+
+* File prompts are answered with the path of the DDP
+* Radio prompts are answered with the first item (for example the first Netflix profile)
+* Retry prompts are answered with cancel, the DDP is reported as failed because it is not valid for the platform
+* Consent forms are answered with consent, all extracted tables are donated as is
+* Questionnaires are skipped
+
+Donations are written to the output directory, one directory per DDP, at the path of the DDP in the input directory.
+A DDP from which no tables were donated is reported as failed.
+Tables are written as JSONL or Parquet files, other donations as JSON files.
+A report with the timing and status of every DDP is written to report.jsonl in the output directory.
+
+Usage::
+
+    python -m port.batch chatgpt path/to/ddps path/to/output --workers 4 --format parquet
+"""
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any
+import argparse
+import hashlib
+import json
+import logging
+import re
+import sys
+import time
+import traceback
+
+import pandas as pd
+
+import port.helpers.executors as executors
+import port.platforms.registry as registry
+
+logger = logging.getLogger(__name__)
+
+
+JSONL = "jsonl"
+PARQUET = "parquet"
+
+MAX_CYCLES = 10_000
+
+PART_KEY = re.compile(r"^(?P<key>.*)-part-(?P<number>\d+)$")
+MANIFEST_KEY = re.compile(r"^(?P<key>.*)-manifest$")
+
+
+class Payload:
+    """
+    Payload as it is send by the browser in response to a command
+    """
+
+    def __init__(self, type: str, value: Any = None):
+        self.__type__ = type
+        self.value = value
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of processing a single DDP
+
+    Attributes:
+        file: path to the DDP
+        status: "ok" or "failed"
+        seconds: wall time it took to process the DDP
+        donations: keys of the donations that were written
+        tables: number of rows per donated table
+        error: error message in case the DDP could not be processed
+    """
+
+    file: str
+    status: str = "ok"
+    seconds: float = 0.0
+    donations: list[str] = field(default_factory=list)
+    tables: dict[str, int] = field(default_factory=dict)
+    error: str = ""
+
+
+def consent_payload(body: dict[str, Any]) -> Payload:
+    """
+    Creates the payload the consent form would send when a participant donates all tables unchanged
+    """
+    donated_tables = []
+    for table in body["tables"]:
+        data_frame = table["data_frame"]
+        if isinstance(data_frame, str):
+            data_frame = json.loads(data_frame)
+        records = pd.DataFrame(data_frame).to_dict(orient="records")
+        donated_tables.append({table["id"]: records})
+
+    return Payload("PayloadJSON", json.dumps(donated_tables, default=str))
+
+
+def answer(command: dict[str, Any], file: str) -> Payload:
+    """
+    Returns the scripted answer to a render command
+    """
+    body = command["page"]["body"]
+    types = [item["__type__"] for item in body]
+
+    if "PropsUIPromptFileInput" in types:
+        return Payload("PayloadString", file)
+    if "PropsUIPromptFileInputMultiple" in types:
+        return Payload("PayloadString", [file])
+    consent_forms = [
+        item for item in body
+        if item["__type__"] in ("PropsUIPromptConsentFormViz", "PropsUIPromptConsentForm")
+    ]
+    if len(consent_forms) > 0:
+        return consent_payload(consent_forms[0])
+    if "PropsUIPromptRadioInput" in types:
+        radio = next(item for item in body if item["__type__"] == "PropsUIPromptRadioInput")
+        if len(radio["items"]) > 0:
+            return Payload("PayloadString", radio["items"][0]["value"])
+        return Payload("PayloadFalse", False)
+    if "PropsUIPromptConfirm" in types or "PropsUIPromptQuestionnaire" in types:
+        return Payload("PayloadFalse", False)
+
+    return Payload("PayloadTrue", True)
+
+
+def is_retry_prompt(command: dict[str, Any]) -> bool:
+    """
+    Returns whether a render command asks the participant to retry with another file
+
+    The retry prompt is the only confirm prompt of the flows, see port_helpers.generate_retry_prompt.
+    """
+    body = command["page"]["body"]
+    return any(item["__type__"] == "PropsUIPromptConfirm" for item in body)
+
+
+def ddp_path(file: str, input_dir: str | None = None) -> Path:
+    """
+    Returns the path of a DDP relative to input_dir without suffix, or its name if input_dir is None
+
+    DDPs with the same name in different subdirectories of input_dir get a different path,
+    it is used as the output directory and session id of the DDP.
+    """
+    path = Path(file)
+    if input_dir is None:
+        return Path(path.stem)
+    return path.relative_to(input_dir).with_suffix("")
+
+
+def reassemble(donations: dict[str, str]) -> dict[str, str]:
+    """
+    Reassembles donations that were donated in parts (see port_helpers.donate_in_parts)
+
+    Raises:
+        ValueError: if a reassembled donation does not match the checksum in its manifest
+    """
+    out = {}
+    for key, json_string in donations.items():
+        if PART_KEY.match(key):
+            continue
+        manifest_match = MANIFEST_KEY.match(key)
+        if manifest_match is None:
+            out[key] = json_string
+            continue
+
+        manifest = json.loads(json_string)
+        joined = "".join(donations[part["key"]] for part in manifest["parts"])
+        if hashlib.sha256(joined.encode("utf-8")).hexdigest() != manifest["sha256"]:
+            raise ValueError(f"Checksum mismatch for donation: {manifest['key']}")
+        out[manifest["key"]] = joined
+
+    return out
+
+
+def write_donation(key: str, json_string: str, output_dir: Path, output_format: str) -> dict[str, int]:
+    """
+    Writes a donation to disk, returns the number of rows per table that was written
+    """
+    tables = {}
+    data = json.loads(json_string)
+
+    is_table_list = isinstance(data, list) and all(
+        isinstance(item, dict) and len(item) == 1 and isinstance(next(iter(item.values())), list)
+        for item in data
+    )
+    if not is_table_list:
+        (output_dir / f"{key}.json").write_text(json_string, encoding="utf-8")
+        return tables
+
+    for item in data:
+        table_id, records = next(iter(item.items()))
+        df = pd.DataFrame(records)
+        path = output_dir / f"{key}.{table_id}.{output_format}"
+        if output_format == PARQUET:
+            df.to_parquet(path, index=False)
+        else:
+            df.to_json(path, orient="records", lines=True, force_ascii=False)
+        tables[table_id] = len(df)
+
+    return tables
+
+
+def run_file(
+    platform: str,
+    file: str,
+    output_dir: str,
+    output_format: str = JSONL,
+    input_dir: str | None = None,
+) -> BatchResult:
+    """
+    Processes a single DDP with the flow of a platform and writes its donations to output_dir
+
+    Args:
+        platform (str): Name of a platform in port.platforms.registry, for example "chatgpt".
+        file (str): Path to the DDP.
+        output_dir (str): Directory in which a directory for this DDP is created.
+        output_format (str, optional): "jsonl" or "parquet". Defaults to "jsonl".
+        input_dir (str | None, optional): Directory that contains file, the output directory of the DDP is created
+            at the path of file relative to input_dir. Defaults to None, the name of the file.
+
+    Returns:
+        BatchResult: The outcome of processing the DDP, exceptions are caught and reported.
+            The DDP failed if the flow prompted to retry with another file, or if no tables were donated.
+    """
+    result = BatchResult(file=file)
+    start = time.perf_counter()
+
+    try:
+        relative_path = ddp_path(file, input_dir)
+        session_id = "_".join(relative_path.parts)
+        script = registry.process(platform, session_id)
+
+        donations = {}
+        retried = False
+        command = script.send(None)
+        for _ in range(MAX_CYCLES):
+            command_dict = command.toDict()
+            command_type = command_dict["__type__"]
+
+            if command_type == "CommandSystemExit":
+                break
+            if command_type == "CommandSystemDonate":
+                donations[command_dict["key"]] = command_dict["json_string"]
+                payload = Payload("PayloadVoid")
+            else:
+                retried = retried or is_retry_prompt(command_dict)
+                payload = answer(command_dict, file)
+
+            command = script.send(payload)
+        else:
+            raise RuntimeError(f"Flow did not exit within {MAX_CYCLES} cycles")
+
+        ddp_output_dir = Path(output_dir) / relative_path
+        ddp_output_dir.mkdir(parents=True, exist_ok=True)
+        for key, json_string in reassemble(donations).items():
+            tables = write_donation(key, json_string, ddp_output_dir, output_format)
+            result.donations.append(key)
+            result.tables.update(tables)
+
+        if retried:
+            result.status = "failed"
+            result.error = f"Not a valid {platform} DDP, the flow prompted to retry with another file"
+        elif len(result.tables) == 0:
+            result.status = "failed"
+            result.error = "No tables were donated"
+
+    except StopIteration:
+        result.status = "failed"
+        result.error = "Flow ended without exit command"
+    except Exception as e:
+        logger.debug(traceback.format_exc())
+        result.status = "failed"
+        result.error = f"{type(e).__name__}: {e}"
+
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def run_batch(
+    platform: str,
+    files: list[str],
+    output_dir: str,
+    output_format: str = JSONL,
+    workers: int = 1,
+    input_dir: str | None = None,
+) -> list[BatchResult]:
+    """
+    Processes DDPs in a pool of worker processes, see run_file
+
+    Returns:
+        list[BatchResult]: The outcome for every DDP, in the order of files.
+    """
+    kind = executors.PROCESS if workers > 1 else executors.SEQUENTIAL
+    with executors.create_executor(kind, workers) as executor:
+        futures = [
+            executor.submit(run_file, platform, file, output_dir, output_format, input_dir)
+            for file in files
+        ]
+        results = []
+        for future in futures:
+            result = future.result()
+            logger.info("%s %s in %.2fs %s", result.status, result.file, result.seconds, result.error)
+            results.append(result)
+
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m port.batch", description="Process a directory of DDPs headlessly")
+    parser.add_argument("platform", choices=registry.names(), help="name of the platform, for example: chatgpt")
+    parser.add_argument("input_dir", help="directory containing the DDPs")
+    parser.add_argument("output_dir", help="directory to write the donations and report to")
+    parser.add_argument("--pattern", default="*.zip", help="glob pattern selecting the DDPs (default: *.zip)")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes (default: 1)")
+    parser.add_argument("--format", choices=[JSONL, PARQUET], default=JSONL, dest="output_format")
+    parser.add_argument("--verbose", action="store_true", help="show log messages of the extraction")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.StreamHandler(sys.stderr))
+    logger.propagate = False
+
+    if args.output_format == PARQUET:
+        try:
+            pd.io.parquet.get_engine("auto")
+        except ImportError as e:
+            parser.error(str(e))
+
+    files = sorted(str(path) for path in Path(args.input_dir).glob(args.pattern) if path.is_file())
+    if len(files) == 0:
+        parser.error(f"No files matching {args.pattern} found in {args.input_dir}")
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    results = run_batch(args.platform, files, args.output_dir, args.output_format, args.workers, args.input_dir)
+    seconds = time.perf_counter() - start
+
+    with open(output_dir / "report.jsonl", "w", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(asdict(result)) + "\n")
+
+    failed = [result for result in results if result.status != "ok"]
+    print(f"Processed {len(results)} files in {seconds:.2f}s, {len(failed)} failed")
+    for result in failed:
+        print(f"  {result.file}: {result.error}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,8 +2,11 @@
 This module defines a re pattern to search for emoji sequences defined by Unicode
 If a new definition comes out replace the one underneath
 
+The pattern, EMOJI_PATTERN, is compiled when it is first used
+
 """
 
+import functools
 import re
 from typing import Pattern
 
@@ -1548,4 +1551,13 @@ def create_pattern() -> Pattern[str]:
     return pattern
 
 
-EMOJI_PATTERN = create_pattern()
+@functools.cache
+def get_pattern() -> Pattern:
+    return create_pattern()
+
+
+def __getattr__(name: str):
+    # EMOJI_PATTERN takes a while to compile, it is created when it is first used
+    if name == "EMOJI_PATTERN":
+        return get_pattern()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,112 @@
+"""
+This module contains executors that can be used to run extraction steps
+
+In the browser (Pyodide) threads and processes are not available, extraction steps are then executed sequentially.
+When port runs under CPython, for example when donated DDPs are processed in batch,
+independent extraction steps can be executed in a thread or process pool.
+"""
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable
+import sys
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+SEQUENTIAL = "sequential"
+THREAD = "thread"
+PROCESS = "process"
+
+
+def is_pyodide() -> bool:
+    """
+    Returns True if port is running in Pyodide (the browser)
+    """
+    return sys.platform == "emscripten"
+
+
+class DeferredFuture(Future):
+    """
+    Future that executes its call in the calling thread, the first time its result is requested.
+    """
+
+    def __init__(self, fn: Callable[..., Any], args: tuple, kwargs: dict[str, Any]):
+        super().__init__()
+        self._call = (fn, args, kwargs)
+
+    def _run(self) -> None:
+        if self.done():
+            return
+
+        fn, args, kwargs = self._call
+        self._call = None
+        try:
+            self.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            self.set_exception(e)
+
+    def result(self, timeout: float | None = None) -> Any:
+        self._run()
+        return super().result(timeout)
+
+    def exception(self, timeout: float | None = None) -> BaseException | None:
+        self._run()
+        return super().exception(timeout)
+
+
+class SequentialExecutor(Executor):
+    """
+    Executor that runs every submitted call in the calling thread.
+
+    Calls are deferred until their result is requested, so the caller decides when the work is done.
+    This makes it possible to use the same code path with and without a pool of workers.
+
+    Examples::
+
+        with SequentialExecutor() as executor:
+            future = executor.submit(sum, [1, 2, 3])
+            future.result()
+    """
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        return DeferredFuture(fn, args, kwargs)
+
+
+def create_executor(kind: str = SEQUENTIAL, max_workers: int | None = None) -> Executor:
+    """
+    Creates an executor of the requested kind.
+
+    Under Pyodide a SequentialExecutor is always returned, because threads and processes are not available.
+
+    Args:
+        kind (str, optional): One of "sequential", "thread" or "process". Defaults to "sequential".
+        max_workers (int | None, optional): The maximum number of workers in the pool.
+            Defaults to None, letting concurrent.futures decide.
+
+    Returns:
+        Executor: An executor that should be used as a context manager.
+
+    Raises:
+        ValueError: If kind is not a known kind of executor.
+
+    Examples::
+
+        with create_executor("process", max_workers=4) as executor:
+            futures = [executor.submit(step.to_df, *step.args) for step in steps]
+            data_frames = [future.result() for future in futures]
+    """
+    if kind not in (SEQUENTIAL, THREAD, PROCESS):
+        raise ValueError(f"Unknown executor: {kind}")
+
+    if kind != SEQUENTIAL and is_pyodide():
+        logger.info("Executor %s is not available in Pyodide, falling back to sequential execution", kind)
+        kind = SEQUENTIAL
+
+    if kind == THREAD:
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if kind == PROCESS:
+        # imported here, importing it loads multiprocessing, which is not needed in the browser
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(max_workers=max_workers)
+
+    return SequentialExecutor()
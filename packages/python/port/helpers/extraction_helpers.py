@@ -1,28 +1,47 @@
 """
 This module contains helper functions that can be used during the data extraction process
 """ 
+from __future__ import annotations
 import math
 import re
 import logging 
 from datetime import datetime, timezone
-from typing import Any, Callable
-from pathlib import Path
+from typing import Any, Callable, IO, Iterator, TYPE_CHECKING
 import zipfile
 import csv
 import io
 import json
 
-import pandas as pd
-import numpy as np
+from port.helpers.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import numpy as np
+else:
+    pd = lazy_import("pandas")
+    np = lazy_import("numpy")
+
+import port.helpers.tracing as tracing
+import port.helpers.zip_index as zip_index
 
 
 logger = logging.getLogger(__name__)
 
+# Readers buffer members up to this size in memory, larger members are read as a stream
+STREAM_THRESHOLD_BYTES = 32 * 1024 * 1024
+
 
-def dict_denester(inp: dict[Any, Any] | list[Any], new: dict[Any, Any] | None = None, name: str = "", run_first: bool = True) -> dict[Any, Any]:
+def dict_denester(
+    inp: dict[Any, Any] | list[Any],
+    new: dict[Any, Any] | None = None,
+    name: str = "",
+    run_first: bool = True,
+) -> dict[Any, Any]:
     """
     Denests a dictionary or list, returning a new flattened dictionary.
 
+    The leaves are those of iter_leaves, so deeply nested input does not hit the recursion limit.
+
     Args:
         inp (dict[Any, Any] | list[Any]): The input dictionary or list to be denested.
         new (dict[Any, Any] | None, optional): The dictionary to store denested key-value pairs. Defaults to None.
@@ -41,21 +60,7 @@ def dict_denester(inp: dict[Any, Any] | list[Any], new: dict[Any, Any] | None =
     if run_first:
         new = {}
 
-    if isinstance(inp, dict):
-        for k, v in inp.items():
-            if isinstance(v, (dict, list)):
-                dict_denester(v, new, f"{name}-{str(k)}", run_first=False)
-            else:
-                newname = f"{name}-{k}"
-                new.update({newname[1:]: v})  # type: ignore
-
-    elif isinstance(inp, list):
-        for i, item in enumerate(inp):
-            dict_denester(item, new, f"{name}-{i}", run_first=False)
-
-    else:
-        new.update({name[1:]: inp})  # type: ignore
-
+    new.update(iter_leaves(inp, name))  # type: ignore
     return new  # type: ignore
 
 
@@ -130,43 +135,121 @@ def find_items(d: dict[Any, Any], key_to_match: str) -> list:
     return out
 
 
-def json_dumper(zfile: str) -> pd.DataFrame:
+def iter_leaves(inp: Any, name: str = "") -> Iterator[tuple[str, Any]]:
+    """
+    Yields the key and value of every leaf of a nested dictionary or list, one by one.
+
+    The keys are those of dict_denester, but the flattened dictionary is never built.
+    Keys that occur more than once after flattening are yielded every time.
+
+    The containers are walked with an explicit stack, so deep nesting does not hit the recursion limit.
+    Their keys are kept as tuples, the key of a container is joined once, when its first leaf is yielded.
+
+    Args:
+        inp (Any): The nested dictionary or list.
+        name (str, optional): Key the leaves are nested under, see dict_denester. Defaults to "".
+
+    Yields:
+        tuple[str, Any]: The flattened key and the value of a leaf.
+
+    Examples::
+
+        >>> list(iter_leaves({"a": {"b": {"c": 1}}, "d": [2, 3]}))
+        [("a-b-c", 1), ("d-0", 2), ("d-1", 3)]
+    """
+    if not isinstance(inp, (dict, list)):
+        yield name[1:], inp
+        return
+
+    # the containers that are suspended, with their items, path of keys and the joined key their leaves start with
+    stack: list[tuple[Iterator[tuple[Any, Any]], tuple[Any, ...], str | None]] = []
+    items = iter(inp.items()) if isinstance(inp, dict) else enumerate(inp)
+    path: tuple[Any, ...] = ()
+    lead: str | None = f"{name[1:]}-" if name else ""
+    while True:
+        for k, v in items:
+            if isinstance(v, (dict, list)):
+                stack.append((items, path, lead))
+                items = iter(v.items()) if isinstance(v, dict) else enumerate(v)
+                path = path + (k,)
+                lead = None
+                break
+            # the key of a container is joined when its first leaf is yielded
+            if lead is None:
+                joined = name + "".join([f"-{p}" for p in path])
+                lead = f"{joined[1:]}-" if joined else ""
+            yield f"{lead}{k}", v
+        else:
+            if not stack:
+                return
+            items, path, lead = stack.pop()
+
+
+def json_dumper(zfile: str, max_leaves: int | None = None, max_bytes: int | None = None) -> pd.DataFrame:
     """
     Reads all JSON files in a zip file, flattens them, and combines them into a single DataFrame.
 
+    The files are read one by one and their leaves are appended to the columns directly,
+    the file name column is categorical. Use max_leaves and max_bytes to dump DDPs of unknown size.
+
     Args:
         zfile (str): Path to the zip file containing JSON files.
+        max_leaves (int | None, optional): Maximum number of leaves kept per file. Defaults to None, all leaves.
+        max_bytes (int | None, optional): Files larger than this number of uncompressed bytes are skipped.
+            The size is read from the central directory, the file is not decompressed. Defaults to None, no limit.
 
     Returns:
-        pd.DataFrame: A DataFrame containing flattened data from all JSON files in the zip.
+        pd.DataFrame: A DataFrame with the columns "file name", "key" and "value", one row per leaf.
 
     Raises:
         Exception: Logs an error message if an exception occurs during the process.
 
     Examples::
 
-        >>> df = json_dumper("data.zip")
+        >>> df = json_dumper("data.zip", max_leaves=10_000, max_bytes=50 * 1024 * 1024)
         >>> print(df.head())
     """
     out = pd.DataFrame()
-    datapoints = []
+    file_names: list[str] = []
+    codes: dict[str, int] = {}
+    file_codes: list[int] = []
+    keys: list[str] = []
+    values: list[Any] = []
 
     try:
-        with zipfile.ZipFile(zfile, "r") as zf:
-            for f in zf.namelist():
-                logger.debug("Contained in zip: %s", f)
-                fp = Path(f)
-                if fp.suffix == ".json":
-                    b = io.BytesIO(zf.read(f))
-                    d = dict_denester(unzipddp.read_json_from_bytes(b))
-                    for k, v in d.items():
-                        datapoints.append({
-                            "file name": fp.name, 
-                            "key": k,
-                            "value": v
-                        })
-
-        out = pd.DataFrame(datapoints)
+        index = zip_index.get_index(zfile)
+        for info in index.infos:
+            logger.debug("Contained in zip: %s", info.filename)
+            name = zip_index.basename(info.filename)
+            if not name.endswith(".json") or name == ".json" or info.is_dir():
+                continue
+            if max_bytes is not None and info.file_size > max_bytes:
+                logger.info("Skipped %s: %d bytes is over the budget of %d", name, info.file_size, max_bytes)
+                continue
+
+            with index.open(info) as f:
+                d = read_json_from_bytes(f)
+
+            count = 0
+            for k, v in iter_leaves(d):
+                if max_leaves is not None and count >= max_leaves:
+                    logger.info("Kept the first %d leaves of %s", max_leaves, name)
+                    break
+                keys.append(k)
+                values.append(v)
+                count += 1
+            del d
+
+            code = codes.setdefault(name, len(file_names))
+            if code == len(file_names):
+                file_names.append(name)
+            file_codes.extend([code] * count)
+
+        out = pd.DataFrame({
+            "file name": pd.Categorical.from_codes(file_codes, categories=file_names),
+            "key": keys,
+            "value": pd.Series(values, dtype=object),
+        })
 
     except Exception as e:
         logger.error("Exception was caught:  %s", e)
@@ -254,6 +337,45 @@ def epoch_to_iso(epoch_timestamp: str | int | float) -> str:
     return out
 
 
+# Range of epoch timestamps that datetime can represent, years 1 to 9999
+EPOCH_MIN = -62135596800
+EPOCH_MAX = 253402300799
+
+
+def epoch_to_iso_series(epoch_timestamps: pd.Series) -> pd.Series:
+    """
+    Convert a Series of epoch timestamps to ISO 8601 strings, assuming UTC,
+    with the same result as epoch_to_iso for every value.
+
+    Numbers and numeric strings are converted at once, the other values are passed to epoch_to_iso one by one.
+
+    Args:
+        epoch_timestamps (pd.Series): Epoch timestamps as numbers or strings.
+
+    Returns:
+        pd.Series: Series of ISO 8601 strings with the same index,
+            or the original values as strings where conversion fails.
+
+    Examples::
+
+        >>> epoch_to_iso_series(pd.Series([1632139200, "1632139200", ""]))
+        ["2021-09-20T12:00:00+00:00", "2021-09-20T12:00:00+00:00", ""]
+    """
+    numbers = pd.to_numeric(epoch_timestamps, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    seconds = np.trunc(numbers)
+    valid = np.isfinite(seconds) & (seconds >= EPOCH_MIN) & (seconds <= EPOCH_MAX)
+
+    out = np.empty(len(numbers), dtype=object)
+    iso = np.datetime_as_string(seconds[valid].astype("int64").astype("datetime64[s]"), unit="s")
+    out[valid] = np.char.add(iso, "+00:00")
+
+    values = epoch_timestamps.to_numpy(dtype=object)
+    for i in np.flatnonzero(~valid):
+        out[i] = epoch_to_iso(values[i])
+
+    return pd.Series(out, index=epoch_timestamps.index, name=epoch_timestamps.name, dtype=object)
+
+
 def sort_isotimestamp_empty_timestamp_last(timestamp_series: pd.Series) -> pd.Series:
     """
     Creates a key for sorting a pandas Series of ISO timestamps, placing empty timestamps last.
@@ -305,6 +427,68 @@ def fix_latin1_string(input: str) -> str:
         return input
 
 
+# A run of \u00XX escapes of bytes 0x80-0xFF, that is not itself escaped with a backslash
+MOJIBAKE_RUN = re.compile(r"(?<!\\)((?:\\\\)*)((?:\\u00[89a-fA-F][0-9a-fA-F])+)")
+
+# An escape of another character than a byte 0x80-0xFF, these may stand for characters that have to stay escaped in JSON
+OTHER_ESCAPE = re.compile(rb"\\u(?!00[89a-fA-F])")
+
+
+def _fix_mojibake_run(match: re.Match[str]) -> str:
+    backslashes, run = match.groups()
+    try:
+        return backslashes + bytes.fromhex(run.replace("\\u00", "")).decode("utf-8")
+    except UnicodeDecodeError:
+        return match.group()
+
+
+def fix_mojibake(json_text: str) -> str:
+    """
+    Repairs the strings in the JSON text of a Meta (Facebook, Instagram) DDP, before the text is parsed
+
+    Meta writes the UTF-8 bytes of a character as separate escapes, "é" becomes "\\u00c3\\u00a9".
+    Every run of such escapes that is valid UTF-8 is replaced by the characters it encodes,
+    the JSON stays valid because these characters never need to be escaped.
+    For Meta DDPs the result is the same as fix_latin1_string on every string, without a call per string.
+    A run that is not valid UTF-8 is kept, like fix_latin1_string keeps a string it cannot fix.
+
+    Examples::
+
+        >>> fix_mojibake('{"name": "caf\\u00c3\\u00a9"}')
+        '{"name": "café"}'
+    """
+    if "\\u00" not in json_text:
+        return json_text
+    return MOJIBAKE_RUN.sub(_fix_mojibake_run, json_text)
+
+
+def decode_meta_json(json_bytes: bytes, encoding: str = "utf-8") -> str:
+    """
+    Decodes the bytes of a JSON file of a Meta DDP and repairs its strings, see fix_mojibake
+
+    If the only escapes of characters in the file are Meta's escapes of bytes, the repair is done by
+    the codecs of Python in one pass: the escapes are decoded to the bytes they stand for,
+    and the result is decoded as UTF-8.
+    Otherwise, or if the bytes are not valid UTF-8, the text is decoded and repaired with fix_mojibake.
+
+    Args:
+        json_bytes (bytes): The JSON data in bytes.
+        encoding (str, optional): The encoding of the bytes, see json.detect_encoding. Defaults to "utf-8".
+
+    Returns:
+        str: The repaired JSON text.
+    """
+    if encoding in ("utf-8", "utf-8-sig") and not OTHER_ESCAPE.search(json_bytes):
+        start = 3 if encoding == "utf-8-sig" else 0
+        try:
+            with memoryview(json_bytes) as view:
+                return str(view[start:], "raw_unicode_escape").encode("latin1").decode("utf-8")
+        except UnicodeError:
+            pass
+
+    return fix_mojibake(str(json_bytes, encoding))
+
+
 class FileNotFoundInZipError(Exception):
     """
     The File you are looking for is not present in a zipfile
@@ -337,19 +521,14 @@ def extract_file_from_zip(zfile: str, file_to_extract: str) -> io.BytesIO:
     file_to_extract_bytes = io.BytesIO()
 
     try:
-        with zipfile.ZipFile(zfile, "r") as zf:
-            file_found = False
-
-            for f in zf.namelist():
-                logger.debug("Contained in zip: %s", f)
-                if re.match(rf"^.*{re.escape(file_to_extract)}$", f):
-                    file_to_extract_bytes = io.BytesIO(zf.read(f))
-                    file_found = True
-                    break
-
-        if not file_found:
+        index = zip_index.get_index(zfile)
+        info = index.find(file_to_extract)
+        if info is None:
             raise FileNotFoundInZipError("File not found in zip")
 
+        file_to_extract_bytes = io.BytesIO(index.read(info))
+        tracing.count("bytes_read", file_to_extract_bytes.getbuffer().nbytes)
+
     except zipfile.BadZipFile as e:
         logger.error("BadZipFile:  %s", e)
     except FileNotFoundInZipError as e:
@@ -361,26 +540,117 @@ def extract_file_from_zip(zfile: str, file_to_extract: str) -> io.BytesIO:
         return file_to_extract_bytes
 
 
-def _json_reader_bytes(json_bytes: bytes, encoding: str) -> Any:
+class SizedStream(io.BufferedIOBase):
+    """
+    A readable stream over a member of a zip file, with the uncompressed size of the member
+
+    Attributes:
+        name (str): Name of the member in the zip, empty if the member was not found.
+        size (int): Uncompressed size of the member in bytes.
     """
-    Reads JSON data from bytes using the specified encoding.
-    This function should not be used directly.
+
+    def __init__(self, stream: IO[bytes], size: int, name: str = ""):
+        super().__init__()
+        self.stream = stream
+        self.size = size
+        self.name = name
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> bytes:
+        return self.stream.read(size)
+
+    def read1(self, size: int = -1) -> bytes:
+        read1 = getattr(self.stream, "read1", None)
+        return read1(size) if read1 else self.stream.read(size)
+
+    def close(self) -> None:
+        if not self.closed:
+            self.stream.close()
+        super().close()
+
+
+def open_file_from_zip(zfile: str, file_to_extract: str) -> SizedStream:
+    """
+    Opens a specific file in a zipfile as a stream, without reading it into memory.
+
+    The member is decompressed while it is read. Readers use the size of the stream to choose
+    between reading the member into memory at once, or processing it in parts, see STREAM_THRESHOLD_BYTES.
 
     Args:
-        json_bytes (bytes): The JSON data in bytes.
-        encoding (str): The encoding to use for decoding the bytes.
+        zfile (str): Path to the zip file.
+        file_to_extract (str): Name or path of the file to open in the zip,
+            the first member that ends with it is opened.
 
     Returns:
-        Any: The parsed JSON data.
+        SizedStream: A stream of the member with its uncompressed size.
+                     An empty stream with size 0 if the file is not found or an error occurs.
 
-    Examples:
-        >>> data = _json_reader_bytes(b'{"key": "value"}', "utf-8")
-        >>> print(data)
-        {'key': 'value'}
+    Examples::
+
+        >>> with open_file_from_zip("chatgpt.zip", "conversations.json") as f:
+        ...     print(f.size)
+        ...     conversations = read_json_from_bytes(f)
     """
-    json_str = json_bytes.decode(encoding)
-    result = json.loads(json_str)
-    return result
+    try:
+        index = zip_index.get_index(zfile)
+        info = index.find(file_to_extract)
+        if info is None:
+            raise FileNotFoundInZipError("File not found in zip")
+
+        tracing.count("bytes_read", info.file_size)
+        return SizedStream(index.open(info), info.file_size, info.filename)
+
+    except zipfile.BadZipFile as e:
+        logger.error("BadZipFile:  %s", e)
+    except FileNotFoundInZipError as e:
+        logger.error("File not found:  %s: %s", file_to_extract, e)
+    except Exception as e:
+        logger.error("Exception was caught:  %s", e)
+
+    return SizedStream(io.BytesIO(), 0)
+
+
+def _buffer_small_stream(b: IO[bytes]) -> IO[bytes]:
+    """
+    Reads a SizedStream smaller than STREAM_THRESHOLD_BYTES into memory, decompressing it in one go
+    Other streams are returned as they are
+    """
+    if isinstance(b, SizedStream) and b.size <= STREAM_THRESHOLD_BYTES:
+        with b:
+            return io.BytesIO(b.read())
+    return b
+
+
+def get_member_sizes(zfile: str) -> dict[str, int]:
+    """
+    Returns the uncompressed sizes of all members in a zip file.
+
+    The sizes are read from the cached central directory of the zip file, no member is decompressed.
+
+    Args:
+        zfile (str): Path to the zip file.
+
+    Returns:
+        dict[str, int]: A dictionary mapping member names to their uncompressed size in bytes.
+                        Returns an empty dictionary if the file is not a valid zip file.
+
+    Examples::
+
+        >>> get_member_sizes("archive.zip")
+        {'data/conversations.json': 1024, 'data/user.json': 64}
+    """
+    out = {}
+
+    try:
+        out = zip_index.get_index(zfile).sizes()
+    except zipfile.BadZipFile as e:
+        logger.debug("BadZipFile:  %s", e)
+    except Exception as e:
+        logger.error("Exception was caught:  %s", e)
+
+    return out
 
 
 def _json_reader_file(json_file: str, encoding: str) -> Any:
@@ -412,7 +682,7 @@ def _read_json(json_input: Any, json_reader: Callable[[Any, str], Any]) -> dict[
     This function should not be used directly.
 
     Args:
-        json_input (Any): The JSON input (can be bytes or file path).
+        json_input (Any): The JSON input, for example a file path.
         json_reader (Callable[[Any, str], Any]): A function to read the JSON input.
 
     Returns:
@@ -426,7 +696,7 @@ def _read_json(json_input: Any, json_reader: Callable[[Any, str], Any]) -> dict[
 
     Examples::
 
-        >>> data = _read_json(b'{"key": "value"}', _json_reader_bytes)
+        >>> data = _read_json("data.json", _json_reader_file)
         >>> print(data)
         {'key': 'value'}
     """
@@ -457,12 +727,22 @@ def _read_json(json_input: Any, json_reader: Callable[[Any, str], Any]) -> dict[
     return out
 
 
-def read_json_from_bytes(json_bytes: io.BytesIO) -> dict[Any, Any] | list[Any]:
+def read_json_from_bytes(
+    json_bytes: io.BytesIO | IO[bytes],
+    repair_mojibake: bool = False,
+) -> dict[Any, Any] | list[Any]:
     """
     Reads JSON data from a BytesIO buffer.
 
+    The encoding is detected from the first bytes: a BOM (utf-8-sig, utf-16, utf-32) or the pattern of null bytes
+    that JSON in utf-16 or utf-32 without a BOM has, utf-8 otherwise. The bytes are decoded once with that encoding.
+    A stream such as a SizedStream is read into a single bytes object, which is released before
+    the text is parsed, so the content is held in memory once as bytes or as text but not both.
+
     Args:
-        json_bytes (io.BytesIO): A BytesIO buffer containing JSON data.
+        json_bytes (io.BytesIO | IO[bytes]): A BytesIO buffer or a stream containing JSON data.
+        repair_mojibake (bool, optional): Repair the strings of Meta DDPs while decoding, see decode_meta_json.
+            Defaults to False.
 
     Returns:
         dict[Any, Any] | list[Any]: The parsed JSON data as a dictionary or list.
@@ -470,15 +750,29 @@ def read_json_from_bytes(json_bytes: io.BytesIO) -> dict[Any, Any] | list[Any]:
 
     Examples::
 
-        >>> buffer = io.BytesIO(b'{"key": "value"}')
+        >>> buffer = io.BytesIO(b'\\xef\\xbb\\xbf{"key": "value"}')
         >>> data = read_json_from_bytes(buffer)
         >>> print(data)
         {'key': 'value'}
     """
     out: dict[Any, Any] | list[Any] = {}
+    encoding = "utf-8"
     try:
         b = json_bytes.read()
-        out = _read_json(b, _json_reader_bytes)
+        encoding = json.detect_encoding(b[:4])
+        text = decode_meta_json(b, encoding) if repair_mojibake else str(b, encoding)
+        del b
+        result = json.loads(text)
+        del text
+
+        if not isinstance(result, (dict, list)):
+            raise TypeError("Did not convert bytes to a list or dict, but to another type instead")
+
+        out = result
+        logger.debug("Succesfully converted json bytes with encoding: %s", encoding)
+
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        logger.error("Cannot decode json with encoding: %s", encoding)
     except Exception as e:
         logger.error("%s, could not convert json bytes", e)
 
@@ -506,12 +800,15 @@ def read_json_from_file(json_file: str) -> dict[Any, Any] | list[Any]:
     return out
 
 
-def read_csv_from_bytes(json_bytes: io.BytesIO) -> list[dict[Any, Any]]:
+def read_csv_from_bytes(json_bytes: io.BytesIO | IO[bytes]) -> list[dict[Any, Any]]:
     """
     Reads CSV data from a BytesIO buffer and returns it as a list of dictionaries.
 
+    A SizedStream larger than STREAM_THRESHOLD_BYTES is parsed while it is decompressed,
+    without holding the whole member in memory.
+
     Args:
-        json_bytes (io.BytesIO): A BytesIO buffer containing CSV data.
+        json_bytes (io.BytesIO | IO[bytes]): A BytesIO buffer or a stream containing CSV data.
 
     Returns:
         list[dict[Any, Any]]: A list of dictionaries, where each dictionary represents a row in the CSV.
@@ -527,7 +824,7 @@ def read_csv_from_bytes(json_bytes: io.BytesIO) -> list[dict[Any, Any]]:
     out: list[dict[Any, Any]] = []
 
     try:
-        stream = io.TextIOWrapper(json_bytes, encoding="utf-8")
+        stream = io.TextIOWrapper(_buffer_small_stream(json_bytes), encoding="utf-8")
         reader = csv.DictReader(stream)
         for row in reader:
             out.append(row)
@@ -540,12 +837,12 @@ def read_csv_from_bytes(json_bytes: io.BytesIO) -> list[dict[Any, Any]]:
         return out
 
 
-def read_csv_from_bytes_to_df(json_bytes: io.BytesIO) -> pd.DataFrame:
+def read_csv_from_bytes_to_df(json_bytes: io.BytesIO | IO[bytes]) -> pd.DataFrame:
     """
     Reads CSV data from a BytesIO buffer and returns it as a pandas DataFrame.
 
     Args:
-        json_bytes (io.BytesIO): A BytesIO buffer containing CSV data.
+        json_bytes (io.BytesIO | IO[bytes]): A BytesIO buffer or a stream containing CSV data.
 
     Returns:
         pd.DataFrame: A pandas DataFrame containing the CSV data.
@@ -560,3 +857,30 @@ def read_csv_from_bytes_to_df(json_bytes: io.BytesIO) -> pd.DataFrame:
         1    Bob   25
     """
     return pd.DataFrame(read_csv_from_bytes(json_bytes))
+
+
+def read_lines_from_bytes(text_bytes: io.BytesIO | IO[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Reads text from a BytesIO buffer or a stream line by line.
+
+    A SizedStream larger than STREAM_THRESHOLD_BYTES is decoded while it is decompressed,
+    so only the current part of the text is held in memory.
+
+    Args:
+        text_bytes (io.BytesIO | IO[bytes]): A BytesIO buffer or a stream containing text.
+        encoding (str, optional): Encoding of the text. Defaults to "utf-8".
+
+    Yields:
+        str: The lines of the text split at "\n", including their line endings.
+             Stops at the first line that cannot be decoded, the error is logged.
+
+    Examples::
+
+        >>> with open_file_from_zip("tiktok.zip", "Searches.txt") as f:
+        ...     searches = [line for line in read_lines_from_bytes(f) if line.startswith("Search Term:")]
+    """
+    try:
+        with io.TextIOWrapper(_buffer_small_stream(text_bytes), encoding=encoding, newline="\n") as stream:
+            yield from stream
+    except Exception as e:
+        logger.error("%s, could not read lines", e)
@@ -0,0 +1,162 @@
+"""
+This module contains a streaming reader for large JSON arrays
+
+DDPs often contain a single JSON array with one record per item, for example the tweets in tweets.js of X.
+Parsing the file as a whole holds the text and every record in memory at once, while an extractor
+needs only a few fields of every record. The reader decodes the stream in chunks and yields the elements
+of the array one by one, projected to the fields that are needed, so only the projected values are kept.
+
+Examples::
+
+    import port.helpers.json_stream as json_stream
+
+    with eh.open_file_from_zip("x.zip", "tweets.js") as f:
+        for created_at, full_text in json_stream.iter_array(f, [("tweet", "created_at"), ("tweet", "full_text")]):
+            print(created_at, full_text)
+"""
+from typing import Any, IO, Iterator, Sequence
+import codecs
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Number of bytes read from the stream at once
+CHUNK_SIZE = 1024 * 1024
+
+Path = Sequence[str | int]
+
+_MISSING = object()
+
+
+def project(item: Any, path: Path, default: Any = None) -> Any:
+    """
+    Returns the value at a path of keys and list indices in a JSON value, default if the path does not exist
+
+    Examples::
+
+        >>> project({"tweet": {"entities": {"urls": [{"url": "a"}]}}}, ("tweet", "entities", "urls", 0, "url"))
+        'a'
+    """
+    for key in path:
+        if isinstance(item, dict):
+            item = item.get(key, _MISSING)
+        elif isinstance(item, list) and isinstance(key, int) and -len(item) <= key < len(item):
+            item = item[key]
+        else:
+            return default
+        if item is _MISSING:
+            return default
+    return item
+
+
+class _TextBuffer:
+    """
+    Text decoded from a stream in chunks, the consumed part is dropped when the buffer is extended
+    """
+
+    def __init__(self, stream: IO[bytes], encoding: str, chunk_size: int):
+        self.stream = stream
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def extend(self) -> bool:
+        """
+        Decodes the next chunk, at least as large as the unconsumed text so parsing a large element is not quadratic.
+        Returns False at the end of the stream.
+        """
+        if self.eof:
+            return False
+        chunk = self.stream.read(max(self.chunk_size, len(self.text) - self.pos))
+        self.eof = not chunk
+        self.text = self.text[self.pos:] + self.decoder.decode(chunk, final=self.eof)
+        self.pos = 0
+        return True
+
+    def skip_whitespace(self) -> str:
+        """
+        Returns the next character that is not whitespace without consuming it, an empty string at the end of the stream
+        """
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in " \t\n\r":
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.extend():
+                return ""
+
+
+def iter_array(
+    stream: IO[bytes],
+    paths: Sequence[Path] | None = None,
+    encoding: str = "utf-8-sig",
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Any]:
+    """
+    Yields the elements of the first JSON array in a stream, one by one
+
+    Anything before the array is skipped, such as the "window.YTD.tweets.part0 = " assignment in X .js files.
+    Every element is parsed on its own and released once it is projected, the array is never held in memory.
+
+    Args:
+        stream (IO[bytes]): Binary stream, for example from extraction_helpers.open_file_from_zip.
+        paths (Sequence[Path] | None, optional): Paths of the fields to keep, see project.
+            If given a tuple with the value of every path is yielded, None for paths that do not exist.
+            Defaults to None, yielding the elements themselves.
+        encoding (str, optional): Encoding of the stream. Defaults to "utf-8-sig", utf-8 with an optional BOM.
+        chunk_size (int, optional): Number of bytes read at once. Defaults to CHUNK_SIZE.
+
+    Raises:
+        json.JSONDecodeError: If the stream contains no array or the array is not valid JSON.
+            Elements before the error have been yielded.
+
+    Examples::
+
+        >>> stream = io.BytesIO(b'x = [{"a": {"b": 1}}, {"a": {}}]')
+        >>> list(iter_array(stream, [("a", "b")]))
+        [(1,), (None,)]
+    """
+    decoder = json.JSONDecoder()
+    buffer = _TextBuffer(stream, encoding, chunk_size)
+
+    while True:
+        start = buffer.text.find("[", buffer.pos)
+        if start >= 0:
+            buffer.pos = start + 1
+            break
+        buffer.pos = len(buffer.text)
+        if not buffer.extend():
+            raise json.JSONDecodeError("No JSON array found", buffer.text, buffer.pos)
+
+    if buffer.skip_whitespace() == "]":
+        return
+
+    while True:
+        try:
+            element, end = decoder.raw_decode(buffer.text, buffer.pos)
+        except json.JSONDecodeError:
+            if buffer.extend():
+                continue
+            raise
+
+        # a number at the end of the text may continue in the next chunk, for example 2.5 in 2.5e10
+        if (end == len(buffer.text) or buffer.text[end] in ".eE+-") and buffer.extend():
+            continue
+
+        buffer.pos = end
+        if paths is None:
+            yield element
+        else:
+            yield tuple(project(element, path) for path in paths)
+        del element
+
+        separator = buffer.skip_whitespace()
+        if separator == "]":
+            return
+        if separator != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer.text, buffer.pos)
+        buffer.pos += 1
+        buffer.skip_whitespace()
@@ -0,0 +1,59 @@
+"""
+This module contains a helper to defer the import of heavy modules until they are used
+
+In Pyodide importing pandas takes seconds. Modules that are needed to render the first prompt
+import pandas, numpy and dateutil lazily, so they are only loaded once extraction starts.
+
+Examples::
+
+    from __future__ import annotations
+    from typing import TYPE_CHECKING
+
+    from port.helpers.lazy import lazy_import
+
+    if TYPE_CHECKING:
+        import pandas as pd
+    else:
+        pd = lazy_import("pandas")
+
+    def to_df(rows) -> pd.DataFrame:   # annotations are not evaluated
+        return pd.DataFrame(rows)      # pandas is imported here, on first use
+"""
+from typing import Any
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that imports the module on first attribute access
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__module: types.ModuleType | None = None
+
+    def _load(self) -> types.ModuleType:
+        if self.__module is None:
+            self.__module = importlib.import_module(self.__name__)
+        return self.__module
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._load(), attribute)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> Any:
+    """
+    Returns the module if it is already imported, otherwise a LazyModule that imports it on first use
+
+    Args:
+        name (str): Full name of the module, for example "pandas" or "dateutil.parser".
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
@@ -0,0 +1,156 @@
+"""
+This module contains helpers to measure memory usage during extraction
+
+Memory is measured with tracemalloc, which traces the allocations made by Python and by numpy (pandas).
+Tracing allocations slows down extraction, so it has to be started explicitly with start().
+
+In Pyodide the size of the WebAssembly heap is measured as well. The heap only grows,
+so the growth of the heap during an extraction step shows which step caused the heap to grow.
+This also works when tracemalloc is not started.
+
+Examples::
+
+    import port.helpers.memory as memory
+
+    memory.start()
+    with memory.measure("chatgpt_conversations") as measurement:
+        df = conversations_to_df("chatgpt.zip")
+    measurement.dataframe_bytes = memory.dataframe_bytes(df)
+    memory.stop()
+
+    measurement.toDict()
+    {'name': 'chatgpt_conversations', 'allocated_bytes': 1210032, 'peak_bytes': 16823464,
+     'heap_bytes': None, 'heap_growth_bytes': None, 'dataframe_bytes': 1203412}
+"""
+from dataclasses import dataclass, asdict
+from typing import Any
+import logging
+import tracemalloc
+
+import port.helpers.executors as executors
+
+logger = logging.getLogger(__name__)
+
+
+class _State:
+    started: bool = False
+    max_peak: int = 0
+
+
+def start() -> None:
+    """
+    Starts tracing memory allocations, if they are not traced already
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _State.started = True
+    _State.max_peak = 0
+
+
+def stop() -> None:
+    """
+    Stops tracing memory allocations, if tracing was started by start()
+    """
+    if _State.started:
+        tracemalloc.stop()
+        _State.started = False
+
+
+def is_tracing() -> bool:
+    return tracemalloc.is_tracing()
+
+
+def peak_bytes() -> int:
+    """
+    Returns the peak of traced memory since start(), also when measure() has reset the peak in between
+    """
+    if not tracemalloc.is_tracing():
+        return 0
+    _, peak = tracemalloc.get_traced_memory()
+    return max(_State.max_peak, peak)
+
+
+def pyodide_heap_bytes() -> int | None:
+    """
+    Returns the size of the WebAssembly heap in Pyodide, None when not running in Pyodide
+    """
+    if not executors.is_pyodide():
+        return None
+    try:
+        import pyodide_js  # pyright: ignore
+        return int(pyodide_js._module.HEAP8.length)
+    except Exception:
+        return None
+
+
+def dataframe_bytes(df: Any) -> int | None:
+    """
+    Returns the memory used by a DataFrame, including the contents of object columns such as strings
+    """
+    try:
+        return int(df.memory_usage(deep=True).sum())
+    except Exception as e:
+        logger.debug("Cannot determine memory usage: %s", e)
+        return None
+
+
+@dataclass
+class MemoryMeasurement:
+    """
+    Memory used by a block of code
+
+    Attributes:
+        name (str): Name of the measured block, for example the id of the extracted table.
+        allocated_bytes (int): Traced memory that was still allocated at the end of the block.
+        peak_bytes (int): Peak of traced memory during the block, on top of the memory allocated before the block.
+        heap_bytes (int | None): Size of the Pyodide heap at the end of the block.
+        heap_growth_bytes (int | None): Growth of the Pyodide heap during the block.
+        dataframe_bytes (int | None): Memory used by the DataFrame produced by the block, see dataframe_bytes().
+    """
+    name: str
+    allocated_bytes: int = 0
+    peak_bytes: int = 0
+    heap_bytes: int | None = None
+    heap_growth_bytes: int | None = None
+    dataframe_bytes: int | None = None
+
+    def toDict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class measure:
+    """
+    Context manager that measures the memory used by the code in its block
+
+    Measurements should not be nested, because the tracemalloc peak is reset at the start of every measurement.
+
+    Args:
+        name (str): Name of the measurement.
+    """
+
+    def __init__(self, name: str):
+        self.measurement = MemoryMeasurement(name)
+        self.before = 0
+        self.heap_before = None
+
+    def __enter__(self) -> MemoryMeasurement:
+        self.heap_before = pyodide_heap_bytes()
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            _State.max_peak = max(_State.max_peak, peak)
+            tracemalloc.reset_peak()
+            self.before = current
+        return self.measurement
+
+    def __exit__(self, *exc_info) -> None:
+        measurement = self.measurement
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            _State.max_peak = max(_State.max_peak, peak)
+            measurement.allocated_bytes = current - self.before
+            measurement.peak_bytes = peak - self.before
+
+        heap_after = pyodide_heap_bytes()
+        if heap_after is not None and self.heap_before is not None:
+            measurement.heap_bytes = heap_after
+            measurement.heap_growth_bytes = heap_after - self.heap_before
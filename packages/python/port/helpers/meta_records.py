@@ -0,0 +1,158 @@
+"""
+This module contains a normalizer for the records in Meta DDPs (Instagram, Facebook)
+
+Meta wraps the fields of a record in containers with labels that depend on the language of the DDP::
+
+    {"title": "account", "string_list_data": [{"href": "https://...", "value": "account", "timestamp": 1700000000}]}
+    {"string_map_data": {"Author": {"value": "account"}, "Time": {"timestamp": 1700000000}}}
+    {"label_values": [{"label": "Author", "value": "account"}]}
+
+normalize flattens the containers of all records into columns in one pass, an extractor selects the columns it needs:
+
+* Fields of the record itself that are not containers are named after their key: "title"
+* Fields of string_map_data and label_values are named "<label>.<field>": "Author.value", "Time.timestamp"
+* Fields of string_list_data are named after their key: "href", "value", "timestamp"
+
+If a record has a field more than once, for example in two entries of string_list_data, the first one is kept.
+Labels in other languages are renamed with LABEL_VARIANTS, for example "Tijd" to "Time",
+unless the record also has the label itself.
+
+Examples::
+
+    import port.helpers.meta_records as meta_records
+
+    columns = meta_records.normalize(d["impressions_history_posts_seen"])
+    df = pd.DataFrame({
+        "Author": columns.get("Author.value"),
+        "Date": eh.epoch_to_iso_series(pd.Series(columns.get("Time.timestamp"), dtype=object)),
+    })
+"""
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator
+
+import port.helpers.sampling as sampling
+
+# Labels in other languages and the label they are renamed to
+LABEL_VARIANTS = {
+    "Tijd": "Time",
+}
+
+_MISSING = object()
+
+
+@dataclass
+class RecordColumns:
+    """
+    The fields of normalized records as columns
+
+    Attributes:
+        n (int): Number of records.
+        values (dict[str, list[Any]]): Values of every column, one per record, a marker for records without the field.
+        total (int): Number of records before sampling, see normalize.
+    """
+    n: int = 0
+    values: dict[str, list[Any]] = field(default_factory=dict)
+    total: int = 0
+
+    def get(self, name: str, default: Any = "") -> list[Any]:
+        """
+        Returns the values of a column, default for records without the field
+        """
+        column = self.values.get(name)
+        if column is None:
+            return [default] * self.n
+        return [default if value is _MISSING else value for value in column]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.values
+
+
+def _is_scalar(value: Any) -> bool:
+    return not isinstance(value, (dict, list))
+
+
+def _labeled_fields(label: Any, entry: Any) -> Iterator[tuple[str, Any]]:
+    if isinstance(entry, dict):
+        for key, value in entry.items():
+            if key != "label" and _is_scalar(value):
+                yield f"{label}.{key}", value
+
+
+def fields(record: Any) -> Iterator[tuple[str, Any]]:
+    """
+    Yields the normalized name and value of every field of a record, see the module documentation for the names
+    """
+    if not isinstance(record, dict):
+        return
+
+    for key, value in record.items():
+        if key == "string_map_data" and isinstance(value, dict):
+            for label, entry in value.items():
+                variant = LABEL_VARIANTS.get(label)
+                if variant is not None and variant not in value:
+                    label = variant
+                yield from _labeled_fields(label, entry)
+
+        elif key == "label_values" and isinstance(value, list):
+            entries = [entry for entry in value if isinstance(entry, dict) and "label" in entry]
+            labels = {entry["label"] for entry in entries}
+            for entry in entries:
+                label = entry["label"]
+                variant = LABEL_VARIANTS.get(label)
+                if variant is not None and variant not in labels:
+                    label = variant
+                yield from _labeled_fields(label, entry)
+
+        elif key == "string_list_data" and isinstance(value, list):
+            for entry in value:
+                if isinstance(entry, dict):
+                    for list_key, list_value in entry.items():
+                        if _is_scalar(list_value):
+                            yield list_key, list_value
+
+        elif _is_scalar(value):
+            yield key, value
+
+
+def normalize(
+    records: Iterable[Any],
+    columns: RecordColumns | None = None,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> RecordColumns:
+    """
+    Flattens the Meta containers of records into columns in one pass over the records
+
+    Args:
+        records (Iterable[Any]): The records, for example the list under "impressions_history_posts_seen".
+        columns (RecordColumns | None, optional): Columns to append the records to,
+            for example for a table that is split over several files. Defaults to None, new columns.
+        max_rows (int | None, optional): Sample the records to at most max_rows before they are flattened,
+            see sampling.sample. Defaults to None, all records.
+        strategy (str, optional): How the records are sampled. Defaults to sampling.HEAD_TAIL.
+
+    Returns:
+        RecordColumns: A column for every field that occurs in the records.
+    """
+    if columns is None:
+        columns = RecordColumns()
+    values = columns.values
+
+    records, total = sampling.sample(records, max_rows, strategy)
+    columns.total += total
+
+    for record in records:
+        n = columns.n
+        for name, value in fields(record):
+            column = values.get(name)
+            if column is None:
+                column = values[name] = [_MISSING] * n
+            if len(column) == n:
+                column.append(value)
+
+        columns.n = n + 1
+        for column in values.values():
+            if len(column) == n:
+                column.append(_MISSING)
+
+    return columns
@@ -1,5 +1,11 @@
+import itertools
+import hashlib
+import json
+from typing import Any, Generator
+
 import port.api.props as props
 import port.api.d3i_props as d3i_props
+import port.helpers.tracing as tracing
 
 from port.api.commands import (
     CommandSystemDonate, 
@@ -8,6 +14,9 @@ from port.api.commands import (
 )
 
 
+DEFAULT_DONATION_PART_BYTES = 5 * 1024 * 1024
+
+
 def render_page(
     header_text: props.Translatable, 
     body: (
@@ -18,6 +27,7 @@ def render_page(
         | d3i_props.PropsUIPromptFileInputMultiple
         | d3i_props.PropsUIPromptQuestionnaire
         | props.PropsUIPromptConfirm 
+        | props.PropsUIPromptProgress
     )
 ) -> CommandUIRender:
     """
@@ -109,6 +119,27 @@ def generate_file_prompt(extensions: str, multiple: bool = False) -> props.Props
     return props.PropsUIPromptFileInput(description, extensions)
 
 
+def generate_progress_prompt(
+        description: props.Translatable,
+        message: str,
+        percentage: int | None = None
+) -> props.PropsUIPromptProgress:
+    """
+    Generates a progress prompt that informs the participant while data is being extracted.
+
+    The prompt resolves directly after it is rendered, so control is given back to the script immediately.
+
+    Args:
+        description (props.Translatable): A translatable text explaining what is happening.
+        message (str): A message that can be used to show what is currently being extracted.
+        percentage (int | None, optional): The extraction progress as a percentage. Defaults to None.
+
+    Returns:
+        props.PropsUIPromptProgress: A progress prompt object, that needs to be rendered using render_page().
+    """
+    return props.PropsUIPromptProgress(description, message, percentage)
+
+
 def generate_review_data_prompt(
         description: props.Translatable,
         table_list: list[d3i_props.PropsUIPromptConsentFormTableViz]
@@ -144,6 +175,7 @@ def generate_review_data_prompt(
     )
 
 
+@tracing.traced
 def donate(key: str, json_string: str) -> CommandSystemDonate:
     """
     Initiates a donation process using the provided key and data.
@@ -158,9 +190,105 @@ def donate(key: str, json_string: str) -> CommandSystemDonate:
     Returns:
         CommandSystemDonate: A system command that initiates the donation process. Must be yielded.
     """
+    tracing.count("donated_characters", len(json_string))
     return CommandSystemDonate(key, json_string)
 
 
+def _iter_string_parts(json_string: str, max_part_bytes: int) -> Generator[str, None, None]:
+    """
+    Slices a string into parts whose utf-8 encoding does not exceed max_part_bytes.
+    This function should not be used directly.
+
+    Slicing is done on characters, so a multi-byte character is never split across two parts.
+    Only the slice that is currently being measured is encoded.
+    """
+    start = 0
+    length = len(json_string)
+    while start < length:
+        n_chars = min(max_part_bytes, length - start)
+        while True:
+            n_bytes = len(json_string[start:start + n_chars].encode("utf-8"))
+            if n_bytes <= max_part_bytes:
+                break
+            # Shrink proportionally, a utf-8 character is at most 4 bytes
+            n_chars = max(1, min(n_chars - 1, n_chars * max_part_bytes // n_bytes))
+
+        yield json_string[start:start + n_chars]
+        start += n_chars
+
+
+def donate_in_parts(
+    key: str,
+    json_string: str,
+    max_part_bytes: int = DEFAULT_DONATION_PART_BYTES,
+) -> Generator[CommandSystemDonate, Any, None]:
+    """
+    Initiates a donation that is split into sequenced, checksummed parts.
+
+    Large donations can exceed the memory and request size limits of the browser.
+    This generator slices the donated string into parts of at most max_part_bytes (utf-8 encoded)
+    and yields a donate command for each part, with the keys: {key}-part-{n} (n starting at 1).
+    Only the part that is currently being donated is materialized.
+
+    After the last part a manifest is donated with the key: {key}-manifest.
+    The manifest is a JSON object containing the number of parts, the size and sha256 checksum of every part,
+    and the size and sha256 checksum of the complete donation. Concatenating the parts in order
+    reproduces the original string.
+
+    If the donation fits in a single part, a single regular donation with the provided key is made instead.
+
+    Args:
+        key (str): The key associated with the donation process. The key will be used in the file names.
+        json_string (str): A JSON-formatted string containing the donated data.
+        max_part_bytes (int, optional): The maximum size of a single part in bytes. 
+            Defaults to DEFAULT_DONATION_PART_BYTES.
+
+    Yields:
+        CommandSystemDonate: System commands that initiate the donation of a part. Must be yielded.
+
+    Examples::
+
+        yield from donate_in_parts(f"{session_id}", reviewed_data, max_part_bytes=1024 * 1024)
+    """
+    if max_part_bytes < 4:
+        raise ValueError("max_part_bytes should be at least 4 bytes, the size of the largest utf-8 character")
+
+    string_parts = _iter_string_parts(json_string, max_part_bytes)
+    first_part = next(string_parts, "")
+    if len(first_part) == len(json_string):
+        yield donate(key, json_string)
+        return
+
+    total_hash = hashlib.sha256()
+    total_bytes = 0
+    parts = []
+
+    for number, part in enumerate(itertools.chain([first_part], string_parts), start=1):
+        first_part = ""  # release the reference, only the current part is kept in memory
+        part_bytes = part.encode("utf-8")
+        total_hash.update(part_bytes)
+        total_bytes += len(part_bytes)
+        part_key = f"{key}-part-{number}"
+        parts.append({
+            "key": part_key,
+            "number": number,
+            "bytes": len(part_bytes),
+            "sha256": hashlib.sha256(part_bytes).hexdigest(),
+        })
+        del part_bytes
+
+        yield donate(part_key, part)
+
+    manifest = {
+        "key": key,
+        "number_of_parts": len(parts),
+        "bytes": total_bytes,
+        "sha256": total_hash.hexdigest(),
+        "parts": parts,
+    }
+    yield donate(f"{key}-manifest", json.dumps(manifest))
+
+
 def exit(code: int, info: str) -> CommandSystemExit:
     """
     Exits Next with the provided exit code and additional information.
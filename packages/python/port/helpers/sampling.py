@@ -0,0 +1,235 @@
+"""
+This module contains helpers to keep tables within a row and byte budget
+
+Tables that exceed their budget are reduced to a sample of rows, so the consent form stays fast and reviewable:
+
+* head_tail: the first and the last rows, for tables in which order matters, such as histories
+* reservoir: a uniform random sample of the rows, in their original order
+
+sample() samples any iterable with either strategy in a single pass, with memory proportional to the sample size.
+Extraction functions that produce rows one by one use it before a DataFrame is created,
+and record the number of rows they produced in the attrs of the DataFrame with mark_sampled().
+apply_budget() is the fallback for tables that are only over budget once they are a DataFrame, for example in bytes.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from collections import deque
+from itertools import islice
+from typing import Iterable, Iterator, TypeVar, TYPE_CHECKING
+import math
+import random
+
+from port.helpers.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+import port.helpers.memory as memory
+
+T = TypeVar("T")
+
+HEAD_TAIL = "head_tail"
+RESERVOIR = "reservoir"
+STRATEGIES = [HEAD_TAIL, RESERVOIR]
+
+# Key in DataFrame.attrs with the number of rows of a table before it was sampled
+TOTAL_ROWS = "total_rows"
+
+
+@dataclass
+class BudgetResult:
+    """
+    Attributes:
+        data_frame (pd.DataFrame): The table within budget.
+        sampled (bool): Whether rows were dropped to stay within budget, here or while the table was extracted.
+        total_rows (int): Number of rows before sampling.
+    """
+    data_frame: pd.DataFrame
+    sampled: bool
+    total_rows: int
+
+
+def reservoir_sample(items: Iterable[T], k: int, seed: int = 0) -> list[T]:
+    """
+    Returns a uniform random sample of k items, in the order in which they occurred
+
+    Iterates over items once and keeps at most k items in memory (Li's algorithm L).
+    The sample is deterministic for a given seed.
+
+    Args:
+        items (Iterable[T]): Items to sample from, for example a generator of rows.
+        k (int): Sample size.
+        seed (int, optional): Seed of the random number generator. Defaults to 0.
+
+    Returns:
+        list[T]: All items if there are k or less, otherwise k items.
+    """
+    if k <= 0:
+        return []
+
+    rng = random.Random(seed)
+    reservoir: list[tuple[int, T]] = []
+    iterator = enumerate(items)
+
+    for position, item in iterator:
+        reservoir.append((position, item))
+        if len(reservoir) == k:
+            break
+    else:
+        return [item for _, item in reservoir]
+
+    # Skip over items that would not enter the reservoir, instead of drawing a random number for every item
+    w = math.exp(math.log(rng.random()) / k)
+    while True:
+        skip = math.floor(math.log(rng.random()) / math.log(1 - w))
+        for _ in range(skip):
+            if next(iterator, None) is None:
+                return [item for _, item in sorted(reservoir, key=lambda pair: pair[0])]
+        entry = next(iterator, None)
+        if entry is None:
+            return [item for _, item in sorted(reservoir, key=lambda pair: pair[0])]
+        reservoir[rng.randrange(k)] = entry
+        w *= math.exp(math.log(rng.random()) / k)
+
+
+def head_tail_sample(items: Iterable[T], k: int) -> tuple[list[T], int]:
+    """
+    Returns the first ceil(k / 2) and the last floor(k / 2) items, and the number of items
+
+    Iterates over items once and keeps at most k items in memory.
+    """
+    iterator = iter(items)
+    head = list(islice(iterator, (k + 1) // 2)) if k > 0 else []
+    tail: deque[T] = deque(maxlen=k - len(head)) if k > 0 else deque(maxlen=0)
+    n = len(head)
+    for n, item in enumerate(iterator, n + 1):
+        tail.append(item)
+    return head + list(tail), n
+
+
+def sample(items: Iterable[T], k: int | None, strategy: str = HEAD_TAIL, seed: int = 0) -> tuple[list[T], int]:
+    """
+    Samples items while they are produced, in a single pass
+
+    Args:
+        items (Iterable[T]): Items to sample from, for example a generator of rows or records.
+        k (int | None): Sample size, None to keep all items.
+        strategy (str, optional): HEAD_TAIL or RESERVOIR. Defaults to HEAD_TAIL.
+        seed (int, optional): Seed for RESERVOIR sampling. Defaults to 0.
+
+    Returns:
+        tuple[list[T], int]: The sampled items in their original order, and the number of items.
+
+    Raises:
+        ValueError: If strategy is unknown.
+
+    Examples::
+
+        rows, total_rows = sampling.sample(iter_rows(), max_rows, strategy)
+        df = sampling.mark_sampled(pd.DataFrame(rows), total_rows)
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown sampling strategy: {strategy}, expected one of {STRATEGIES}")
+
+    if k is None:
+        items = list(items)
+        return items, len(items)
+    if strategy == HEAD_TAIL:
+        return head_tail_sample(items, k)
+
+    total = 0
+
+    def counted() -> Iterator[T]:
+        nonlocal total
+        for item in items:
+            total += 1
+            yield item
+
+    return reservoir_sample(counted(), k, seed), total
+
+
+def mark_sampled(df: pd.DataFrame, total_rows: int) -> pd.DataFrame:
+    """
+    Records in the attrs of df that it is a sample of total_rows rows, if it has less rows
+    """
+    if total_rows > len(df):
+        df.attrs[TOTAL_ROWS] = total_rows
+    return df
+
+
+def total_rows(df: pd.DataFrame) -> int:
+    """
+    Returns the number of rows of df before it was sampled, see mark_sampled
+    """
+    return df.attrs.get(TOTAL_ROWS, len(df))
+
+
+def head_tail(df: pd.DataFrame, k: int) -> pd.DataFrame:
+    """
+    Returns the first ceil(k / 2) and the last floor(k / 2) rows of df
+    """
+    if len(df) <= k:
+        return df
+    head = (k + 1) // 2
+    tail = k - head
+    return pd.concat([df.iloc[:head], df.iloc[len(df) - tail:]]) if tail > 0 else df.iloc[:head]
+
+
+def budget_rows(df: pd.DataFrame, max_rows: int | None = None, max_bytes: int | None = None) -> int:
+    """
+    Returns the number of rows of df that fit in the budget
+
+    The size of the table is estimated with DataFrame.memory_usage(deep=True), assuming rows are of equal size.
+    """
+    rows = len(df)
+    if max_rows is not None:
+        rows = min(rows, max_rows)
+    if max_bytes is not None and rows > 0:
+        size = memory.dataframe_bytes(df)
+        if size is not None and size > max_bytes:
+            rows = min(rows, max(1, int(len(df) * max_bytes / size)))
+    return rows
+
+
+def apply_budget(
+    df: pd.DataFrame,
+    max_rows: int | None = None,
+    max_bytes: int | None = None,
+    strategy: str = HEAD_TAIL,
+    seed: int = 0,
+) -> BudgetResult:
+    """
+    Reduces df to a sample of rows when it exceeds max_rows or max_bytes
+
+    A df that was sampled while it was extracted, see mark_sampled, is reported as sampled even if it is within budget.
+
+    Args:
+        df (pd.DataFrame): The table.
+        max_rows (int | None, optional): Maximum number of rows, None for no maximum.
+        max_bytes (int | None, optional): Maximum memory usage of the table, None for no maximum.
+        strategy (str, optional): HEAD_TAIL or RESERVOIR. Defaults to HEAD_TAIL.
+        seed (int, optional): Seed for RESERVOIR sampling. Defaults to 0.
+
+    Returns:
+        BudgetResult: The table within budget and whether it was sampled.
+
+    Raises:
+        ValueError: If strategy is unknown.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown sampling strategy: {strategy}, expected one of {STRATEGIES}")
+
+    rows = len(df)
+    total = total_rows(df)
+    k = budget_rows(df, max_rows, max_bytes)
+    if k >= rows:
+        return BudgetResult(df, total > rows, total)
+
+    if strategy == RESERVOIR:
+        out = df.iloc[reservoir_sample(range(rows), k, seed)]
+    else:
+        out = head_tail(df, k)
+
+    return BudgetResult(mark_sampled(out.reset_index(drop=True), total), True, total)
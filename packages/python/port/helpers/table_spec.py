@@ -0,0 +1,233 @@
+"""
+This module contains declarative table specs and the engine that extracts them from a zip
+
+Most extractors read one JSON member, walk to a list of records and take a few fields of every record,
+sometimes converting a column, such as epoch timestamps to ISO 8601. A TableSpec describes such a table:
+the member, the path to the records and a path or find key per column. The engine reads and decodes the member once,
+collects every column in a list and applies the transforms to whole columns, after all records are read.
+
+A TableSpec is called like the extractor function it replaces, and has its name for tracing and memory measurements.
+Given a row budget, the records are sampled before their columns are extracted, see sampling.sample.
+
+Examples::
+
+    import port.helpers.extraction_helpers as eh
+    from port.helpers.table_spec import Column, TableSpec
+
+    who_youve_followed_to_df = TableSpec(
+        name="who_youve_followed_to_df",
+        member="who_you_ve_followed.json",
+        root=("following_v3",),
+        columns=(
+            Column("Name", ("name",)),
+            Column("Timestamp", ("timestamp",), transform=eh.epoch_to_iso_series),
+        ),
+    )
+
+    df = who_youve_followed_to_df("facebook.zip")
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Callable, Iterable, Iterator, TYPE_CHECKING
+import logging
+import math
+import re
+
+from port.helpers.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+import port.helpers.extraction_helpers as eh
+import port.helpers.sampling as sampling
+from port.helpers.json_stream import Path, project
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    A column of a table
+
+    Attributes:
+        name (str): Name of the column in the data frame.
+        path (Path): Keys and list indices of the value in a record, see json_stream.project.
+            The empty path is the record itself.
+        find (str | None): Key to match in the denested record instead of a path, see extraction_helpers.find_item.
+            The value is the least nested match as a string, "" if there is none.
+        default (Any): Value if the path does not exist in a record. Defaults to "".
+        transform (Callable[[pd.Series], pd.Series] | None): Function applied to the whole column
+            after all records are read, for example extraction_helpers.epoch_to_iso_series.
+    """
+    name: str
+    path: Path = ()
+    find: str | None = None
+    default: Any = ""
+    transform: Callable[[pd.Series], pd.Series] | None = None
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """
+    A table extracted from a JSON member of a zip, one row per record
+
+    Attributes:
+        name (str): Name of the extractor, used by tracing and memory measurements.
+        member (str): File to extract, see extraction_helpers.extract_file_from_zip.
+            If parts is True a format string with the part number, for example "likes_and_reactions_{}.json".
+        root (Path): Path to the records in the JSON document. Defaults to (), the document itself.
+        columns (tuple[Column, ...]): The columns of the table.
+        records (Callable[[Any], Iterable[Any]] | None): Function that returns the records from the value at root,
+            for records that are nested deeper than a list. Defaults to None, the value at root is the list of records.
+        parts (bool): Read the parts 1, 2, ... of member until a part is missing or empty. Defaults to False.
+    """
+    name: str
+    member: str
+    columns: tuple[Column, ...]
+    root: Path = ()
+    records: Callable[[Any], Iterable[Any]] | None = None
+    parts: bool = False
+
+    def __post_init__(self):
+        object.__setattr__(self, "__name__", self.name)
+
+    def __call__(self, zfile: str, max_rows: int | None = None, strategy: str = sampling.HEAD_TAIL) -> pd.DataFrame:
+        return to_df(zfile, self, max_rows, strategy)
+
+
+def _find_values(
+    denested: dict[Any, Any],
+    patterns: list[re.Pattern],
+    matches: dict[str, tuple[int, list[int]]],
+) -> list[str]:
+    """
+    Returns find_item for every pattern in one pass over the keys of a denested record
+
+    The depth of a key and the patterns it matches are kept in matches, records mostly share their keys.
+    """
+    out = [""] * len(patterns)
+    depths = [math.inf] * len(patterns)
+    for k, v in denested.items():
+        try:
+            depth, matched = matches[k]
+        except KeyError:
+            depth, matched = k.count("-"), [i for i, pattern in enumerate(patterns) if pattern.match(k)]
+            matches[k] = depth, matched
+        for i in matched:
+            if depth < depths[i]:
+                depths[i] = depth
+                out[i] = str(v)
+    return out
+
+
+def _compile_getter(column: Column) -> Callable[[Any], Any]:
+    path, default = tuple(column.path), column.default
+    if not path:
+        return lambda record: record
+    if len(path) == 1 and isinstance(path[0], str):
+        key = path[0]
+        return lambda record: record.get(key, default) if isinstance(record, dict) else default
+    return lambda record: project(record, path, default)
+
+
+def compile_columns(columns: tuple[Column, ...]) -> Callable[[list[Any]], list[list[Any]]]:
+    """
+    Compiles columns into a function that returns the values of every column for a list of records
+
+    Path columns are read with a getter specialized to their path, one column at a time.
+    Find columns share one denesting per record.
+    """
+    getters = [(i, _compile_getter(column)) for i, column in enumerate(columns) if column.find is None]
+    finds = [i for i, column in enumerate(columns) if column.find is not None]
+    patterns = [re.compile(f"^.*{columns[i].find}.*$") for i in finds]
+    matches: dict[str, tuple[int, list[int]]] = {}
+
+    def extract(records: list[Any]) -> list[list[Any]]:
+        values: list[list[Any]] = [[] for _ in columns]
+        for i, getter in getters:
+            values[i] = [getter(record) for record in records]
+        if finds:
+            found = [_find_values(eh.dict_denester(record), patterns, matches) for record in records]
+            for j, i in enumerate(finds):
+                values[i] = [row[j] for row in found]
+        return values
+
+    return extract
+
+
+def _documents(zfile: str, spec: TableSpec) -> Iterator[Any]:
+    if not spec.parts:
+        yield eh.read_json_from_bytes(eh.extract_file_from_zip(zfile, spec.member), repair_mojibake=True)
+        return
+
+    part = 1
+    while True:
+        b = eh.extract_file_from_zip(zfile, spec.member.format(part))
+        document = eh.read_json_from_bytes(b, repair_mojibake=True)
+        if not document:
+            return
+        yield document
+        part += 1
+
+
+def _records(zfile: str, spec: TableSpec) -> Iterator[list[Any]]:
+    """
+    Yields the list of records of every document of a spec
+    """
+    for document in _documents(zfile, spec):
+        records = project(document, spec.root, _MISSING)
+        if records is _MISSING:
+            raise KeyError(f"{spec.member} has no {'/'.join(map(str, spec.root))}")
+        if spec.records is not None:
+            records = spec.records(records)
+        yield list(records)
+
+
+def to_df(zfile: str, spec: TableSpec, max_rows: int | None = None, strategy: str = sampling.HEAD_TAIL) -> pd.DataFrame:
+    """
+    Extracts the table of a spec from a zip
+
+    Every member is decoded once, Meta mojibake is repaired while decoding, see extraction_helpers.read_json_from_bytes.
+
+    Args:
+        zfile (str): Path to the zip file.
+        spec (TableSpec): The table to extract.
+        max_rows (int | None, optional): Sample the records to at most max_rows rows. Defaults to None, all rows.
+        strategy (str, optional): How the records are sampled, see sampling.sample. Defaults to sampling.HEAD_TAIL.
+
+    Returns:
+        pd.DataFrame: The table, an empty DataFrame if the member is missing or does not have the expected structure.
+            A sampled table has its number of rows before sampling in its attrs, see sampling.mark_sampled.
+    """
+    extract = compile_columns(spec.columns)
+    values: list[list[Any]] = [[] for _ in spec.columns]
+
+    try:
+        if max_rows is None:
+            total_rows = 0
+            for records in _records(zfile, spec):
+                total_rows += len(records)
+                for column_values, part_values in zip(values, extract(records)):
+                    column_values.extend(part_values)
+        else:
+            records, total_rows = sampling.sample(chain.from_iterable(_records(zfile, spec)), max_rows, strategy)
+            values = extract(records)
+
+        data = {}
+        for column, column_values in zip(spec.columns, values):
+            if column.transform is not None:
+                column_values = column.transform(pd.Series(column_values, dtype=object)).tolist()
+            data[column.name] = column_values
+        out = sampling.mark_sampled(pd.DataFrame(data), total_rows)
+
+    except Exception as e:
+        logger.error("Exception caught: %s", e)
+        return pd.DataFrame()
+
+    return out
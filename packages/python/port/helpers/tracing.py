@@ -0,0 +1,237 @@
+"""
+This module contains a lightweight tracer to measure where time is spent in a data donation flow
+
+Code is instrumented with spans: a span measures the wall time of a block of code and can hold counters,
+such as the number of bytes read or the number of rows produced. Spans can be nested,
+the counters of a span are added to the counters of the span it is nested in when it ends.
+
+Tracing is disabled by default. When disabled, a span or a traced function only costs a single flag check.
+
+Examples::
+
+    import port.helpers.tracing as tracing
+
+    @tracing.traced
+    def conversations_to_df(chatgpt_zip: str) -> pd.DataFrame:
+        ...
+
+    tracing.enable()
+    with tracing.span("extraction"):
+        df = conversations_to_df("chatgpt.zip")
+        tracing.count("tables", 1)
+
+    tracing.get_trace()
+    [{'name': 'conversations_to_df', 'depth': 1, 'start': 0.0, 'seconds': 0.02, 'bytes_read': 1024, 'rows': 10},
+     {'name': 'extraction', 'depth': 0, 'start': 0.0, 'seconds': 0.02, 'bytes_read': 1024, 'rows': 10, 'tables': 1}]
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, TypeVar
+import functools
+import json
+import threading
+import time
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    """
+    A measured block of code
+
+    Attributes:
+        name (str): Name of the span, for example the name of the traced function.
+        depth (int): Number of spans this span is nested in.
+        start (float): Start of the span in seconds, relative to when tracing was enabled.
+        seconds (float): Wall time of the span.
+        counters (dict[str, int]): Counters of the span and of the spans nested in it.
+    """
+    name: str
+    depth: int = 0
+    start: float = 0.0
+    seconds: float = 0.0
+    counters: dict[str, int] = field(default_factory=dict)
+
+    def count(self, key: str, value: int = 1) -> None:
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def toDict(self) -> dict[str, Any]:
+        return {"name": self.name, "depth": self.depth, "start": self.start, "seconds": self.seconds, **self.counters}
+
+
+class _State:
+    """
+    Tracing state shared by all threads
+    """
+    enabled: bool = False
+    origin: float = 0.0
+    spans: list[Span] = []
+
+
+_local = threading.local()
+
+
+def _stack() -> list[Span]:
+    """
+    Returns the stack of open spans of the current thread
+    """
+    try:
+        return _local.stack
+    except AttributeError:
+        _local.stack = []
+        return _local.stack
+
+
+class _SpanContext:
+    __slots__ = "span"
+
+    def __init__(self, name: str):
+        self.span = Span(name)
+
+    def __enter__(self) -> Span:
+        span = self.span
+        stack = _stack()
+        span.depth = len(stack)
+        span.start = time.perf_counter()
+        stack.append(span)
+        return span
+
+    def __exit__(self, *exc_info) -> None:
+        span = self.span
+        span.seconds = time.perf_counter() - span.start
+        span.start = span.start - _State.origin
+
+        stack = _stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+        if stack:
+            for key, value in span.counters.items():
+                stack[-1].count(key, value)
+        _State.spans.append(span)
+
+
+class _NullSpanContext:
+    """
+    Returned by span() when tracing is disabled, measures nothing
+    """
+    __slots__ = ()
+
+    def __enter__(self) -> Span:
+        return _NULL_SPAN
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+class _NullSpan(Span):
+    def count(self, key: str, value: int = 1) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan("disabled")
+_NULL_SPAN_CONTEXT = _NullSpanContext()
+
+
+def enable() -> None:
+    """
+    Enables tracing, spans that were recorded earlier are discarded
+    """
+    _State.spans = []
+    _local.stack = []
+    _State.origin = time.perf_counter()
+    _State.enabled = True
+
+
+def disable() -> None:
+    """
+    Disables tracing, recorded spans are kept until tracing is enabled again
+    """
+    _State.enabled = False
+
+
+def is_enabled() -> bool:
+    return _State.enabled
+
+
+def span(name: str) -> _SpanContext | _NullSpanContext:
+    """
+    Returns a context manager that measures the code in its block
+
+    Args:
+        name (str): Name of the span.
+
+    Examples::
+
+        with tracing.span("validate_file") as s:
+            validation = validate_zip(DDP_CATEGORIES, file)
+            s.count("files", 1)
+    """
+    if not _State.enabled:
+        return _NULL_SPAN_CONTEXT
+    return _SpanContext(name)
+
+
+def count(key: str, value: int = 1) -> None:
+    """
+    Adds value to a counter of the innermost open span, does nothing when tracing is disabled
+
+    Args:
+        key (str): Name of the counter, for example "bytes_read".
+        value (int, optional): Value to add. Defaults to 1.
+    """
+    if _State.enabled:
+        stack = _stack()
+        if stack:
+            stack[-1].count(key, value)
+
+
+def traced(fn: F | None = None, *, name: str | None = None) -> Any:
+    """
+    Decorator that measures every call of a function in a span named after the function
+
+    If the function returns a DataFrame, its number of rows is counted as "rows".
+
+    Examples::
+
+        @tracing.traced
+        def validate_zip(ddp_categories, path_to_zip):
+            ...
+
+        @tracing.traced(name="CommandUIRender.toDict")
+        def toDict(self):
+            ...
+    """
+    def decorator(fn: F) -> F:
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _State.enabled:
+                return fn(*args, **kwargs)
+
+            with _SpanContext(span_name) as s:
+                result = fn(*args, **kwargs)
+                shape = getattr(result, "shape", None)
+                if shape:
+                    s.count("rows", shape[0])
+                return result
+
+        return wrapper  # type: ignore
+
+    if fn is not None:
+        return decorator(fn)
+    return decorator
+
+
+def get_trace() -> list[dict[str, Any]]:
+    """
+    Returns the recorded spans in the order in which they ended
+    """
+    return [span.toDict() for span in _State.spans]
+
+
+def trace_to_json() -> str:
+    """
+    Returns the recorded spans as a JSON string, suitable for donation
+    """
+    return json.dumps(get_trace())
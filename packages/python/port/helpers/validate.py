@@ -6,14 +6,24 @@ Which can be used and acted upon
 """
 
 from dataclasses import dataclass, field
-from pathlib import Path
 from enum import Enum
+from typing import Iterable
 import zipfile
 
 import logging
 
+import port.helpers.tracing as tracing
+import port.helpers.zip_index as zip_index
+from port.helpers.zip_index import basename
+
 logger = logging.getLogger(__name__)
 
+# Minimum percentage of the known files of a category that has to be found for the category to be inferred
+MATCH_THRESHOLD = 5
+
+# Number of files after which inference checks whether the inferred category can still change
+CERTAINTY_CHECK_INTERVAL = 256
+
 
 class Language(Enum):
     """
@@ -45,6 +55,7 @@ class DDPCategory:
         ddp_filetype (DDPFiletype): The file type of the DDP.
         language (Language): The language of the DDP.
         known_files (List[str]): A list of known files associated with this DDP category.
+            Usually file names, a known file with a "/" in it, such as "messages/inbox.json", matches the end of a path.
 
     Examples:
         >>> category = DDPCategory("cat1", DDPFiletype.JSON, Language.EN, ["file1.json", "file2.json"])
@@ -104,6 +115,11 @@ class ValidateInput:
     Attributes:
         ddp_categories_lookup (Dict[str, DDPCategory]): A lookup dictionary for DDP categories.
         status_codes_lookup (Dict[int, StatusCode]): A lookup dictionary for status codes.
+        basename_index (Dict[str, list[str]]): Known file name to the ids of the categories that know it.
+        suffix_index (Dict[str, list[tuple[str, str]]]): For known files given as a path: file name to
+            (path, category id), the path has to match the end of a file in the zip.
+        category_confidence (Dict[str, float]): Per category id, the fraction of its distinct known files
+            that is present in the DDP, between 0 and 1. Set by validate_zip.
 
     Examples:
         >>> status_codes = [StatusCode(id=0, description="Success"), StatusCode(id=1, description="Error")]
@@ -118,13 +134,20 @@ class ValidateInput:
 
     ddp_categories_lookup: dict[str, DDPCategory] = field(init=False)
     status_codes_lookup: dict[int, StatusCode] = field(init=False)
+    basename_index: dict[str, list[str]] = field(init=False)
+    suffix_index: dict[str, list[tuple[str, str]]] = field(init=False)
+    category_confidence: dict[str, float] = field(init=False, default_factory=dict)
 
-    def infer_ddp_category(self, file_list_input: list[str]) -> bool:
+    def infer_ddp_category(self, file_list_input: Iterable[str]) -> bool:
         """
         Compares a list of files to a list of known files and infers the DDPCategory.
 
+        The category with the highest percentage of its known files found is inferred,
+        if that percentage is at least MATCH_THRESHOLD. The files are looked up in basename_index in a single pass,
+        which stops early when no other category can reach the percentage of the inferred category anymore.
+
         Args:
-            file_list_input (List[str]): A list of input files to compare against known files.
+            file_list_input (Iterable[str]): The files to compare against known files, file names or paths in the zip.
 
         Returns:
             bool: True if a valid DDP category is inferred, False otherwise. It sets the current_status_code
@@ -133,14 +156,28 @@ class ValidateInput:
         Examples:
             >>> validator.infer_ddp_category(["file1.txt", "file2.txt"])
         """
-        prop_category = {}
-        for id, category in self.ddp_categories_lookup.items():
-            n_files_found = [
-                1 if f in category.known_files else 0 for f in file_list_input
-            ]
-            prop_category[id] = sum(n_files_found) / len(category.known_files) * 100
-
-        if max(prop_category.values()) >= 5:
+        files = list(file_list_input)
+        counts = dict.fromkeys(self.ddp_categories_lookup, 0)
+
+        remaining = len(files)
+        for f in files:
+            name = basename(f)
+            # a file counts once per category, also if it matches a known file name and a known path of the category
+            ids: Iterable[str] = self.basename_index.get(name, ())
+            suffixes = self.suffix_index.get(name)
+            if suffixes:
+                ids = set(ids).union(id for suffix, id in suffixes if f == suffix or f.endswith("/" + suffix))
+            for id in ids:
+                counts[id] += 1
+
+            remaining -= 1
+            if remaining and remaining % CERTAINTY_CHECK_INTERVAL == 0 and self._is_certain(counts, remaining):
+                logger.debug("Category certain with %d files left to check", remaining)
+                break
+
+        prop_category = {id: self._percentage(id, count) for id, count in counts.items()}
+
+        if prop_category and max(prop_category.values()) >= MATCH_THRESHOLD:
             highest = max(prop_category, key=prop_category.get)  # type: ignore
             self.current_ddp_category = self.ddp_categories_lookup[highest]
             self.set_current_status_code_by_id(0)
@@ -152,6 +189,25 @@ class ValidateInput:
             self.current_ddp_category = DDPCategory(id = "unknown", ddp_filetype=DDPFiletype.UNKOWN, language=Language.UNKNOWN, known_files=[])
             return False
 
+    def _percentage(self, id: str, count: int) -> float:
+        n_known_files = len(self.ddp_categories_lookup[id].known_files)
+        return count / n_known_files * 100 if n_known_files else 0.0
+
+    def _is_certain(self, counts: dict[str, int], remaining: int) -> bool:
+        """
+        Returns True if checking the remaining files cannot change the inferred category
+
+        Every remaining file adds at most 1 to the count of a category, see infer_ddp_category.
+        """
+        percentages = {id: self._percentage(id, count) for id, count in counts.items()}
+        highest = max(percentages, key=percentages.get)  # type: ignore
+        if percentages[highest] < MATCH_THRESHOLD:
+            return False
+        return all(
+            self._percentage(id, count + remaining) < percentages[highest]
+            for id, count in counts.items() if id != highest
+        )
+
     def set_current_status_code_by_id(self, id: int) -> None:
         """
         Set the status code based on the provided ID.
@@ -192,7 +248,17 @@ class ValidateInput:
             status_code.id: status_code for status_code in self.all_status_codes
         }
 
+        self.basename_index = {}
+        self.suffix_index = {}
+        for category in self.ddp_categories_lookup.values():
+            for known_file in dict.fromkeys(category.known_files):
+                if "/" in known_file.rstrip("/"):
+                    self.suffix_index.setdefault(basename(known_file), []).append((known_file, category.id))
+                else:
+                    self.basename_index.setdefault(known_file, []).append(category.id)
 
+
+@tracing.traced
 def validate_zip(ddp_categories: list[DDPCategory], path_to_zip: str) -> ValidateInput:
     """
     Validates a DDP zip file against a list of DDP categories.
@@ -201,6 +267,9 @@ def validate_zip(ddp_categories: list[DDPCategory], path_to_zip: str) -> Validat
     the ValidateInput class to infer the DDP category based on the files in the zip.
     If the zip file is invalid or cannot be read, it sets an error status code (an integer greather than 0).
 
+    Only the central directory of the zip is read, see port.helpers.zip_index.
+    The index is cached, so extraction does not read the central directory again.
+
     Args:
         ddp_categories (List[DDPCategory]): A list of valid DDP categories to compare against.
         path_to_zip (str): The file path to the zip file to be validated.
@@ -229,14 +298,13 @@ def validate_zip(ddp_categories: list[DDPCategory], path_to_zip: str) -> Validat
     validate = ValidateInput(status_codes, ddp_categories)
 
     try:
-        paths = []
-        with zipfile.ZipFile(path_to_zip, "r") as zf:
-            for f in zf.namelist():
-                p = Path(f)
-                logger.debug("Found: %s in zip", p.name)
-                paths.append(p.name)
-
-        validate.infer_ddp_category(paths)
+        index = zip_index.get_index(path_to_zip)
+        validate.infer_ddp_category(index.names)
+        validate.category_confidence = {
+            category.id: index.confidence(category.known_files)
+            for category in validate.ddp_categories_lookup.values()
+        }
+        logger.debug("Category confidence: %s", validate.category_confidence)
     except zipfile.BadZipFile:
         validate.set_current_status_code_by_id(1)
 
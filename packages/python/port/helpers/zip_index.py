@@ -0,0 +1,188 @@
+"""
+This module contains an index of the central directory of a zip file, shared by validation and extraction
+
+Opening a zip file reads its central directory: one entry per member. For DDPs with 100k members (photos, videos)
+this is measurable, and validation and every extraction step used to open the zip again.
+The index reads the central directory once, keeps the zip open and is cached per path,
+until the file on disk changes or the cache is cleared.
+
+Examples::
+
+    import port.helpers.zip_index as zip_index
+
+    index = zip_index.get_index("instagram.zip")
+    info = index.find("liked_posts.json")
+    if info is not None:
+        print(info.file_size, info.compress_type)
+        data = index.read(info)
+"""
+from collections import OrderedDict
+from typing import Iterable
+import logging
+import os
+import threading
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+# Number of zip files that are kept open
+CACHE_SIZE = 2
+
+
+def basename(path: str) -> str:
+    """
+    Returns the last component of a path in a zip, like Path(path).name but without creating a Path
+    """
+    return path.rstrip("/").rsplit("/", 1)[-1]
+
+
+class ZipIndex:
+    """
+    Index of the members of a zip file, built from its central directory without decompressing any member
+
+    Attributes:
+        path (str): Path to the zip file.
+        infos (list[zipfile.ZipInfo]): The members in the order of the central directory,
+            with their file_size, compress_size and compress_type.
+        names (list[str]): Names of the members in the same order.
+        by_basename (dict[str, list[zipfile.ZipInfo]]): Members by their file name.
+
+    Raises:
+        zipfile.BadZipFile: If the file is not a zip file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.stat_key = _stat_key(path)
+        self.pid = os.getpid()
+        self._zf = zipfile.ZipFile(path, "r")
+        self._lock = threading.Lock()
+        self._found: dict[str, zipfile.ZipInfo | None] = {}
+
+        self.infos = self._zf.infolist()
+        self.names = [info.filename for info in self.infos]
+        self.by_basename: dict[str, list[zipfile.ZipInfo]] = {}
+        for info in self.infos:
+            self.by_basename.setdefault(basename(info.filename), []).append(info)
+
+    def find(self, file_to_extract: str) -> zipfile.ZipInfo | None:
+        """
+        Returns the first member whose name ends with file_to_extract, None if there is none
+
+        Args:
+            file_to_extract (str): Name or path of the file, for example "conversations.json" or "data/tweets.js".
+        """
+        try:
+            return self._found[file_to_extract]
+        except KeyError:
+            pass
+
+        found = None
+        for info in self.infos:
+            if info.filename.endswith(file_to_extract):
+                found = info
+                break
+        self._found[file_to_extract] = found
+        return found
+
+    def sizes(self) -> dict[str, int]:
+        """
+        Returns the uncompressed size of every member
+        """
+        return {info.filename: info.file_size for info in self.infos}
+
+    def confidence(self, known_files: Iterable[str]) -> float:
+        """
+        Returns the fraction of the distinct known files that are present in the zip, between 0 and 1
+
+        Known files with a "/" in them have to match the end of a member name.
+        """
+        known = set(known_files)
+        if not known:
+            return 0.0
+        found = 0
+        for known_file in known:
+            if "/" in known_file.rstrip("/"):
+                candidates = self.by_basename.get(basename(known_file), [])
+                found += any(
+                    info.filename == known_file or info.filename.endswith("/" + known_file) for info in candidates
+                )
+            else:
+                found += known_file in self.by_basename
+        return found / len(known)
+
+    def read(self, info: zipfile.ZipInfo) -> bytes:
+        """
+        Returns the uncompressed content of a member
+        """
+        with self._lock:
+            return self._zf.read(info)
+
+    def open(self, info: zipfile.ZipInfo):
+        """
+        Returns a file-like object to stream the content of a member
+
+        Reads from different members should not be interleaved by multiple threads.
+        """
+        return self._zf.open(info)
+
+    def close(self) -> None:
+        self._zf.close()
+
+    def is_current(self) -> bool:
+        """
+        Returns False if the file on disk changed since the index was built,
+        or if the index was inherited by a forked process, which must not share the open file
+        """
+        if os.getpid() != self.pid:
+            return False
+        try:
+            return _stat_key(self.path) == self.stat_key
+        except OSError:
+            return False
+
+
+def _stat_key(path: str) -> tuple[int, int, int, int]:
+    stat = os.stat(path)
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+_cache: OrderedDict[str, ZipIndex] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_index(path: str) -> ZipIndex:
+    """
+    Returns the index of a zip file, from the cache if the file did not change
+
+    Raises:
+        zipfile.BadZipFile: If the file is not a zip file.
+        OSError: If the file cannot be read.
+    """
+    key = os.path.abspath(path)
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is not None and index.is_current():
+            _cache.move_to_end(key)
+            return index
+        if index is not None:
+            if index.pid == os.getpid():
+                index.close()
+            del _cache[key]
+
+        index = ZipIndex(path)
+        _cache[key] = index
+        while len(_cache) > CACHE_SIZE:
+            _, evicted = _cache.popitem(last=False)
+            evicted.close()
+        return index
+
+
+def clear_cache() -> None:
+    """
+    Closes all cached zip files, for example when a flow is done with the file of the participant
+    """
+    with _cache_lock:
+        for index in _cache.values():
+            index.close()
+        _cache.clear()
@@ -1,6 +1,7 @@
 from collections.abc import Generator
-from port.platforms.chatgpt import process
 from port.api.commands import CommandSystemExit
+import port.helpers.tracing as tracing
+import port.platforms.registry as registry
 
 
 class ScriptWrapper(Generator):
@@ -13,12 +14,15 @@ class ScriptWrapper(Generator):
         except StopIteration:
             return CommandSystemExit(0, "End of script").toDict()
         else:
-            return command.toDict()
+            with tracing.span(f"{type(command).__name__}.toDict"):
+                return command.toDict()
 
     def throw(self, type=None, value=None, traceback=None):
         raise StopIteration
 
 
-def start(sessionId):
-    script = process(sessionId)
+def start(sessionId, platform=registry.DEFAULT_PLATFORM):
+    # The platform module is imported here, not when port is imported,
+    # pandas is imported once extraction starts
+    script = registry.process(platform, sessionId)
     return ScriptWrapper(script)
@@ -6,17 +6,26 @@ This module provides an example flow of a ChatGPT data donation study
 Assumptions:
 It handles DDPs in the english language with filetype JSON.
 """
+from __future__ import annotations
+from collections import deque
+from functools import partial
 import logging
-from typing import Tuple
+from typing import Tuple, Generator, Iterator, TYPE_CHECKING
 
-import pandas as pd
-import numpy as np
+from port.helpers.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import numpy as np
+else:
+    pd = lazy_import("pandas")
+    np = lazy_import("numpy")
 
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.extraction_helpers as eh
 import port.helpers.validate as validate
-from port.platforms.flow_builder import FlowBuilder
+from port.platforms.flow_builder import FlowBuilder, ExtractionStep
 
 from port.helpers.validate import (
     DDPCategory,
@@ -42,9 +51,88 @@ DDP_CATEGORIES = [
 ]
 
 
-def conversations_to_df(chatgpt_zip: str)  -> pd.DataFrame:
-    b = eh.extract_file_from_zip(chatgpt_zip, "conversations.json")
-    conversations = eh.read_json_from_bytes(b)
+def visible_path(conversation: dict) -> list[str]:
+    """
+    Returns the ids of the nodes in the mapping of a conversation that are shown in ChatGPT, in order
+
+    The path is followed from current_node up the parent chain. If current_node is missing,
+    it is followed down from the root, through the last child of every node: the latest regenerated answer.
+    """
+    mapping = conversation["mapping"]
+    path = []
+    seen = set()
+
+    node_id = conversation.get("current_node")
+    while node_id in mapping and node_id not in seen:
+        seen.add(node_id)
+        path.append(node_id)
+        node_id = mapping[node_id].get("parent")
+
+    if path:
+        path.reverse()
+        return path
+
+    node_id = next((node_id for node_id, node in mapping.items() if node.get("parent") not in mapping), None)
+    while node_id in mapping and node_id not in seen:
+        seen.add(node_id)
+        path.append(node_id)
+        children = [child for child in mapping[node_id].get("children", []) if child in mapping]
+        node_id = children[-1] if children else None
+
+    return path
+
+
+def conversation_turns(conversation: dict, branches: bool = False) -> Iterator[tuple[int, dict]]:
+    """
+    Yields the branch id and the node of the turns of a conversation, in the order of the conversation
+
+    Only the visible path is followed, branch 0, so regenerated or edited turns that are not shown are skipped.
+    If branches is True the alternate branches follow, every branch with its own id starting at 1,
+    each from the node where it splits off to its latest end. If the mapping has no path,
+    for example without a root, every node is yielded in the order of the mapping.
+    """
+    mapping = conversation["mapping"]
+    path = visible_path(conversation)
+    if not path:
+        for node in mapping.values():
+            yield 0, node
+        return
+
+    for node_id in path:
+        yield 0, mapping[node_id]
+
+    if not branches:
+        return
+
+    seen = set(path)
+    starts = deque(
+        child for node_id in path for child in mapping[node_id].get("children", [])
+        if child in mapping and child not in seen
+    )
+    branch = 0
+    while starts:
+        node_id = starts.popleft()
+        if node_id in seen:
+            continue
+        branch += 1
+        while node_id is not None:
+            seen.add(node_id)
+            yield branch, mapping[node_id]
+            children = [
+                child for child in mapping[node_id].get("children", [])
+                if child in mapping and child not in seen
+            ]
+            starts.extend(children[:-1])
+            node_id = children[-1] if children else None
+
+
+def conversations_to_df(chatgpt_zip: str, branches: bool = False)  -> pd.DataFrame:
+    """
+    The turns of every conversation as shown in ChatGPT, in order.
+    With branches the turns of regenerated or edited branches are added, with the id of their branch.
+    """
+    with eh.open_file_from_zip(chatgpt_zip, "conversations.json") as b:
+        conversations = eh.read_json_from_bytes(b)
 
     datapoints = []
     out = pd.DataFrame()
@@ -52,7 +140,7 @@ def conversations_to_df(chatgpt_zip: str)  -> pd.DataFrame:
     try:
         for conversation in conversations:
             title = conversation["title"]
-            for _, turn in conversation["mapping"].items():
+            for branch, turn in conversation_turns(conversation, branches):
 
                 denested_d = eh.dict_denester(turn)
                 is_hidden = eh.find_item(denested_d, "is_visually_hidden_from_conversation")
@@ -69,6 +157,8 @@ def conversations_to_df(chatgpt_zip: str)  -> pd.DataFrame:
                         "model": model,
                         "time": time,
                     }
+                    if branches:
+                        datapoint["branch"] = branch
                     if role != "":
                         datapoints.append(datapoint)
 
@@ -81,14 +171,17 @@ def conversations_to_df(chatgpt_zip: str)  -> pd.DataFrame:
 
 
 
-def extraction(chatgpt_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
+def extraction(chatgpt_zip: str) -> Generator[ExtractionStep, None, None]:
     """
-    Add your table definitions below in the list
+    Add your table definitions below as extraction steps
     """
-    tables = [
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    yield ExtractionStep(
+        to_df=conversations_to_df,
+        args=(chatgpt_zip,),
+        members=["conversations.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="chatgpt_conversations",
-            data_frame=conversations_to_df(chatgpt_zip),
             title=props.Translatable({
                 "en": "Your conversations with ChatGPT",
                 "nl": "Uw gesprekken met ChatGPT"
@@ -109,73 +202,49 @@ def extraction(chatgpt_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTable
                 }
             ]
         ),
-    ]
-
-    tables_to_render = [table for table in tables if not table.data_frame.empty]
-
-    return tables_to_render
+    )
 
 
 def select_random_qa(chatgpt_zip: str)  -> Tuple[str, str]:
     """
     The extra effort is made here to make sure the answers is actually a follow up of the question 
-    and to make sure the question is the first in the conversation
+    and to make sure the question is the first in the conversation:
+    both are the first two turns on the visible path of a conversation
     """
 
-    b = eh.extract_file_from_zip(chatgpt_zip, "conversations.json")
-    conversations = eh.read_json_from_bytes(b)
+    with eh.open_file_from_zip(chatgpt_zip, "conversations.json") as b:
+        conversations = eh.read_json_from_bytes(b)
 
-    datapoints = []
+    pairs = []
     question = ""
     answer = ""
     try:
         for conversation in conversations:
-            title = conversation["title"]
-            for _, turn in conversation["mapping"].items():
+            turns = []
+            for _, turn in conversation_turns(conversation):
 
                 denested_d = eh.dict_denester(turn)
                 is_hidden = eh.find_item(denested_d, "is_visually_hidden_from_conversation")
                 if is_hidden != "True":
                     role = eh.find_item(denested_d, "role")
                     message = "".join(eh.find_items(denested_d, "part"))
-                    id = eh.find_item(denested_d, "id")
-                    child = eh.find_item(denested_d, "children-0")
-                    parent = eh.find_item(denested_d, "parent")
-
-                    datapoint = {
-                        "conversation title": title,
-                        "role": role,
-                        "message": message,
-                        "id": id,
-                        "child": child,
-                        "parent": parent,
-                    }
                     if role != "":
-                        datapoints.append(datapoint)
+                        turns.append((role, message))
+                if len(turns) == 2:
+                    break
 
-        df = pd.DataFrame(datapoints)
-
-        # conversation selection criterion
-        no_parents = ~df["id"].isin(df["child"]) # Indicates the start of a convo: i.e. an message is no ones child
-        is_user = df["role"] == "user"           # The role should be user: ai cannot start
-        condition = no_parents & is_user 
-
-        ids = df["id"][condition].tolist()
-        np.random.shuffle(ids)
-
-        # check all suitable id's if for some reason a mistake happens check the next id
-        for id in ids:
-            ql = df["message"][df["id"] == id].tolist()
-            al = df["message"][df["parent"] == id].tolist()
+            # conversation selection criterion: the user starts, ai cannot start, and the ai answers
             if (
-                len(ql) == 1 and 
-                len(al) == 1 and 
-                ql[0] != "" and 
-                al[0] != ""
+                len(turns) == 2 and
+                turns[0][0] == "user" and
+                turns[0][1] != "" and
+                turns[1][0] == "assistant" and
+                turns[1][1] != ""
             ):
-                question = ql[0]
-                answer = al[0]
-                break
+                pairs.append((turns[0][1], turns[1][1]))
+
+        if pairs:
+            question, answer = pairs[np.random.randint(len(pairs))]
 
     except Exception as e:
         logger.error("Data extraction error: %s", e)
@@ -292,7 +361,7 @@ class ChatGPTFlow(FlowBuilder):
         return validate.validate_zip(DDP_CATEGORIES, file)
         
     def extract_data(self, file_value, validation):
-        return extraction(file_value)
+        return self.extract_with_progress(extraction(file_value), file_value)
 
 
 def process(session_id):
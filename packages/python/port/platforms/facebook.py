@@ -7,15 +7,17 @@ Assumptions:
 It handles DDPs in the english language with filetype JSON.
 """
 
+from __future__ import annotations
+from functools import partial
+from typing import Generator, Iterator
 import logging
 
-import pandas as pd
-
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.extraction_helpers as eh
 import port.helpers.validate as validate
-from port.platforms.flow_builder import FlowBuilder
+from port.helpers.table_spec import Column, TableSpec
+from port.platforms.flow_builder import FlowBuilder, ExtractionStep
 
 from port.helpers.validate import (
     DDPCategory,
@@ -37,670 +39,333 @@ DDP_CATEGORIES = [
 ]
 
 
-def who_youve_followed_to_df(facebook_zip: str) -> pd.DataFrame:
-
-    b = eh.extract_file_from_zip(facebook_zip, "who_you_ve_followed.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        items = d["following_v3"]  # pyright: ignore
-        for item in items:
-            datapoints.append((
-                eh.fix_latin1_string(item.get("name", "")),
-                eh.epoch_to_iso(item.get("timestamp", {}))
-            ))
-
-        out = pd.DataFrame(datapoints, columns=["Name", "Timestamp"]) #pyright: ignore
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-def news_your_locations_to_df(facebook_zip: str) -> pd.DataFrame:
-
-    b = eh.extract_file_from_zip(facebook_zip, "facebook_news/your_locations.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        items = d["news_your_locations_v2"]  # pyright: ignore
-        for item in items:
-            datapoints.append(
-                item
-            )
-        out = pd.DataFrame(datapoints, columns=["Location"]) #pyright: ignore
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-def notifications_to_df(facebook_zip: str) -> pd.DataFrame:
-
-    b = eh.extract_file_from_zip(facebook_zip, "notifications/notifications.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        items = d["notifications_v2"]  # pyright: ignore
-        for item in items:
-            denested_dict = eh.dict_denester(item)
-            datapoints.append((
-                eh.find_item(denested_dict, "text"),
-                eh.find_item(denested_dict, "href"),
-                eh.find_item(denested_dict, "unread"),
-                eh.epoch_to_iso(eh.find_item(denested_dict, "timestamp")),
-            ))
-
-        out = pd.DataFrame(datapoints, columns=["Text", "Link", "Gelezen", "Datum"]) #pyright: ignore
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-def content_sharing_you_have_created_to_df(facebook_zip: str) -> pd.DataFrame:
-
-    b = eh.extract_file_from_zip(facebook_zip, "content_sharing_links_you_have_created.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        for item in d:
-            denested_dict = eh.dict_denester(item)
-            datapoints.append((
-                eh.find_item(denested_dict, "href"),
-                eh.epoch_to_iso(eh.find_item(denested_dict, "timestamp")),
-            ))
-
-        out = pd.DataFrame(datapoints, columns=["Link", "Datum en Tijd"]) #pyright: ignore
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-def facebook_reels_usage_to_df(facebook_zip: str) -> pd.DataFrame:
-
-    b = eh.extract_file_from_zip(facebook_zip, "facebook_reels_usage_information.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        items = d.get("label_values", []) #pyright: ignore
-        d = items[0]
-        for item in d["dict"]:
-            denested_dict = eh.dict_denester(item)
-            datapoints.append((
-                eh.find_item(denested_dict, "label"),
-                eh.find_item(denested_dict, "value"),
-            ))
-
-        out = pd.DataFrame(datapoints, columns=["Interactie met reels", "Waarde"]) #pyright: ignore
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-def last_28_days_to_df(facebook_zip: str) -> pd.DataFrame:
-
-    b = eh.extract_file_from_zip(facebook_zip, "your_facebook_watch_activity_in_the_last_28_days.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        denested_dict = eh.dict_denester(d)
-        datapoints.append((
-            eh.find_item(denested_dict, "-value"),
-        ))
-
-        out = pd.DataFrame(datapoints, columns=["Aantal"]) #pyright: ignore
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-def your_search_history_to_df(facebook_zip: str) -> pd.DataFrame:
-
-    b = eh.extract_file_from_zip(facebook_zip, "your_search_history.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        items = d["searches_v2"]  # pyright: ignore
-        for item in items:
-            denested_dict = eh.dict_denester(item)
-
-            datapoints.append((
-                eh.fix_latin1_string(eh.find_item(denested_dict, "text")),
-                eh.epoch_to_iso(eh.find_item(denested_dict, "timestamp")),
-            ))
-
-        out = pd.DataFrame(datapoints, columns=["Zoekterm", "Datum"]) #pyright: ignore
-        
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-def your_friends_to_df(facebook_zip: str) -> pd.DataFrame:
-
-    b = eh.extract_file_from_zip(facebook_zip, "your_friends.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        items = d["friends_v2"]  # pyright: ignore
-        datapoints.append((len(items)))
-
-        out = pd.DataFrame(datapoints, columns=["Aantal vrienden op facebook"]) #pyright: ignore
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-def ads_interests_to_df(facebook_zip: str) -> pd.DataFrame:
-
-    b = eh.extract_file_from_zip(facebook_zip, "ads_interests.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        items = d["topics_v2"]  # pyright: ignore
-        for item in items:
-            datapoints.append((
-                eh.fix_latin1_string(item),
-            ))
-        out = pd.DataFrame(datapoints, columns=["Ad"]) #pyright: ignore
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-def recently_viewed_to_df(facebook_zip: str) -> pd.DataFrame:
-    b = eh.extract_file_from_zip(facebook_zip, "recently_viewed.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        items = d["recently_viewed"] # pyright: ignore
-        for item in items:
-
-            if "entries" in item:
-                for entry in item["entries"]:
-                    datapoints.append((
-                        eh.fix_latin1_string(item.get("name", "")),
-                        eh.fix_latin1_string(entry.get("data", {}).get("name", "")),
-                        entry.get("data", {}).get("uri", ""),
-                        eh.epoch_to_iso(entry.get("timestamp", ""))
-                    ))
-
-            # The nesting goes deeper
-            if "children" in item:
-                for child in item["children"]:
-                    for entry in child["entries"]:
-                        datapoints.append((
-                            eh.fix_latin1_string(child.get("name", "")),
-                            eh.fix_latin1_string(entry.get("data", {}).get("name", "")),
-                            entry.get("data", {}).get("uri", ""),
-                            eh.epoch_to_iso(entry.get("timestamp", ""))
-                        ))
-
-        out = pd.DataFrame(datapoints, columns=["Watched", "Name", "Link", "Date"]) #pyright: ignore
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-def recently_visited_to_df(facebook_zip: str) -> pd.DataFrame:
-    b = eh.extract_file_from_zip(facebook_zip, "recently_visited.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        items = d["visited_things_v2"]  # pyright: ignore
-        for item in items:
-            if "entries" in item:
-                for entry in item["entries"]:
-                    datapoints.append((
-                        item.get("name", ""),
-                        eh.fix_latin1_string(entry.get("data", {}).get("name", "")),
-                        entry.get("data", {}).get("uri", ""),
-                        eh.epoch_to_iso(entry.get("timestamp", ""))
-                    ))
-
-        out = pd.DataFrame(datapoints, columns=["Watched", "Name", "Link", "Date"]) #pyright: ignore
-        
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-def profile_update_history_to_df(facebook_zip: str) -> pd.DataFrame:
-    b = eh.extract_file_from_zip(facebook_zip, "profile_update_history.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        items = d["profile_updates_v2"]  # pyright: ignore
-        for item in items:
-            datapoints.append((
-                eh.fix_latin1_string(item.get("title", "")),
-                eh.epoch_to_iso(item.get("timestamp", ""))
-            ))
-
-        out = pd.DataFrame(datapoints, columns=["Title", "Timestamp"]) #pyright: ignore
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-    return out
-
-
-def your_event_responses_to_df(facebook_zip: str) -> pd.DataFrame:
-
-    b = eh.extract_file_from_zip(facebook_zip, "your_event_responses.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        items = d["event_responses_v2"]["events_joined"]  # pyright: ignore
-        for item in items:
-            datapoints.append((
-                eh.fix_latin1_string(item.get("name", "")),
-                eh.epoch_to_iso(item.get("start_timestamp", ""))
-            ))
-
-        out = pd.DataFrame(datapoints_sorted, columns=["Name", "Timestamp"]) #pyright: ignore
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-def group_posts_and_comments_to_df(facebook_zip: str) -> pd.DataFrame:
-
-    b = eh.extract_file_from_zip(facebook_zip, "group_posts_and_comments.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        l = d["group_posts_v2"]  # pyright: ignore
-        for item in l:
-            denested_dict = eh.dict_denester(item)
-
-            datapoints.append((
-                eh.fix_latin1_string(eh.find_item(denested_dict, "title")),
-                eh.fix_latin1_string(eh.find_item(denested_dict, "post")),
-                eh.epoch_to_iso(eh.find_item(denested_dict, "timestamp")),
-                eh.find_item(denested_dict, "url"),
-            ))
-
-        out = pd.DataFrame(datapoints_sorted, columns=["Title", "Post", "Date", "Url"]) #pyright: ignore
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-
-def your_answers_to_membership_questions_to_df(facebook_zip: str) -> pd.DataFrame:
-
-    b = eh.extract_file_from_zip(facebook_zip, "your_answers_to_membership_questions.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-                  
-        items = d["group_membership_questions_answers_v2"]["group_answers"]  # pyright: ignore
-        for item in items:
-            datapoints.append((
-                eh.fix_latin1_string(item.get("group_name", "")),
-            ))
-        out = pd.DataFrame(datapoints, columns=["Group name"]) #pyright: ignore
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-def your_comments_in_groups_to_df(facebook_zip: str) -> pd.DataFrame:
-
-    b = eh.extract_file_from_zip(facebook_zip, "your_comments_in_groups.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        l = d["group_comments_v2"]  # pyright: ignore
-        for item in l:
-            denested_dict = eh.dict_denester(item)
-
-            datapoints.append((
-                eh.fix_latin1_string(eh.find_item(denested_dict, "title")),
-                eh.fix_latin1_string(eh.find_item(denested_dict, "comment-comment")),
-                eh.fix_latin1_string(eh.find_item(denested_dict, "group")),
-                eh.epoch_to_iso(eh.find_item(denested_dict, "timestamp")),
-            ))
-
-        out = pd.DataFrame(datapoints_sorted, columns=["Title", "Comment", "Group", "Timestamp"]) #pyright: ignore
-
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-def your_group_membership_activity_to_df(facebook_zip: str) -> pd.DataFrame:
-    b = eh.extract_file_from_zip(facebook_zip, "your_group_membership_activity.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        items = d["groups_joined_v2"]  # pyright: ignore
-        for item in items:
-            denested_dict = eh.dict_denester(item)
-
-            datapoints.append((
-                eh.fix_latin1_string(eh.find_item(denested_dict, "title")),
-                eh.fix_latin1_string(eh.find_item(denested_dict, "name")),
-                eh.epoch_to_iso(eh.find_item(denested_dict, "timestamp")),
-            ))
-
-        out = pd.DataFrame(datapoints, columns=["Title", "Group name", "Timestamp"]) #pyright: ignore
-        
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
-
-
-
-def pages_and_profiles_you_follow_to_df(facebook_zip: str) -> pd.DataFrame:
-    b = eh.extract_file_from_zip(facebook_zip, "pages_and_profiles_you_follow.json")
-    d = eh.read_json_from_bytes(b)
-
-    out = pd.DataFrame()
-    datapoints = []
-
-    try:
-        items = d["pages_followed_v2"]  # pyright: ignore
-        for item in items:
-            datapoints.append((
-                eh.fix_latin1_string(item.get("title", "")),
-                eh.epoch_to_iso(item.get("timestamp", ""))
-            ))
-
-        out = pd.DataFrame(datapoints, columns=["Title", "Timestamp"]) #pyright: ignore
-        
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
-
-    return out
+def _named_entries(items: list[dict], children: bool = False) -> Iterator[dict]:
+    """
+    Yields the entries of recently viewed or visited items, with the name of the item they are listed under
+    """
+    for item in items:
+        for entry in item.get("entries", []):
+            yield {"name": item.get("name", ""), "entry": entry}
 
+        # The nesting goes deeper
+        if children:
+            for child in item.get("children", []):
+                for entry in child["entries"]:
+                    yield {"name": child.get("name", ""), "entry": entry}
 
-def pages_youve_liked_to_df(facebook_zip: str) -> pd.DataFrame:
-    b = eh.extract_file_from_zip(facebook_zip, "pages_you_ve_liked.json")
-    d = eh.read_json_from_bytes(b)
 
-    out = pd.DataFrame()
-    datapoints = []
+def _count(items: list) -> list[int]:
+    return [len(items)]
 
-    try:
-        items = d["page_likes_v2"]  # pyright: ignore
-        for item in items:
-            datapoints.append((
-                eh.fix_latin1_string(item.get("name", "")),
-                item.get("url", ""),
-                eh.epoch_to_iso(item.get("timestamp", ""))
-            ))
 
-        out = pd.DataFrame(datapoints, columns=["Name", "Url", "Timestamp"]) # pyright: ignore
-        
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
+def _document(d: dict) -> list[dict]:
+    return [d]
 
-    return out
 
+who_youve_followed_to_df = TableSpec(
+    name="who_youve_followed_to_df",
+    member="who_you_ve_followed.json",
+    root=("following_v3",),
+    columns=(
+        Column("Name", ("name",)),
+        Column("Timestamp", ("timestamp",), transform=eh.epoch_to_iso_series),
+    ),
+)
 
-def your_saved_items_to_df(facebook_zip: str) -> pd.DataFrame:
-    b = eh.extract_file_from_zip(facebook_zip, "your_saved_items.json")
-    d = eh.read_json_from_bytes(b)
 
-    out = pd.DataFrame()
-    datapoints = []
+news_your_locations_to_df = TableSpec(
+    name="news_your_locations_to_df",
+    member="facebook_news/your_locations.json",
+    root=("news_your_locations_v2",),
+    columns=(
+        Column("Location"),
+    ),
+)
 
-    try:
-        items = d["saves_v2"]  # pyright: ignore
-        for item in items:
-            datapoints.append((
-                eh.fix_latin1_string(item.get("title", "")),
-                eh.epoch_to_iso(item.get("timestamp", ""))
-            ))
 
-        out = pd.DataFrame(datapoints_sorted, columns=["Title", "Timestamp"]) #pyright: ignore
-        
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
+notifications_to_df = TableSpec(
+    name="notifications_to_df",
+    member="notifications/notifications.json",
+    root=("notifications_v2",),
+    columns=(
+        Column("Text", find="text"),
+        Column("Link", find="href"),
+        Column("Gelezen", find="unread"),
+        Column("Datum", find="timestamp", transform=eh.epoch_to_iso_series),
+    ),
+)
 
-    return out
 
+content_sharing_you_have_created_to_df = TableSpec(
+    name="content_sharing_you_have_created_to_df",
+    member="content_sharing_links_you_have_created.json",
+    columns=(
+        Column("Link", find="href"),
+        Column("Datum en Tijd", find="timestamp", transform=eh.epoch_to_iso_series),
+    ),
+)
 
 
-def comments_to_df(facebook_zip: str) -> pd.DataFrame:
-    b = eh.extract_file_from_zip(facebook_zip, "comments.json")
-    d = eh.read_json_from_bytes(b)
+facebook_reels_usage_to_df = TableSpec(
+    name="facebook_reels_usage_to_df",
+    member="facebook_reels_usage_information.json",
+    root=("label_values", 0, "dict"),
+    columns=(
+        Column("Interactie met reels", find="label"),
+        Column("Waarde", find="value"),
+    ),
+)
 
-    out = pd.DataFrame()
-    datapoints = []
 
-    try:
-        items = d["comments_v2"]  # pyright: ignore
-        for item in items:
-            denested_dict = eh.dict_denester(item)
+last_28_days_to_df = TableSpec(
+    name="last_28_days_to_df",
+    member="your_facebook_watch_activity_in_the_last_28_days.json",
+    records=_document,
+    columns=(
+        Column("Aantal", find="-value"),
+    ),
+)
 
-            datapoints.append((
-                eh.fix_latin1_string(eh.find_item(denested_dict, "title")),
-                eh.fix_latin1_string(eh.find_item(denested_dict, "comment-comment")),
-                eh.epoch_to_iso(eh.find_item(denested_dict, "timestamp")),
-            ))
 
-        out = pd.DataFrame(datapoints_sorted, columns=["Title", "Comment", "Timestamp"]) #pyright: ignore
-        
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
+your_search_history_to_df = TableSpec(
+    name="your_search_history_to_df",
+    member="your_search_history.json",
+    root=("searches_v2",),
+    columns=(
+        Column("Zoekterm", find="text"),
+        Column("Datum", find="timestamp", transform=eh.epoch_to_iso_series),
+    ),
+)
 
-    return out
 
+your_friends_to_df = TableSpec(
+    name="your_friends_to_df",
+    member="your_friends.json",
+    root=("friends_v2",),
+    records=_count,
+    columns=(
+        Column("Aantal vrienden op facebook"),
+    ),
+)
 
-def likes_and_reactions_to_df(instagram_zip: str) -> pd.DataFrame:
-    """
-    likes_and_reactions_x
-    """
 
-    out = pd.DataFrame()
-    datapoints = []
-    i = 1
+ads_interests_to_df = TableSpec(
+    name="ads_interests_to_df",
+    member="ads_interests.json",
+    root=("topics_v2",),
+    columns=(
+        Column("Ad"),
+    ),
+)
 
-    while True:
-        b = eh.extract_file_from_zip(instagram_zip, f"likes_and_reactions_{i}.json")
-        d = eh.read_json_from_bytes(b)
 
-        if not d:
-            break
+recently_viewed_to_df = TableSpec(
+    name="recently_viewed_to_df",
+    member="recently_viewed.json",
+    root=("recently_viewed",),
+    records=partial(_named_entries, children=True),
+    columns=(
+        Column("Watched", ("name",)),
+        Column("Name", ("entry", "data", "name")),
+        Column("Link", ("entry", "data", "uri")),
+        Column("Date", ("entry", "timestamp"), transform=eh.epoch_to_iso_series),
+    ),
+)
 
-        try:
-            for item in d:
-                denested_dict = eh.dict_denester(item)
 
-                datapoints.append((
-                    eh.fix_latin1_string(eh.find_item(denested_dict, "title")),
-                    eh.fix_latin1_string(eh.find_item(denested_dict, "reaction-reaction")),
-                    eh.epoch_to_iso(eh.find_item(denested_dict, "timestamp")),
-                ))
+recently_visited_to_df = TableSpec(
+    name="recently_visited_to_df",
+    member="recently_visited.json",
+    root=("visited_things_v2",),
+    records=_named_entries,
+    columns=(
+        Column("Watched", ("name",)),
+        Column("Name", ("entry", "data", "name")),
+        Column("Link", ("entry", "data", "uri")),
+        Column("Date", ("entry", "timestamp"), transform=eh.epoch_to_iso_series),
+    ),
+)
 
-            i += 1
 
-        except Exception as e:
-            logger.error("Exception caught: %s", e)
-            return pd.DataFrame()
+profile_update_history_to_df = TableSpec(
+    name="profile_update_history_to_df",
+    member="profile_update_history.json",
+    root=("profile_updates_v2",),
+    columns=(
+        Column("Title", ("title",)),
+        Column("Timestamp", ("timestamp",), transform=eh.epoch_to_iso_series),
+    ),
+)
 
-    out = pd.DataFrame(datapoints, columns=["Title", "Reaction", "Timestamp"]) #pyright: ignore
 
-    return out
+your_event_responses_to_df = TableSpec(
+    name="your_event_responses_to_df",
+    member="your_event_responses.json",
+    root=("event_responses_v2", "events_joined"),
+    columns=(
+        Column("Name", ("name",)),
+        Column("Timestamp", ("start_timestamp",), transform=eh.epoch_to_iso_series),
+    ),
+)
 
 
+group_posts_and_comments_to_df = TableSpec(
+    name="group_posts_and_comments_to_df",
+    member="group_posts_and_comments.json",
+    root=("group_posts_v2",),
+    columns=(
+        Column("Title", find="title"),
+        Column("Post", find="post"),
+        Column("Date", find="timestamp", transform=eh.epoch_to_iso_series),
+        Column("Url", find="url"),
+    ),
+)
 
-def your_comment_active_days_to_df(facebook_zip: str) -> pd.DataFrame:
-    b = eh.extract_file_from_zip(facebook_zip, "your_comment_active_days.json")
-    d = eh.read_json_from_bytes(b)
 
-    out = pd.DataFrame()
-    datapoints = []
+your_answers_to_membership_questions_to_df = TableSpec(
+    name="your_answers_to_membership_questions_to_df",
+    member="your_answers_to_membership_questions.json",
+    root=("group_membership_questions_answers_v2", "group_answers"),
+    columns=(
+        Column("Group name", ("group_name",)),
+    ),
+)
 
-    try:
-        items = d["label_values"]  # pyright: ignore
-        for item in items:
-            datapoints.append((
-                item.get("label", ""),
-                item.get("value", ""),
-            ))
 
-        out = pd.DataFrame(datapoints, columns=["Label", "Value"]) #pyright: ignore
-        
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
+your_comments_in_groups_to_df = TableSpec(
+    name="your_comments_in_groups_to_df",
+    member="your_comments_in_groups.json",
+    root=("group_comments_v2",),
+    columns=(
+        Column("Title", find="title"),
+        Column("Comment", find="comment-comment"),
+        Column("Group", find="group"),
+        Column("Timestamp", find="timestamp", transform=eh.epoch_to_iso_series),
+    ),
+)
 
-    return out
 
+your_group_membership_activity_to_df = TableSpec(
+    name="your_group_membership_activity_to_df",
+    member="your_group_membership_activity.json",
+    root=("groups_joined_v2",),
+    columns=(
+        Column("Title", find="title"),
+        Column("Group name", find="name"),
+        Column("Timestamp", find="timestamp", transform=eh.epoch_to_iso_series),
+    ),
+)
 
 
-def your_pages_to_df(facebook_zip: str) -> pd.DataFrame:
-    b = eh.extract_file_from_zip(facebook_zip, "your_pages.json")
-    d = eh.read_json_from_bytes(b)
+pages_and_profiles_you_follow_to_df = TableSpec(
+    name="pages_and_profiles_you_follow_to_df",
+    member="pages_and_profiles_you_follow.json",
+    root=("pages_followed_v2",),
+    columns=(
+        Column("Title", ("title",)),
+        Column("Timestamp", ("timestamp",), transform=eh.epoch_to_iso_series),
+    ),
+)
 
-    out = pd.DataFrame()
-    datapoints = []
 
-    try:
-        items = d["pages_v2"]  # pyright: ignore
-        for item in items:
-            datapoints.append((
-                eh.fix_latin1_string(item.get("name", "")),
-                item.get("url", ""),
-                eh.epoch_to_iso(item.get("timestamp", "")),
-            ))
+pages_youve_liked_to_df = TableSpec(
+    name="pages_youve_liked_to_df",
+    member="pages_you_ve_liked.json",
+    root=("page_likes_v2",),
+    columns=(
+        Column("Name", ("name",)),
+        Column("Url", ("url",)),
+        Column("Timestamp", ("timestamp",), transform=eh.epoch_to_iso_series),
+    ),
+)
 
-        out = pd.DataFrame(datapoints, columns=["Name", "Url", "Timestamp"]) #pyright: ignore
-        
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
 
-    return out
+your_saved_items_to_df = TableSpec(
+    name="your_saved_items_to_df",
+    member="your_saved_items.json",
+    root=("saves_v2",),
+    columns=(
+        Column("Title", ("title",)),
+        Column("Timestamp", ("timestamp",), transform=eh.epoch_to_iso_series),
+    ),
+)
 
 
-def story_reactions_to_df(facebook_zip: str) -> pd.DataFrame:
-    b = eh.extract_file_from_zip(facebook_zip, "story_reactions.json")
-    d = eh.read_json_from_bytes(b)
+comments_to_df = TableSpec(
+    name="comments_to_df",
+    member="comments.json",
+    root=("comments_v2",),
+    columns=(
+        Column("Title", find="title"),
+        Column("Comment", find="comment-comment"),
+        Column("Timestamp", find="timestamp", transform=eh.epoch_to_iso_series),
+    ),
+)
 
-    out = pd.DataFrame()
-    datapoints = []
 
-    try:
-        items = d["stories_feedback_v2"]  # pyright: ignore
-        for item in items:
-            datapoints.append((
-                eh.fix_latin1_string(item.get("title", "")),
-            ))
+likes_and_reactions_to_df = TableSpec(
+    name="likes_and_reactions_to_df",
+    member="likes_and_reactions_{}.json",
+    parts=True,
+    columns=(
+        Column("Title", find="title"),
+        Column("Reaction", find="reaction-reaction"),
+        Column("Timestamp", find="timestamp", transform=eh.epoch_to_iso_series),
+    ),
+)
 
-        out = pd.DataFrame(datapoints, columns=["Titel"]) #pyright: ignore
-        
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
 
-    return out
+your_comment_active_days_to_df = TableSpec(
+    name="your_comment_active_days_to_df",
+    member="your_comment_active_days.json",
+    root=("label_values",),
+    columns=(
+        Column("Label", ("label",)),
+        Column("Value", ("value",)),
+    ),
+)
 
 
-def your_posts_check_ins_to_df(facebook_zip: str) -> pd.DataFrame:
-    b = eh.extract_file_from_zip(facebook_zip, "your_posts__check_ins__photos_and_videos_1.json")
-    d = eh.read_json_from_bytes(b)
+your_pages_to_df = TableSpec(
+    name="your_pages_to_df",
+    member="your_pages.json",
+    root=("pages_v2",),
+    columns=(
+        Column("Name", ("name",)),
+        Column("Url", ("url",)),
+        Column("Timestamp", ("timestamp",), transform=eh.epoch_to_iso_series),
+    ),
+)
 
-    out = pd.DataFrame()
-    datapoints = []
 
-    try:
-        for item in d:
-            datapoints.append((
-                eh.fix_latin1_string(item.get("title", "")),
-                eh.epoch_to_iso(item.get("timestamp", "")),
-            ))
+story_reactions_to_df = TableSpec(
+    name="story_reactions_to_df",
+    member="story_reactions.json",
+    root=("stories_feedback_v2",),
+    columns=(
+        Column("Titel", ("title",)),
+    ),
+)
 
-        out = pd.DataFrame(datapoints, columns=["Title", "Timestamp"]) #pyright: ignore
-        
-    except Exception as e:
-        logger.error("Exception caught: %s", e)
 
-    return out
+your_posts_check_ins_to_df = TableSpec(
+    name="your_posts_check_ins_to_df",
+    member="your_posts__check_ins__photos_and_videos_1.json",
+    columns=(
+        Column("Title", ("title",)),
+        Column("Timestamp", ("timestamp",), transform=eh.epoch_to_iso_series),
+    ),
+)
 
 
-def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
-    tables = [
-        d3i_props.PropsUIPromptConsentFormTableViz(
+def extraction(facebook_zip: str) -> Generator[ExtractionStep, None, None]:
+    yield ExtractionStep(
+        to_df=who_youve_followed_to_df,
+        args=(facebook_zip,),
+        members=["who_you_ve_followed.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_who_youve_followed",
-            data_frame=who_youve_followed_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Who you follow",
                 "nl": "Wie je volgt",
@@ -710,9 +375,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont de Facebook-profielen en -pagina's die je momenteel volgt.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=news_your_locations_to_df,
+        args=(facebook_zip,),
+        members=["facebook_news/your_locations.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_news_your_locations",
-            data_frame=news_your_locations_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "The locations Facebook news is set to",
                 "nl": "De locaties waar Facebook Nieuws op is ingesteld",
@@ -722,9 +393,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont de geografische locaties waarvoor je Facebook Nieuwsfeed is geconfigureerd.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=notifications_to_df,
+        args=(facebook_zip,),
+        members=["notifications/notifications.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_notifications",
-            data_frame=notifications_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Notifications Facebook sent you",
                 "nl": "Notificaties die Facebook je stuurde",
@@ -734,9 +411,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel bevat een overzicht van de notificaties die je van Facebook hebt ontvangen.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=facebook_reels_usage_to_df,
+        args=(facebook_zip,),
+        members=["facebook_reels_usage_information.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_reels_usage",
-            data_frame=facebook_reels_usage_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Interactions with Facebook Reels",
                 "nl": "Interacties met Facebook Reels",
@@ -746,9 +429,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont je interacties met Facebook Reels, zoals video's die je hebt bekeken of waarmee je hebt gecommuniceerd.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=last_28_days_to_df,
+        args=(facebook_zip,),
+        members=["your_facebook_watch_activity_in_the_last_28_days.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_last_28",
-            data_frame=last_28_days_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "How many videos you watched in the last 28 days",
                 "nl": "Hoeveel video's je de afgelopen 28 dagen hebt bekeken",
@@ -758,9 +447,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel geeft het aantal video's aan dat je de afgelopen 28 dagen op Facebook hebt bekeken.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=your_search_history_to_df,
+        args=(facebook_zip,),
+        members=["your_search_history.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_search_history",
-            data_frame=your_search_history_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Your search history",
                 "nl": "Je zoekgeschiedenis",
@@ -781,9 +476,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 }
             ]
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=recently_visited_to_df,
+        args=(facebook_zip,),
+        members=["recently_visited.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_recently_visited",
-            data_frame=recently_visited_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Profiles you visited recently",
                 "nl": "Profielen die je recentelijk hebt bezocht",
@@ -793,9 +494,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont de Facebook-profielen die je recentelijk hebt bezocht.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=recently_viewed_to_df,
+        args=(facebook_zip,),
+        members=["recently_viewed.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_recently_viewed",
-            data_frame=recently_viewed_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Facebook items you recently viewed",
                 "nl": "Facebook items die je recentelijk hebt bekeken",
@@ -805,9 +512,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont de Facebook-posts, video's en andere items die je recentelijk hebt bekeken.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=profile_update_history_to_df,
+        args=(facebook_zip,),
+        members=["profile_update_history.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_profile_update_history",
-            data_frame=profile_update_history_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "History of your profile updates",
                 "nl": "Geschiedenis van je profielupdates",
@@ -817,9 +530,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel bevat een logboek van de wijzigingen die je in je Facebook-profielinformatie hebt aangebracht.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=likes_and_reactions_to_df,
+        args=(facebook_zip,),
+        members=["likes_and_reactions_*.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_likes_and_reactions",
-            data_frame=likes_and_reactions_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Likes and reactions on Facebook",
                 "nl": "Likes en reacties op Facebook",
@@ -829,9 +548,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont je likes en reacties op berichten, commentaren en andere content op Facebook.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=your_group_membership_activity_to_df,
+        args=(facebook_zip,),
+        members=["your_group_membership_activity.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_your_group_membership_activity",
-            data_frame=your_group_membership_activity_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Facebook groups you are a member of",
                 "nl": "Facebookgroepen waar je lid van bent",
@@ -841,9 +566,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont de Facebookgroepen waar je momenteel lid van bent.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=pages_and_profiles_you_follow_to_df,
+        args=(facebook_zip,),
+        members=["pages_and_profiles_you_follow.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_pages_and_profiles_you_follow_to_df",
-            data_frame=pages_and_profiles_you_follow_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Pages and profiles that you follow",
                 "nl": "Pagina's en profielen die je volgt",
@@ -853,9 +584,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont de Facebookpagina's en -profielen die je actief volgt.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=pages_youve_liked_to_df,
+        args=(facebook_zip,),
+        members=["pages_you_ve_liked.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_pages_youve_liked_to_df",
-            data_frame=pages_youve_liked_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Pages that you have liked",
                 "nl": "Pagina's die je leuk vindt",
@@ -865,9 +602,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel bevat een overzicht van de Facebookpagina's die je leuk vindt.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=your_posts_check_ins_to_df,
+        args=(facebook_zip,),
+        members=["your_posts__check_ins__photos_and_videos_1.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_your_posts_and_check_ins",
-            data_frame=your_posts_check_ins_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Your posts and check-ins",
                 "nl": "Je posts en check-ins",
@@ -877,9 +620,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont de berichten en plaatsen waar je op Facebook hebt ingecheckt.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=story_reactions_to_df,
+        args=(facebook_zip,),
+        members=["story_reactions.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_story_reactions",
-            data_frame=story_reactions_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Your story reactions",
                 "nl": "Je story-reacties",
@@ -889,9 +638,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel bevat je reacties op Facebook Stories.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=content_sharing_you_have_created_to_df,
+        args=(facebook_zip,),
+        members=["content_sharing_links_you_have_created.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_content_sharing_links_you_created",
-            data_frame=content_sharing_you_have_created_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Links you shared",
                 "nl": "Links die je hebt gedeeld",
@@ -901,9 +656,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont de externe links die je op Facebook hebt gedeeld.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=your_friends_to_df,
+        args=(facebook_zip,),
+        members=["your_friends.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_your_friends",
-            data_frame=your_friends_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Your friends on Facebook",
                 "nl": "Je vrienden op Facebook",
@@ -913,9 +674,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont je huidige vrienden op Facebook.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=ads_interests_to_df,
+        args=(facebook_zip,),
+        members=["ads_interests.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_ads_interests",
-            data_frame=ads_interests_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Your ad interests",
                 "nl": "Je advertentie-interesses",
@@ -925,9 +692,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont de interesses die Facebook heeft geïdentificeerd om je gepersonaliseerde advertenties te tonen.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=your_event_responses_to_df,
+        args=(facebook_zip,),
+        members=["your_event_responses.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_your_event_responses",
-            data_frame=your_event_responses_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Your event responses",
                 "nl": "Je reacties op evenementen",
@@ -937,9 +710,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel bevat je reacties (gaat, geïnteresseerd, afgewezen) op Facebook-evenementen.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=group_posts_and_comments_to_df,
+        args=(facebook_zip,),
+        members=["group_posts_and_comments.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_group_posts_and_comments",
-            data_frame=group_posts_and_comments_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Your posts and comments in groups",
                 "nl": "Je berichten en commentaren in groepen",
@@ -949,9 +728,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont je berichten en commentaren in Facebook-groepen.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=your_answers_to_membership_questions_to_df,
+        args=(facebook_zip,),
+        members=["your_answers_to_membership_questions.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_your_answers_to_membership_questions",
-            data_frame=your_answers_to_membership_questions_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Your answers to group membership questions",
                 "nl": "Je antwoorden op vragen voor groepslidmaatschap",
@@ -961,9 +746,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel bevat de antwoorden die je hebt gegeven bij het aanvragen van lidmaatschap van Facebook-groepen.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=your_comments_in_groups_to_df,
+        args=(facebook_zip,),
+        members=["your_comments_in_groups.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_your_comments_in_groups",
-            data_frame=your_comments_in_groups_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Your comments in groups",
                 "nl": "Je commentaren in groepen",
@@ -973,9 +764,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont specifiek de commentaren die je in Facebook-groepen hebt geplaatst.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=your_saved_items_to_df,
+        args=(facebook_zip,),
+        members=["your_saved_items.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_your_saved_items",
-            data_frame=your_saved_items_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Your saved items",
                 "nl": "Je opgeslagen items",
@@ -985,9 +782,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel bevat de berichten, video's en andere content die je op Facebook hebt opgeslagen.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=comments_to_df,
+        args=(facebook_zip,),
+        members=["comments.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_comments",
-            data_frame=comments_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Your comments",
                 "nl": "Je commentaren",
@@ -997,9 +800,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont alle commentaren die je op Facebook-berichten en andere content hebt geplaatst.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=your_comment_active_days_to_df,
+        args=(facebook_zip,),
+        members=["your_comment_active_days.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_your_comment_active_days",
-            data_frame=your_comment_active_days_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Days you actively commented",
                 "nl": "Dagen waarop je actief commentaren hebt geplaatst",
@@ -1009,9 +818,15 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont de dagen waarop je commentaren op Facebook hebt geplaatst.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=your_pages_to_df,
+        args=(facebook_zip,),
+        members=["your_pages.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="facebook_your_pages",
-            data_frame=your_pages_to_df(facebook_zip),
             title=props.Translatable({
                 "en": "Pages you manage",
                 "nl": "Pagina's die je beheert",
@@ -1021,8 +836,7 @@ def extraction(facebook_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTabl
                 "nl": "Deze tabel toont de Facebookpagina's die je beheert.",
             }),
         ),
-    ]
-    return [table for table in tables if not table.data_frame.empty]
+    )
 
 
 class FacebookFlow(FlowBuilder):
@@ -1033,7 +847,7 @@ class FacebookFlow(FlowBuilder):
         return validate.validate_zip(DDP_CATEGORIES, file)
         
     def extract_data(self, file_value, validation):
-        return extraction(file_value)
+        return self.extract_with_progress(extraction(file_value), file_value)
 
 
 def process(session_id):
@@ -3,25 +3,143 @@ This module contains a flow builder
 
 The flow builder provides an interface to easily maintain the most commonly used data donation flows for various platforms
 """
+from __future__ import annotations
 from abc import abstractmethod
-from typing import Generator
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generator, Iterable, TYPE_CHECKING
+import contextlib
+import fnmatch
+import inspect
 import json
 import logging
 import json
 
+from port.helpers.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.port_helpers as ph
+import port.helpers.extraction_helpers as eh
+import port.helpers.executors as executors
+import port.helpers.memory as memory
+import port.helpers.sampling as sampling
+import port.helpers.tracing as tracing
 import port.helpers.validate as validate
-import port.platforms.chatgpt as chatgpt
+import port.helpers.zip_index as zip_index
+from port.api.commands import CommandUIRender
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class ExtractionStep:
+    """
+    A table-level step of an extraction.
+
+    The data frame is extracted lazily, when the step is executed, by calling to_df with args.
+    The extracted data frame is then passed to table to create the table that is shown to the participant.
+
+    Attributes:
+        to_df (Callable[..., pd.DataFrame]): Function that extracts the data frame of the table.
+        args (tuple): Positional arguments to call to_df with.
+        table (Callable[..., d3i_props.PropsUIPromptConsentFormTableViz]): Creates the table given data_frame
+            as keyword argument. Typically a functools.partial of d3i_props.PropsUIPromptConsentFormTableViz.
+        members (list[str]): Glob patterns matching the zip members read by to_df.
+            The uncompressed sizes of these members are used to report extraction progress.
+
+    A to_df that accepts max_rows and strategy keyword arguments samples its rows while it produces them,
+    see samples_rows and port.helpers.sampling.sample. It is passed the row budget of the table.
+
+    Examples::
+
+        yield ExtractionStep(
+            to_df=conversations_to_df,
+            args=(chatgpt_zip,),
+            members=["conversations.json"],
+            table=partial(
+                d3i_props.PropsUIPromptConsentFormTableViz,
+                id="chatgpt_conversations",
+                title=props.Translatable({"en": "Your conversations", "nl": "Uw gesprekken"}),
+            ),
+        )
+    """
+    to_df: Callable[..., pd.DataFrame]
+    args: tuple
+    table: Callable[..., d3i_props.PropsUIPromptConsentFormTableViz]
+    members: list[str] = field(default_factory=list)
+
+    def to_table(self, data_frame: pd.DataFrame) -> d3i_props.PropsUIPromptConsentFormTableViz:
+        return self.table(data_frame=data_frame)
+
+    @property
+    def samples_rows(self) -> bool:
+        """
+        Whether to_df accepts a row budget, so the table does not have to be sampled after it is extracted
+        """
+        try:
+            return "max_rows" in inspect.signature(self.to_df).parameters
+        except (TypeError, ValueError):
+            return False
+
+    def budget_kwargs(self, max_rows: int | None, strategy: str) -> dict[str, Any]:
+        """
+        Returns the keyword arguments to call to_df with, for a table with max_rows and strategy as default budget
+
+        The budget that the table sets itself takes precedence,
+        as in d3i_props.PropsUIPromptConsentFormTableViz.apply_budget.
+        """
+        if not self.samples_rows:
+            return {}
+        keywords = getattr(self.table, "keywords", {})
+        if keywords.get("max_rows") is not None or keywords.get("max_bytes") is not None:
+            max_rows = keywords.get("max_rows")
+            strategy = keywords.get("sampling", sampling.HEAD_TAIL)
+        if max_rows is None:
+            return {}
+        return {"max_rows": max_rows, "strategy": strategy}
+
+
 class FlowBuilder:
+    # Donations larger than this number of bytes are donated in multiple parts
+    donation_part_bytes: int = ph.DEFAULT_DONATION_PART_BYTES
+
+    # Executor used to run extraction steps: "sequential", "thread" or "process"
+    # Under Pyodide extraction steps always run sequentially
+    executor: str = executors.SEQUENTIAL
+    max_workers: int | None = None
+
+    # Donate a performance trace (durations, bytes read, rows produced) along with the donated data
+    # See port.helpers.tracing
+    donate_performance_trace: bool = False
+
+    # Measure memory per extracted table (traced allocations, Pyodide heap growth, DataFrame memory usage)
+    # The measurements are kept in memory_measurements, and donated when donate_memory_diagnostics is set
+    # Allocations are only traced when tracemalloc runs, donate_memory_diagnostics starts it for the flow
+    # Only meaningful with the sequential executor, other executors extract before the measurement starts
+    # See port.helpers.memory
+    measure_memory: bool = False
+    donate_memory_diagnostics: bool = False
+
+    # Budget of every extracted table, unless the table sets its own max_rows or max_bytes
+    # Tables over budget are sampled so the consent form stays reviewable, see port.helpers.sampling
+    # Sampling changes the data that can be donated, so it is off by default and opted in per study,
+    # for example table_max_bytes = 64 * 1024 * 1024
+    # The row budget is passed to extraction steps that sample while they extract, see ExtractionStep.samples_rows
+    # The byte budget is checked once the table is extracted
+    table_max_rows: int | None = None
+    table_max_bytes: int | None = None
+    table_sampling: str = sampling.HEAD_TAIL
+
     def __init__(self, session_id: int, platform_name: str):
         self.session_id = session_id
         self.platform_name = platform_name
         self.table_list = []
+        self.memory_measurements: list[memory.MemoryMeasurement] = []
         
         self._initialize_ui_text()
         
@@ -46,13 +164,31 @@ class FlowBuilder:
             "review_data_description": props.Translatable({
                 "en": f"Below you will find a curated selection of {self.platform_name} data.",
                 "nl": f"Hieronder vindt u een zorgvuldig samengestelde selectie van {self.platform_name} gegevens.",
-            })
+            }),
+
+            "extraction_header": props.Translatable({
+                "en": f"Extracting your {self.platform_name} data",
+                "nl": f"Uw {self.platform_name} gegevens worden verwerkt"
+            }),
+
+            "extraction_description": props.Translatable({
+                "en": "One moment please. Information is now being extracted from the selected file.",
+                "nl": "Een moment geduld. Informatie wordt op dit moment uit het geselecteerde bestand gehaald.",
+            }),
         }
         
     def start_flow(self):
         """
         Main processing loop for all platforms
         """
+        # imported here, port.platforms.chatgpt imports this module
+        import port.platforms.chatgpt as chatgpt
+
+        if self.donate_performance_trace:
+            tracing.enable()
+        if self.donate_memory_diagnostics:
+            memory.start()
+
         while True:
             logger.info(f"Prompt for file for {self.platform_name}")
             file_prompt = self.generate_file_prompt()
@@ -61,15 +197,18 @@ class FlowBuilder:
             answer = ""
             
             if file_result.__type__ == "PayloadString":
-                validation = self.validate_file(file_result.value)
+                with tracing.span("validate_file"):
+                    validation = self.validate_file(file_result.value)
                 
                 # Happy flow: Valid file
                 if validation.get_status_code_id() == 0:
                     logger.info(f"Payload for {self.platform_name}")
+                    # extract_data is traced by extract_with_progress, the prompts it renders are not measured
                     self.table_list = self.extract_data(file_result.value, validation)
-                    question, answer = chatgpt.select_random_qa(file_result.value)
                     if isinstance(self.table_list, Generator):
                         self.table_list = yield from self.table_list
+                    with tracing.span("select_random_qa"):
+                        question, answer = chatgpt.select_random_qa(file_result.value)
 
                     break
                     
@@ -94,7 +233,14 @@ class FlowBuilder:
 
             if result.__type__ == "PayloadJSON":
                 reviewed_data = result.value
-                yield ph.donate(f"{self.session_id}", reviewed_data)
+                yield from ph.donate_in_parts(f"{self.session_id}", reviewed_data, self.donation_part_bytes)
+
+                if self.donate_performance_trace:
+                    yield ph.donate(f"{self.session_id}-performance-trace", tracing.trace_to_json())
+
+                if self.donate_memory_diagnostics:
+                    diagnostics = json.dumps([m.toDict() for m in self.memory_measurements])
+                    yield ph.donate(f"{self.session_id}-memory-diagnostics", diagnostics)
 
                 # render questionnaire
                 if question != "" and answer != "":
@@ -109,6 +255,9 @@ class FlowBuilder:
                 value = json.dumps('{"status" : "data_submission declined"}')
                 yield ph.donate(f"{self.session_id}", value)
             
+        tracing.disable()
+        memory.stop()
+        zip_index.clear_cache()
         yield ph.exit(0, "Success")
     
     # Methods to be overridden by platform-specific implementations
@@ -126,6 +275,101 @@ class FlowBuilder:
         """Extract data from file using platform-specific logic"""
         raise NotImplementedError("Must be implemented by subclass")
         
+    def extract_with_progress(
+        self,
+        steps: Iterable[ExtractionStep],
+        file: str,
+    ) -> Generator[Any, Any, list[d3i_props.PropsUIPromptConsentFormTableViz]]:
+        """
+        Executes extraction steps and renders the extraction progress between steps.
+
+        The steps are run with the executor configured on the flow (see executors.create_executor).
+        By default, and always under Pyodide, a step is executed when its result is needed.
+        With a thread or process pool all steps are submitted at once, because the steps are independent.
+        In both cases the results are collected in the order in which the steps were declared.
+        Note that a process pool requires to_df and args of every step to be picklable.
+
+        The progress percentage is derived from the uncompressed sizes of the zip members each step reads.
+        If the sizes are unknown (for example when file is not a zip), every step weighs equally.
+        Tables with an empty data frame are left out.
+
+        Steps can be a generator that does work before it yields its steps, such as parsing a file they share.
+        The first progress page is rendered before the steps are collected, so that work happens while it is shown.
+
+        Usage in a platform specific implementation::
+
+            def extract_data(self, file, validation):
+                return self.extract_with_progress(extraction(file), file)
+
+        Args:
+            steps (Iterable[ExtractionStep]): The table-level steps of the extraction, in order.
+            file (str): Path to the file the steps extract from.
+
+        Returns:
+            list[d3i_props.PropsUIPromptConsentFormTableViz]: The extracted tables, in the order of the steps.
+        """
+        yield self._render_progress(self.platform_name, 0)
+        # Only the extraction is measured, not the prompts rendered before, such as a profile selection
+        with tracing.span("extract_data"):
+            steps = list(steps)
+            weights = self._step_weights(steps, file)
+            total_weight = sum(weights)
+
+            tables = []
+            done_weight = 0
+            with executors.create_executor(self.executor, self.max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        step.to_df,
+                        *step.args,
+                        **step.budget_kwargs(self.table_max_rows, self.table_sampling),
+                    )
+                    for step in steps
+                ]
+
+                for step, future, weight in zip(steps, futures, weights):
+                    message = ", ".join(step.members) if step.members else self.platform_name
+                    yield self._render_progress(message, int(done_weight / total_weight * 100))
+
+                    step_name = getattr(step.to_df, "__name__", "to_df")
+                    measure_memory = self.measure_memory or self.donate_memory_diagnostics
+                    measure = memory.measure(step_name) if measure_memory else contextlib.nullcontext()
+                    with tracing.span(step_name) as s, measure as measurement:
+                        data_frame = future.result()
+                        s.count("rows", 0 if data_frame is None else len(data_frame))
+                    table = step.to_table(data_frame)
+                    if table.max_rows is None and table.max_bytes is None:
+                        table.apply_budget(self.table_max_rows, self.table_max_bytes, self.table_sampling)
+                    if measurement is not None:
+                        measurement.name = table.id
+                        measurement.dataframe_bytes = memory.dataframe_bytes(data_frame)
+                        self.memory_measurements.append(measurement)
+                    if table.data_frame is not None and not table.data_frame.empty:
+                        tables.append(table)
+                    done_weight += weight
+
+            return tables
+
+    def _render_progress(self, message: str, percentage: int) -> CommandUIRender:
+        return ph.render_page(
+            self.UI_TEXT["extraction_header"],
+            ph.generate_progress_prompt(self.UI_TEXT["extraction_description"], message, percentage),
+        )
+
+    def _step_weights(self, steps: list[ExtractionStep], file: str) -> list[int]:
+        member_sizes = eh.get_member_sizes(file)
+        weights = []
+        for step in steps:
+            weight = 0
+            for pattern in step.members:
+                weight += sum(size for name, size in member_sizes.items() if fnmatch.fnmatch(name, f"*{pattern}"))
+            weights.append(weight)
+
+        if sum(weights) == 0:
+            weights = [1 for _ in steps]
+
+        return weights
+
     def generate_retry_prompt(self):
         """Generate platform-specific retry prompt"""
         return ph.generate_retry_prompt(self.platform_name)
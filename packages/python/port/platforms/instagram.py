@@ -6,15 +6,25 @@ This module contains an example flow of a Instagram data donation study
 Assumptions:
 It handles DDPs in the english language with filetype JSON.
 """
+from __future__ import annotations
+from functools import partial
+from typing import Any, Generator, Iterator, TYPE_CHECKING
 import logging
 
-import pandas as pd
+from port.helpers.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.extraction_helpers as eh
+import port.helpers.meta_records as meta_records
+import port.helpers.sampling as sampling
 import port.helpers.validate as validate
-from port.platforms.flow_builder import FlowBuilder
+from port.platforms.flow_builder import FlowBuilder, ExtractionStep
 
 from port.helpers.validate import (
     DDPCategory,
@@ -68,30 +78,30 @@ DDP_CATEGORIES = [
 
 
 
-def accounts_not_interested_in_to_df(instagram_zip: str) -> pd.DataFrame:
+def iso_dates(timestamps: list) -> list[str]:
+    return eh.epoch_to_iso_series(pd.Series(timestamps, dtype=object)).tolist()
+
+
+def accounts_not_interested_in_to_df(
+    instagram_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
 
     b = eh.extract_file_from_zip(instagram_zip, "accounts_you're_not_interested_in.json")
-    d = eh.read_json_from_bytes(b)
+    d = eh.read_json_from_bytes(b, repair_mojibake=True)
 
     out = pd.DataFrame()
-    datapoints = []
 
     try:
-        items = d["impressions_history_recs_hidden_authors"] # pyright: ignore
-        for item in items:
-            data = item.get("string_map_data", {})
-            account_name = data.get("Username", {}).get("value", None),
-            if "Time" in data:
-                timestamp = data.get("Time", {}).get("timestamp", "")
-            else:
-                timestamp = data.get("Tijd", {}).get("timestamp", "")
-
-            datapoints.append((
-                account_name,
-                eh.epoch_to_iso(timestamp)
-            ))
-        out = pd.DataFrame(datapoints, columns=["Account name", "Date"]) # pyright: ignore
+        records = d["impressions_history_recs_hidden_authors"] # pyright: ignore
+        columns = meta_records.normalize(records, max_rows=max_rows, strategy=strategy)
+        out = pd.DataFrame({
+            "Account name": columns.get("Username.value", None),
+            "Date": iso_dates(columns.get("Time.timestamp")),
+        })
         out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
+        out = sampling.mark_sampled(out, columns.total)
 
     except Exception as e:
         logger.error("Exception caught: %s", e)
@@ -99,30 +109,26 @@ def accounts_not_interested_in_to_df(instagram_zip: str) -> pd.DataFrame:
     return out
 
 
-def ads_viewed_to_df(instagram_zip: str) -> pd.DataFrame:
+def ads_viewed_to_df(
+    instagram_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
 
     b = eh.extract_file_from_zip(instagram_zip, "ads_viewed.json")
-    d = eh.read_json_from_bytes(b)
+    d = eh.read_json_from_bytes(b, repair_mojibake=True)
 
     out = pd.DataFrame()
-    datapoints = []
 
     try:
-        items = d["impressions_history_ads_seen"] # pyright: ignore
-        for item in items:
-            data = item.get("string_map_data", {})
-            account_name = data.get("Author", {}).get("value", None)
-            if "Time" in data:
-                timestamp = data.get("Time", {}).get("timestamp", "")
-            else:
-                timestamp = data.get("Tijd", {}).get("timestamp", "")
-
-            datapoints.append((
-                account_name,
-                eh.epoch_to_iso(timestamp)
-            ))
-        out = pd.DataFrame(datapoints, columns=["Author of ad", "Date"]) # pyright: ignore
+        records = d["impressions_history_ads_seen"] # pyright: ignore
+        columns = meta_records.normalize(records, max_rows=max_rows, strategy=strategy)
+        out = pd.DataFrame({
+            "Author of ad": columns.get("Author.value", None),
+            "Date": iso_dates(columns.get("Time.timestamp")),
+        })
         out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
+        out = sampling.mark_sampled(out, columns.total)
 
     except Exception as e:
         logger.error("Exception caught: %s", e)
@@ -130,30 +136,26 @@ def ads_viewed_to_df(instagram_zip: str) -> pd.DataFrame:
     return out
 
 
-def posts_viewed_to_df(instagram_zip: str) -> pd.DataFrame:
+def posts_viewed_to_df(
+    instagram_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
 
     b = eh.extract_file_from_zip(instagram_zip, "posts_viewed.json")
-    d = eh.read_json_from_bytes(b)
+    d = eh.read_json_from_bytes(b, repair_mojibake=True)
 
     out = pd.DataFrame()
-    datapoints = []
 
     try:
-        items = d["impressions_history_posts_seen"] # pyright: ignore
-        for item in items:
-            data = item.get("string_map_data", {})
-            account_name = data.get("Author", {}).get("value", None)
-            if "Time" in data:
-                timestamp = data.get("Time", {}).get("timestamp", "")
-            else:
-                timestamp = data.get("Tijd", {}).get("timestamp", "")
-
-            datapoints.append((
-                account_name,
-                eh.epoch_to_iso(timestamp)
-            ))
-        out = pd.DataFrame(datapoints, columns=["Author", "Date"]) # pyright: ignore
+        records = d["impressions_history_posts_seen"] # pyright: ignore
+        columns = meta_records.normalize(records, max_rows=max_rows, strategy=strategy)
+        out = pd.DataFrame({
+            "Author": columns.get("Author.value", None),
+            "Date": iso_dates(columns.get("Time.timestamp")),
+        })
         out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
+        out = sampling.mark_sampled(out, columns.total)
 
     except Exception as e:
         logger.error("Exception caught: %s", e)
@@ -162,25 +164,27 @@ def posts_viewed_to_df(instagram_zip: str) -> pd.DataFrame:
 
 
 
-def posts_not_interested_in_to_df(instagram_zip: str) -> pd.DataFrame:
+def posts_not_interested_in_to_df(
+    instagram_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
 
     b = eh.extract_file_from_zip(instagram_zip, "posts_you're_not_interested_in.json")
-    data = eh.read_json_from_bytes(b)
+    data = eh.read_json_from_bytes(b, repair_mojibake=True)
 
     out = pd.DataFrame()
-    datapoints = []
 
     try:
-        items = data["impressions_history_posts_not_interested"] # pyright: ignore
-        for item in items:
-            d = eh.dict_denester(item.get("string_list_data"))
-            datapoints.append((
-                eh.fix_latin1_string(eh.find_item(d, "value")),
-                eh.find_item(d, "href"),
-                eh.epoch_to_iso(eh.find_item(d, "timestamp"))
-            ))
-        out = pd.DataFrame(datapoints, columns=["Post", "Link", "Date"]) # pyright: ignore
+        records = data["impressions_history_posts_not_interested"] # pyright: ignore
+        columns = meta_records.normalize(records, max_rows=max_rows, strategy=strategy)
+        out = pd.DataFrame({
+            "Post": columns.get("value"),
+            "Link": columns.get("href"),
+            "Date": iso_dates(columns.get("timestamp")),
+        })
         out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
+        out = sampling.mark_sampled(out, columns.total)
 
     except Exception as e:
         logger.error("Exception caught: %s", e)
@@ -189,30 +193,26 @@ def posts_not_interested_in_to_df(instagram_zip: str) -> pd.DataFrame:
 
 
 
-def videos_watched_to_df(instagram_zip: str) -> pd.DataFrame:
+def videos_watched_to_df(
+    instagram_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
 
     b = eh.extract_file_from_zip(instagram_zip, "videos_watched.json")
-    d = eh.read_json_from_bytes(b)
+    d = eh.read_json_from_bytes(b, repair_mojibake=True)
 
     out = pd.DataFrame()
-    datapoints = []
 
     try:
-        items = d["impressions_history_videos_watched"] # pyright: ignore
-        for item in items:
-            data = item.get("string_map_data", {})
-            account_name = data.get("Author", {}).get("value", None)
-            if "Time" in data:
-                timestamp = data.get("Time", {}).get("timestamp", "")
-            else:
-                timestamp = data.get("Tijd", {}).get("timestamp", "")
-
-            datapoints.append((
-                account_name,
-                eh.epoch_to_iso(timestamp)
-            ))
-        out = pd.DataFrame(datapoints, columns=["Author", "Date"]) # pyright: ignore
+        records = d["impressions_history_videos_watched"] # pyright: ignore
+        columns = meta_records.normalize(records, max_rows=max_rows, strategy=strategy)
+        out = pd.DataFrame({
+            "Author": columns.get("Author.value", None),
+            "Date": iso_dates(columns.get("Time.timestamp")),
+        })
         out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
+        out = sampling.mark_sampled(out, columns.total)
 
     except Exception as e:
         logger.error("Exception caught: %s", e)
@@ -220,68 +220,67 @@ def videos_watched_to_df(instagram_zip: str) -> pd.DataFrame:
     return out
 
 
-def post_comments_to_df(instagram_zip: str) -> pd.DataFrame:
+def _post_comments(instagram_zip: str) -> Iterator[Any]:
     """
-    You can have 1 to n files of post_comments_<x>.json
+    Yields the comments of all post_comments_<x>.json files
     """
-
-    out = pd.DataFrame()
-    datapoints = []
     i = 1
-
     while True:
         b = eh.extract_file_from_zip(instagram_zip, f"post_comments_{i}.json")
-        d = eh.read_json_from_bytes(b)
-
+        d = eh.read_json_from_bytes(b, repair_mojibake=True)
         if not d:
-            break
-
-        try:
-            for item in d:
-                data = item.get("string_map_data", {})
-                media_owner = data.get("Media Owner", {}).get("value", "")
-                comment = data.get("Comment", {}).get("value", "")
-                if "Time" in data:
-                    timestamp = data.get("Time", {}).get("timestamp", "")
-                else:
-                    timestamp = data.get("Tijd", {}).get("timestamp", "")
-
-                datapoints.append((
-                    media_owner,
-                    eh.fix_latin1_string(comment),
-                    eh.epoch_to_iso(timestamp)
-                ))
-            i += 1
-
-        except Exception as e:
-            logger.error("Exception caught: %s", e)
-            return pd.DataFrame()
-
-    out = pd.DataFrame(datapoints, columns=["Media Owner", "Comment", "Date"]) # pyright: ignore
+            return
+        yield from d
+        i += 1
 
-    return out
+
+def post_comments_to_df(
+    instagram_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
+    """
+    You can have 1 to n files of post_comments_<x>.json
+    """
+
+    try:
+        columns = meta_records.normalize(_post_comments(instagram_zip), max_rows=max_rows, strategy=strategy)
+
+    except Exception as e:
+        logger.error("Exception caught: %s", e)
+        return pd.DataFrame()
+
+    out = pd.DataFrame({
+        "Media Owner": columns.get("Media Owner.value"),
+        "Comment": columns.get("Comment.value"),
+        "Date": iso_dates(columns.get("Time.timestamp")),
+    })
+
+    return sampling.mark_sampled(out, columns.total)
 
 
 
-def following_to_df(instagram_zip: str) -> pd.DataFrame:
+def following_to_df(
+    instagram_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
 
     b = eh.extract_file_from_zip(instagram_zip, "following.json")
-    data = eh.read_json_from_bytes(b)
+    data = eh.read_json_from_bytes(b, repair_mojibake=True)
 
     out = pd.DataFrame()
-    datapoints = []
 
     try:
-        items = data["relationships_following"] # pyright: ignore
-        for item in items:
-            d = eh.dict_denester(item)
-            datapoints.append((
-                eh.fix_latin1_string(eh.find_item(d, "value")),
-                eh.find_item(d, "href"),
-                eh.epoch_to_iso(eh.find_item(d, "timestamp"))
-            ))
-        out = pd.DataFrame(datapoints, columns=["Account", "Link", "Date"]) # pyright: ignore
+        records = data["relationships_following"] # pyright: ignore
+        columns = meta_records.normalize(records, max_rows=max_rows, strategy=strategy)
+        out = pd.DataFrame({
+            "Account": columns.get("value"),
+            "Link": columns.get("href"),
+            "Date": iso_dates(columns.get("timestamp")),
+        })
         out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
+        out = sampling.mark_sampled(out, columns.total)
 
     except Exception as e:
         logger.error("Exception caught: %s", e)
@@ -290,26 +289,28 @@ def following_to_df(instagram_zip: str) -> pd.DataFrame:
 
 
 
-def liked_comments_to_df(instagram_zip: str) -> pd.DataFrame:
+def liked_comments_to_df(
+    instagram_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
 
     b = eh.extract_file_from_zip(instagram_zip, "liked_comments.json")
-    data = eh.read_json_from_bytes(b)
+    data = eh.read_json_from_bytes(b, repair_mojibake=True)
 
     out = pd.DataFrame()
-    datapoints = []
 
     try:
-        items = data["likes_comment_likes"] #pyright: ignore
-        for item in items:
-            d = eh.dict_denester(item)
-            datapoints.append((
-                eh.fix_latin1_string(eh.find_item(d, "title")),
-                eh.fix_latin1_string(eh.find_item(d, "value")),
-                eh.find_items(d, "href"),
-                eh.epoch_to_iso(eh.find_item(d, "timestamp"))
-            ))
-        out = pd.DataFrame(datapoints, columns=["Account name", "Value", "Link", "Date"]) # pyright: ignore
+        records = data["likes_comment_likes"] # pyright: ignore
+        columns = meta_records.normalize(records, max_rows=max_rows, strategy=strategy)
+        out = pd.DataFrame({
+            "Account name": columns.get("title"),
+            "Value": columns.get("value"),
+            "Link": columns.get("href"),
+            "Date": iso_dates(columns.get("timestamp")),
+        })
         out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
+        out = sampling.mark_sampled(out, columns.total)
 
     except Exception as e:
         logger.error("Exception caught: %s", e)
@@ -317,26 +318,28 @@ def liked_comments_to_df(instagram_zip: str) -> pd.DataFrame:
     return out
 
 
-def liked_posts_to_df(instagram_zip: str) -> pd.DataFrame:
+def liked_posts_to_df(
+    instagram_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
 
     b = eh.extract_file_from_zip(instagram_zip, "liked_posts.json")
-    data = eh.read_json_from_bytes(b)
+    data = eh.read_json_from_bytes(b, repair_mojibake=True)
 
     out = pd.DataFrame()
-    datapoints = []
 
     try:
-        items = data["likes_media_likes"] #pyright: ignore
-        for item in items:
-            d = eh.dict_denester(item)
-            datapoints.append((
-                eh.fix_latin1_string(eh.find_item(d, "title")),
-                eh.fix_latin1_string(eh.find_item(d, "value")),
-                eh.find_items(d, "href"),
-                eh.epoch_to_iso(eh.find_item(d, "timestamp"))
-            ))
-        out = pd.DataFrame(datapoints, columns=["Account name", "Value", "Link", "Date"]) # pyright: ignore
+        records = data["likes_media_likes"] # pyright: ignore
+        columns = meta_records.normalize(records, max_rows=max_rows, strategy=strategy)
+        out = pd.DataFrame({
+            "Account name": columns.get("title"),
+            "Value": columns.get("value"),
+            "Link": columns.get("href"),
+            "Date": iso_dates(columns.get("timestamp")),
+        })
         out = out.sort_values(by="Date", key=eh.sort_isotimestamp_empty_timestamp_last)
+        out = sampling.mark_sampled(out, columns.total)
 
     except Exception as e:
         logger.error("Exception caught: %s", e)
@@ -344,11 +347,14 @@ def liked_posts_to_df(instagram_zip: str) -> pd.DataFrame:
     return out
 
 
-def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
-    tables = [
-        d3i_props.PropsUIPromptConsentFormTableViz(
+def extraction(instagram_zip: str) -> Generator[ExtractionStep, None, None]:
+    yield ExtractionStep(
+        to_df=posts_viewed_to_df,
+        args=(instagram_zip,),
+        members=["posts_viewed.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="instagram_posts_viewed",
-            data_frame=posts_viewed_to_df(instagram_zip),
             title=props.Translatable({
                 "en": "Posts viewed on Instagram",
                 "nl": "Berichten bekeken op Instagram"
@@ -390,9 +396,15 @@ def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTab
                 }
             ]
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=videos_watched_to_df,
+        args=(instagram_zip,),
+        members=["videos_watched.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="instagram_videos_watched",
-            data_frame=videos_watched_to_df(instagram_zip),
             title=props.Translatable({
                 "en": "Videos watched on Instagram",
                 "nl": "Video's bekeken op Instagram"
@@ -419,9 +431,15 @@ def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTab
                 }
             ]
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=post_comments_to_df,
+        args=(instagram_zip,),
+        members=["post_comments_*.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="instagram_post_comments",
-            data_frame=post_comments_to_df(instagram_zip),
             title=props.Translatable({
                 "en": "Comments on Instagram posts",
                 "nl": "Reacties op Instagram-berichten",
@@ -442,9 +460,15 @@ def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTab
                 }
             ]
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=accounts_not_interested_in_to_df,
+        args=(instagram_zip,),
+        members=["accounts_you're_not_interested_in.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="instagram_accounts_not_interested_in",
-            data_frame=accounts_not_interested_in_to_df(instagram_zip),
             title=props.Translatable({
                 "en": "Instagram accounts not interested in",
                 "nl": "Instagram-accounts waarin je geen interesse hebt"
@@ -454,9 +478,15 @@ def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTab
                 "nl": ""
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=ads_viewed_to_df,
+        args=(instagram_zip,),
+        members=["ads_viewed.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="instagram_ads_viewed",
-            data_frame=ads_viewed_to_df(instagram_zip),
             title=props.Translatable({
                 "en": "Ads you viewed on Instagram",
                 "nl": "Advertenties die je op Instagram hebt bekeken"
@@ -466,9 +496,15 @@ def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTab
                 "nl": "In deze tabel zie je de advertenties die je op Instagram hebt bekeken, gesorteerd op tijd."
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=posts_not_interested_in_to_df,
+        args=(instagram_zip,),
+        members=["posts_you're_not_interested_in.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="instagram_posts_not_interested_in",
-            data_frame=posts_not_interested_in_to_df(instagram_zip),
             title=props.Translatable({
                 "en": "Instagram posts not interested in",
                 "nl": "Instagram-berichten waarin je geen interesse hebt"
@@ -478,9 +514,15 @@ def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTab
                 "nl": ""
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=following_to_df,
+        args=(instagram_zip,),
+        members=["following.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="instagram_following",
-            data_frame=following_to_df(instagram_zip),
             title=props.Translatable({
                 "en": "Accounts that you follow on Instagram",
                 "nl": "Accounts die je volgt op Instagram"
@@ -490,9 +532,15 @@ def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTab
                 "nl": "In deze tabel zie je de accounts die je volgt op Instagram."
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=liked_comments_to_df,
+        args=(instagram_zip,),
+        members=["liked_comments.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="instagram_liked_comments",
-            data_frame=liked_comments_to_df(instagram_zip),
             title=props.Translatable({
                 "en": "Instagram liked comments",
                 "nl": "Instagram-reacties die je leuk vond"
@@ -513,9 +561,15 @@ def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTab
                 }
             ]
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=liked_posts_to_df,
+        args=(instagram_zip,),
+        members=["liked_posts.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="instagram_liked_posts",
-            data_frame=liked_posts_to_df(instagram_zip),
             title=props.Translatable({
                 "en": "Instagram liked posts",
                 "nl": "Instagram-berichten die je leuk vond"
@@ -535,10 +589,8 @@ def extraction(instagram_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTab
                     "tokenize": False,
                 }
             ]
-        )
-    ]
-
-    return [table for table in tables if not table.data_frame.empty]
+        ),
+    )
 
 
 class InstagramFlow(FlowBuilder):
@@ -549,7 +601,7 @@ class InstagramFlow(FlowBuilder):
         return validate.validate_zip(DDP_CATEGORIES, file)
         
     def extract_data(self, file_value, validation):
-        return extraction(file_value)
+        return self.extract_with_progress(extraction(file_value), file_value)
 
 
 def process(session_id):
@@ -7,17 +7,24 @@ Assumptions:
 It handles DDPs in the english language with filetype CSV.
 """
 
+from __future__ import annotations
+from functools import partial
+from typing import Generator, TYPE_CHECKING
 import logging
 import io
-import re
 
-import pandas as pd
+from port.helpers.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.extraction_helpers as eh
 import port.helpers.validate as validate
-from port.platforms.flow_builder import FlowBuilder
+from port.platforms.flow_builder import FlowBuilder, ExtractionStep
 
 from port.helpers.validate import (
     DDPCategory,
@@ -27,6 +34,9 @@ from port.helpers.validate import (
 
 logger = logging.getLogger(__name__)
 
+# The notes at the start of a CSV file end within this number of bytes
+NOTES_MAX_BYTES = 64 * 1024
+
 DDP_CATEGORIES = [
     DDPCategory(
         id="csv_en",
@@ -62,15 +72,19 @@ DDP_CATEGORIES = [
 def strip_notes(b: io.BytesIO) -> io.BytesIO:
     """
     Strip notes LinkedIn puts at the start of CSV files
+
+    The notes end with the first blank line, only the first NOTES_MAX_BYTES are scanned for it.
+    The buffer is positioned after the notes, so the CSV is read from there without copying it.
     """
 
     try:
-        pattern = re.compile(rb'^(.*?)\n\n', re.DOTALL)
-        out = io.BytesIO(pattern.sub(b'', b.read()))
-    except Exception:
-        out = b 
+        start = b.tell()
+        end = b.read(NOTES_MAX_BYTES).find(b"\n\n")
+        b.seek(start + end + 2 if end >= 0 else start)
+    except Exception as e:
+        logger.error("%s, could not strip notes", e)
 
-    return out
+    return b
 
 
 def company_follows_to_df(linkedin_zip: str) -> pd.DataFrame:
@@ -164,11 +178,14 @@ def comments_to_df(linkedin_zip: str) -> pd.DataFrame:
     return df
 
 
-def extraction(linkedin_zip: str) -> list:
-    tables = [
-        d3i_props.PropsUIPromptConsentFormTableViz(
+def extraction(linkedin_zip: str) -> Generator[ExtractionStep, None, None]:
+    yield ExtractionStep(
+        to_df=ads_clicked_to_df,
+        args=(linkedin_zip,),
+        members=["Ads Clicked.csv"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="linkedin_ads_clicked",
-            data_frame=ads_clicked_to_df(linkedin_zip),
             title=props.Translatable({
                 "en": "Ads you clicked on",
                 "nl": "Ads clicked"
@@ -178,9 +195,15 @@ def extraction(linkedin_zip: str) -> list:
                 "nl": "Overzicht van advertenties waarop je hebt geklikt tijdens het gebruik van LinkedIn"
             })
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=comments_to_df,
+        args=(linkedin_zip,),
+        members=["Comments.csv"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="linkedin_comments",
-            data_frame=comments_to_df(linkedin_zip),
             title=props.Translatable({
                 "en": "Your comments on LinkedIn",
                 "nl": "Comments"
@@ -201,9 +224,15 @@ def extraction(linkedin_zip: str) -> list:
                 }
             ]
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=company_follows_to_df,
+        args=(linkedin_zip,),
+        members=["Company Follows.csv"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="linked_in_company_follows",
-            data_frame=company_follows_to_df(linkedin_zip),
             title=props.Translatable({
                 "en": "Companies you follow",
                 "nl": "Company follows"
@@ -213,9 +242,15 @@ def extraction(linkedin_zip: str) -> list:
                 "nl": "Lijst van bedrijven die je volgt op LinkedIn"
             })
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=shares_to_df,
+        args=(linkedin_zip,),
+        members=["Shares.csv"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="linkedin_shares",
-            data_frame=shares_to_df(linkedin_zip),
             title=props.Translatable({
                 "en": "Posts you shared on LinkedIn",
                 "nl": "Shares"
@@ -225,9 +260,15 @@ def extraction(linkedin_zip: str) -> list:
                 "nl": "Content die je hebt gedeeld met je netwerk op LinkedIn"
             })
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=reactions_to_df,
+        args=(linkedin_zip,),
+        members=["Reactions.csv"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="linkedin_reactions",
-            data_frame=reactions_to_df(linkedin_zip),
             title=props.Translatable({
                 "en": "Your reactions on LinkedIn",
                 "nl": "Reactions"
@@ -248,11 +289,16 @@ def extraction(linkedin_zip: str) -> list:
                 }
             ]
         ),
-        
-        # Search queries
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    # Search queries
+    yield ExtractionStep(
+        to_df=search_queries_to_df,
+        args=(linkedin_zip,),
+        members=["SearchQueries.csv"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="linkedin_search_queries",
-            data_frame=search_queries_to_df(linkedin_zip),
             title=props.Translatable({
                 "en": "Your search queries on LinkedIn",
                 "nl": "Search queries"
@@ -272,10 +318,8 @@ def extraction(linkedin_zip: str) -> list:
                     "tokenize": True
                 }
             ]
-        )
-    ]
-    
-    return [table for table in tables if not table.data_frame.empty]
+        ),
+    )
 
 
 class LinkedInFlow(FlowBuilder):
@@ -286,7 +330,7 @@ class LinkedInFlow(FlowBuilder):
         return validate.validate_zip(DDP_CATEGORIES, file)
         
     def extract_data(self, file_value, validation):
-        return extraction(file_value)
+        return self.extract_with_progress(extraction(file_value), file_value)
 
 
 def process(session_id):
@@ -6,16 +6,24 @@ This module provides an example flow of a Netflix data donation study
 Assumptions:
 It handles DDPs in the english language with filetype CSV.
 """
+from __future__ import annotations
+from functools import partial
+from typing import Generator, TYPE_CHECKING
 import logging
 
-import pandas as pd
+from port.helpers.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.extraction_helpers as eh
 import port.helpers.validate as validate
 import port.helpers.port_helpers as ph
-from port.platforms.flow_builder import FlowBuilder
+from port.platforms.flow_builder import FlowBuilder, ExtractionStep
 
 from port.helpers.validate import (
     DDPCategory,
@@ -40,8 +48,8 @@ def extract_users(netflix_zip) -> list[str]:
     This function expects all users to be present in the first column of a pd.DataFrame
     """
 
-    b = eh.extract_file_from_zip(netflix_zip, "ViewingActivity.csv")
-    df = eh.read_csv_from_bytes_to_df(b)
+    with eh.open_file_from_zip(netflix_zip, "ViewingActivity.csv") as b:
+        df = eh.read_csv_from_bytes_to_df(b)
     out = []
     try:
         out: list[str] = df[df.columns[0]].unique().tolist()
@@ -70,8 +78,8 @@ def netflix_to_df(netflix_zip: str, file_name: str, selected_user: str) -> pd.Da
     netflix csv to df
     returns empty df in case of error
     """
-    ratings_bytes = eh.extract_file_from_zip(netflix_zip, file_name)
-    df = eh.read_csv_from_bytes_to_df(ratings_bytes)
+    with eh.open_file_from_zip(netflix_zip, file_name) as ratings_bytes:
+        df = eh.read_csv_from_bytes_to_df(ratings_bytes)
     df = keep_user(df, selected_user)
 
     return df
@@ -153,11 +161,14 @@ def viewing_activity_to_df(netflix_zip: str, selected_user: str)  -> pd.DataFram
 
 
 
-def extraction(netflix_zip: str, selected_user: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
-    tables = [
-        d3i_props.PropsUIPromptConsentFormTableViz(
+def extraction(netflix_zip: str, selected_user: str) -> Generator[ExtractionStep, None, None]:
+    yield ExtractionStep(
+        to_df=ratings_to_df,
+        args=(netflix_zip, selected_user),
+        members=["Ratings.csv"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="netflix_ratings",
-            data_frame=ratings_to_df(netflix_zip, selected_user),
             title=props.Translatable({
                 "en": "Your ratings on Netflix",
                 "nl": "Uw beoordelingen op Netflix"
@@ -178,9 +189,15 @@ def extraction(netflix_zip: str, selected_user: str) -> list[d3i_props.PropsUIPr
                 },
             ]
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=viewing_activity_to_df,
+        args=(netflix_zip, selected_user),
+        members=["ViewingActivity.csv"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="netflix_viewing_activity",
-            data_frame=viewing_activity_to_df(netflix_zip, selected_user),
             title= props.Translatable({
                 "en": "What you watched",
                 "nl": "Wanneer kijkt u Netflix"
@@ -223,9 +240,7 @@ def extraction(netflix_zip: str, selected_user: str) -> list[d3i_props.PropsUIPr
                 }
             ]
         ),
-    ]
-
-    return [table for table in tables if not table.data_frame.empty]
+    )
 
 
 class NetflixFlow(FlowBuilder):
@@ -241,7 +256,7 @@ class NetflixFlow(FlowBuilder):
 
         if len(users) == 1:
             selected_user = users[0]
-            return extraction(file, selected_user)
+            return (yield from self.extract_with_progress(extraction(file, selected_user), file))
         elif len(users) > 1:
             title = props.Translatable({
                 "en": "Select your Netflix profile name",
@@ -251,7 +266,7 @@ class NetflixFlow(FlowBuilder):
             radio_prompt = ph.generate_radio_prompt(title, empty_text, users)
             selection = yield ph.render_page(empty_text, radio_prompt)
             selected_user = selection.value
-            return extraction(file, selected_user)
+            return (yield from self.extract_with_progress(extraction(file, selected_user), file))
 
 
 def process(session_id):
@@ -0,0 +1,70 @@
+"""
+This module contains the registry of platform flows
+
+Platform modules are imported by name when they are needed, so only the flow that is used is loaded.
+
+Examples::
+
+    import port.platforms.registry as registry
+
+    script = registry.process("whatsapp", session_id)
+"""
+from types import ModuleType
+from typing import Any, Generator
+import importlib
+
+# Platform name: module that defines the flow of the platform and its process(session_id) function
+PLATFORMS = {
+    "chatgpt": "port.platforms.chatgpt",
+    "facebook": "port.platforms.facebook",
+    "instagram": "port.platforms.instagram",
+    "linkedin": "port.platforms.linkedin",
+    "netflix": "port.platforms.netflix",
+    "tiktok": "port.platforms.tiktok",
+    "whatsapp": "port.platforms.whatsapp",
+    "x": "port.platforms.x",
+    "youtube": "port.platforms.youtube",
+}
+
+DEFAULT_PLATFORM = "chatgpt"
+
+
+def names() -> list[str]:
+    return list(PLATFORMS)
+
+
+def load(name: str) -> ModuleType:
+    """
+    Imports the module of a platform
+
+    Raises:
+        ValueError: If the platform is not registered.
+    """
+    try:
+        module_name = PLATFORMS[name]
+    except KeyError:
+        raise ValueError(f"Unknown platform: {name}, expected one of {names()}") from None
+    return importlib.import_module(module_name)
+
+
+def flow_class(name: str) -> type:
+    """
+    Returns the FlowBuilder subclass of a platform
+
+    Raises:
+        ValueError: If the platform is not registered or defines no flow.
+    """
+    from port.platforms.flow_builder import FlowBuilder
+
+    module = load(name)
+    for obj in vars(module).values():
+        if isinstance(obj, type) and issubclass(obj, FlowBuilder) and obj is not FlowBuilder:
+            return obj
+    raise ValueError(f"No flow found in {module.__name__}")
+
+
+def process(name: str, session_id: Any) -> Generator:
+    """
+    Returns the data donation flow of a platform, see FlowBuilder.start_flow
+    """
+    return load(name).process(session_id)
@@ -7,19 +7,25 @@ Assumptions:
 It handles DDPs in the english language with filetype txt.
 """
 
-from typing import Dict
+from __future__ import annotations
+from functools import partial
+from typing import Dict, Generator, IO, TYPE_CHECKING
 import logging
 import io
 import re
-import re
 
-import pandas as pd
+from port.helpers.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.extraction_helpers as eh
 import port.helpers.validate as validate
-from port.platforms.flow_builder import FlowBuilder
+from port.platforms.flow_builder import FlowBuilder, ExtractionStep
 
 from port.helpers.validate import (
     DDPCategory,
@@ -81,20 +87,84 @@ DDP_CATEGORIES = [
 ]
 
 
+# Records in the txt files, every field of a record is on its own line and starts with its name
+DATE_LINK = re.compile(r"^Date: (.*)\nLink: (.*)$", re.MULTILINE)
+DATE = re.compile(r"^Date: (.*)$", re.MULTILINE)
+DATE_HASHTAG_LINK = re.compile(r"^Date: (.*)\nHashTag Link(?::|::) (.*)$", re.MULTILINE)
+HASHTAG = re.compile(r"^Hashtag Name: (.*)\nHashtag Link: (.*)$", re.MULTILINE)
+DATE_SEARCH_TERM = re.compile(r"^Date: (.*)\nSearch Term: (.*)$", re.MULTILINE)
+SHARE = re.compile(r"^Date: (.*)\nShared Content: (.*)\nLink: (.*)\nMethod: (.*)$", re.MULTILINE)
+INTERESTS = re.compile(r"^Interests: (.*)$", re.MULTILINE)
+
+# Number of characters decoded and scanned at once
+CHUNK_SIZE = 1024 * 1024
+
+
+def _tail_start(text: str, end: int, lines: int) -> int:
+    """
+    Returns the offset of the last number of lines in text[:end], which ends with a newline
+    """
+    pos = end - 1
+    for _ in range(lines):
+        pos = text.rfind("\n", 0, pos)
+        if pos < 0:
+            return 0
+    return pos + 1
+
+
+def scan_records(text_bytes: IO[bytes], pattern: re.Pattern[str], chunk_size: int = CHUNK_SIZE) -> list[list[str]]:
+    """
+    Scans the records in a txt file in a single pass, returns a column of values for every group of the pattern
+
+    The text is decoded and scanned in chunks, with the same matches as pattern.findall on the whole text.
+    A record has a line for every group of the pattern, so the last lines of a chunk that are too few
+    to hold a record are scanned again together with the next chunk.
+
+    Examples::
+
+        >>> scan_records(io.BytesIO(b"Date: 2024-01-01\\nLink: https://www.tiktok.com\\n\\n"), DATE_LINK)
+        [['2024-01-01'], ['https://www.tiktok.com']]
+    """
+    columns: list[list[str]] = [[] for _ in range(pattern.groups)]
+    carry = ""
+
+    with io.TextIOWrapper(text_bytes, encoding="utf-8") as stream:
+        while True:
+            chunk = stream.read(chunk_size)
+            text = carry + chunk
+
+            if chunk:
+                complete = text.rfind("\n") + 1
+                found = pattern.findall(text, 0, complete)
+                carry = text[_tail_start(text, complete, pattern.groups - 1) if complete else 0:]
+            else:
+                found = pattern.findall(text)
+
+            if pattern.groups == 1:
+                columns[0].extend(found)
+            else:
+                for column, values in zip(columns, zip(*found)):
+                    column.extend(values)
+
+            if not chunk:
+                return columns
+
+
+def records_to_df(tiktok_zip: str, file_name: str, pattern: re.Pattern[str], columns: list[str]) -> pd.DataFrame:
+    """
+    Streams a txt file from the zip once and returns its records as a DataFrame, see scan_records
+    """
+    with eh.open_file_from_zip(tiktok_zip, file_name) as b:
+        values = scan_records(b, pattern)
+    return pd.DataFrame(dict(zip(columns, values)), columns=columns)
+
 
 def browsing_history_to_df(tiktok_zip: str) -> pd.DataFrame:
 
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Browsing History.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
-
-        pattern = re.compile(r"^Date: (.*?)\nLink: (.*?)$", re.MULTILINE)
-        matches = re.findall(pattern, text)
-        out = pd.DataFrame(matches, columns=["Time and Date", "Video watched"]) # pyright: ignore
-
+        out = records_to_df(tiktok_zip, "Browsing History.txt", DATE_LINK, ["Time and Date", "Video watched"])
     except Exception as e:
         logger.error(e)
 
@@ -106,14 +176,7 @@ def favorite_hashtag_to_df(tiktok_zip: str) -> pd.DataFrame:
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Favorite HashTags.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
-
-        pattern = re.compile(r"^Date: (.*?)\nHashTag Link(?::|::) (.*?)$", re.MULTILINE)
-        matches = re.findall(pattern, text)
-        out = pd.DataFrame(matches, columns=["Tijdstip", "Hashtag url"]) # pyright: ignore
-
+        out = records_to_df(tiktok_zip, "Favorite HashTags.txt", DATE_HASHTAG_LINK, ["Tijdstip", "Hashtag url"])
     except Exception as e:
         logger.error(e)
 
@@ -125,14 +188,7 @@ def favorite_videos_to_df(tiktok_zip: str) -> pd.DataFrame:
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Favorite Videos.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
-
-        pattern = re.compile(r"^Date: (.*?)\nLink: (.*?)$", re.MULTILINE)
-        matches = re.findall(pattern, text)
-        out = pd.DataFrame(matches, columns=["Tijdstip", "Video"]) # pyright: ignore
-
+        out = records_to_df(tiktok_zip, "Favorite Videos.txt", DATE_LINK, ["Tijdstip", "Video"])
     except Exception as e:
         logger.error(e)
 
@@ -144,14 +200,7 @@ def follower_to_df(tiktok_zip: str) -> pd.DataFrame:
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Follower.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
-
-        pattern = re.compile(r"^Date: (.*?)$", re.MULTILINE)
-        matches = re.findall(pattern, text)
-        out = pd.DataFrame(matches, columns=["Date"]) # pyright: ignore
-
+        out = records_to_df(tiktok_zip, "Follower.txt", DATE, ["Date"])
     except Exception as e:
         logger.error(e)
 
@@ -163,14 +212,7 @@ def following_to_df(tiktok_zip: str) -> pd.DataFrame:
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Following.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
-
-        pattern = re.compile(r"^Date: (.*?)$", re.MULTILINE)
-        matches = re.findall(pattern, text)
-        out = pd.DataFrame(matches, columns=["Date"]) # pyright: ignore
-
+        out = records_to_df(tiktok_zip, "Following.txt", DATE, ["Date"])
     except Exception as e:
         logger.error(e)
 
@@ -182,14 +224,7 @@ def hashtag_to_df(tiktok_zip: str) -> pd.DataFrame:
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Hashtag.txt") # pyright: ignore
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
-
-        pattern = re.compile(r"^Hashtag Name: (.*?)\nHashtag Link: (.*?)$", re.MULTILINE)
-        matches = re.findall(pattern, text)
-        out = pd.DataFrame(matches, columns=["Hashtag naam", "Hashtag url"]) # pyright: ignore
-
+        out = records_to_df(tiktok_zip, "Hashtag.txt", HASHTAG, ["Hashtag naam", "Hashtag url"])
     except Exception as e:
         logger.error(e)
 
@@ -202,14 +237,7 @@ def like_list_to_df(tiktok_zip: str) -> pd.DataFrame:
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Like List.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
-
-        pattern = re.compile(r"^Date: (.*?)\nLink: (.*?)$", re.MULTILINE)
-        matches = re.findall(pattern, text)
-        out = pd.DataFrame(matches, columns=["Tijdstip", "Video"]) # pyright: ignore
-
+        out = records_to_df(tiktok_zip, "Like List.txt", DATE_LINK, ["Tijdstip", "Video"])
     except Exception as e:
         logger.error(e)
 
@@ -221,14 +249,7 @@ def searches_to_df(tiktok_zip: str) -> pd.DataFrame:
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Searches.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
-
-        pattern = re.compile(r"^Date: (.*?)\nSearch Term: (.*?)$", re.MULTILINE)
-        matches = re.findall(pattern, text)
-        out = pd.DataFrame(matches, columns=["Tijdstip", "Zoekterm"]) # pyright: ignore
-
+        out = records_to_df(tiktok_zip, "Searches.txt", DATE_SEARCH_TERM, ["Tijdstip", "Zoekterm"])
     except Exception as e:
         logger.error(e)
 
@@ -241,14 +262,11 @@ def share_history_to_df(tiktok_zip: str) -> pd.DataFrame:
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Share History.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
-
-        pattern = re.compile(r"^Date: (.*?)\nShared Content: (.*?)\nLink: (.*?)\nMethod: (.*?)$", re.MULTILINE)
-        matches = re.findall(pattern, text)
-        out = pd.DataFrame(matches, columns=["Tijdstip", "Gedeelde inhoud", "Url", "Gedeeld via"]) # pyright: ignore
-
+        out = records_to_df(
+            tiktok_zip, "Share History.txt",
+            SHARE,
+            ["Tijdstip", "Gedeelde inhoud", "Url", "Gedeeld via"],
+        )
     except Exception as e:
         logger.error(e)
 
@@ -260,15 +278,10 @@ def settings_to_df(tiktok_zip: str) -> pd.DataFrame:
     out = pd.DataFrame()
 
     try:
-        b = eh.extract_file_from_zip(tiktok_zip, "Settings.txt")
-        b = io.TextIOWrapper(b, encoding='utf-8')
-        text = b.read()
-
-        pattern = re.compile(r"^Interests: (.*?)$", re.MULTILINE)
-        match = re.search(pattern, text)
-        if match:
-            interests = match.group(1).split("|")
-            out = pd.DataFrame(interests, columns=["Interesses"])  # pyright: ignore
+        with eh.open_file_from_zip(tiktok_zip, "Settings.txt") as b:
+            interests, = scan_records(b, INTERESTS)
+        if interests:
+            out = pd.DataFrame(interests[0].split("|"), columns=["Interesses"])  # pyright: ignore
 
     except Exception as e:
         logger.error(e)
@@ -276,11 +289,14 @@ def settings_to_df(tiktok_zip: str) -> pd.DataFrame:
     return out
 
 
-def extraction(tiktok_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
-    tables = [
-        d3i_props.PropsUIPromptConsentFormTableViz(
+def extraction(tiktok_zip: str) -> Generator[ExtractionStep, None, None]:
+    yield ExtractionStep(
+        to_df=browsing_history_to_df,
+        args=(tiktok_zip,),
+        members=["Browsing History.txt"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="tiktok_video_browsing_history",
-            data_frame=browsing_history_to_df(tiktok_zip),
             title=props.Translatable({
                 "en": "Watch history", 
                 "nl": "Kijkgeschiedenis"
@@ -291,9 +307,15 @@ def extraction(tiktok_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableV
             }),
             visualizations=[]
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=favorite_videos_to_df,
+        args=(tiktok_zip,),
+        members=["Favorite Videos.txt"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="tiktok_favorite_videos",
-            data_frame=favorite_videos_to_df(tiktok_zip),
             title=props.Translatable({
                 "en": "Favorite video's", 
                 "nl": "Favoriete video's", 
@@ -303,9 +325,15 @@ def extraction(tiktok_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableV
                 "nl": "In de tabel hieronder vind je de video's die tot je favorieten behoren.", 
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=favorite_hashtag_to_df,
+        args=(tiktok_zip,),
+        members=["Favorite HashTags.txt"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="tiktok_favorite_hashtags",
-            data_frame=favorite_hashtag_to_df(tiktok_zip),
             title=props.Translatable({
                 "en": "Favorite hashtags", 
                 "nl": "Favoriete hashtags", 
@@ -315,9 +343,15 @@ def extraction(tiktok_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableV
                 "nl": "In de tabel hieronder vind je de hashtags die tot je favorieten behoren.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=hashtag_to_df,
+        args=(tiktok_zip,),
+        members=["Hashtag.txt"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="tiktok_hashtag",
-            data_frame=hashtag_to_df(tiktok_zip),
             title=props.Translatable({
                 "en": "Hashtags in video's die je hebt geplaatst", 
                 "nl": "Hashtags in video's die je hebt geplaatst", 
@@ -327,9 +361,15 @@ def extraction(tiktok_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableV
                 "nl": "In de tabel hieronder vind je de hashtags die je gebruikt hebt in een video die je hebt geplaats op TikTok.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=like_list_to_df,
+        args=(tiktok_zip,),
+        members=["Like List.txt"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="tiktok_like_list",
-            data_frame=like_list_to_df(tiktok_zip),
             title=props.Translatable({
                 "en": "Videos you have liked", 
                 "nl": "Video's die je hebt geliket", 
@@ -339,9 +379,15 @@ def extraction(tiktok_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableV
                 "nl": "In de tabel hieronder vind je de video's die je hebt geliket en wanneer dat was.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=searches_to_df,
+        args=(tiktok_zip,),
+        members=["Searches.txt"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="tiktok_searches",
-            data_frame=searches_to_df(tiktok_zip),
             title=props.Translatable({
                 "en": "Search terms", 
                 "nl": "Zoektermen", 
@@ -358,9 +404,15 @@ def extraction(tiktok_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableV
                 }
             ]
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=share_history_to_df,
+        args=(tiktok_zip,),
+        members=["Share History.txt"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="tiktok_share_history",
-            data_frame=share_history_to_df(tiktok_zip),
             title=props.Translatable({
                 "en": "Shared videos", 
                 "nl": "Gedeelde video's", 
@@ -370,9 +422,15 @@ def extraction(tiktok_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableV
                 "nl": "In de tabel hieronder vind je wat je hebt gedeeld, op welk tijdstip en de manier waarop.",
             }),
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=settings_to_df,
+        args=(tiktok_zip,),
+        members=["Settings.txt"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="tiktok_settings",
-            data_frame=settings_to_df(tiktok_zip),
             title=props.Translatable({
                 "en": "Interests on TikTok", 
                 "nl": "Interesses op TikTok"
@@ -382,10 +440,7 @@ def extraction(tiktok_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableV
                 "nl": "Hieronder vind je de interesses die je hebt aangevinkt bij het aanmaken van je TikTok account",
             }),
         ),
-    ]
-
-    tables_to_render = [table for table in tables if table.data_frame is not None and not table.data_frame.empty]
-    return tables_to_render
+    )
 
 
 class TikTokFlow(FlowBuilder):
@@ -396,7 +451,7 @@ class TikTokFlow(FlowBuilder):
         return validate.validate_zip(DDP_CATEGORIES, file)
         
     def extract_data(self, file_value, validation):
-        return extraction(file_value)
+        return self.extract_with_progress(extraction(file_value), file_value)
 
 
 def process(session_id):
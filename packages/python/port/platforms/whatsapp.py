@@ -7,21 +7,30 @@ Assumptions:
 It handles DDPs containing a group chat. This extraction is not perfect because the text file containg the group chat does not follow a structure, however it performs well enough.
 """
 
-from typing import Tuple, TypedDict
+from __future__ import annotations
+from functools import partial
+from typing import Generator, Tuple, TypedDict, TYPE_CHECKING
 from collections import Counter
-from dateutil import parser
 import unicodedata
 import logging
 import zipfile
 import re
 
-import pandas as pd
+from port.helpers.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from dateutil import parser
+else:
+    pd = lazy_import("pandas")
+    parser = lazy_import("dateutil.parser")
 
 import port.api.props as props
 import port.api.d3i_props as d3i_props
+import port.helpers.extraction_helpers as eh
 import port.helpers.validate as validate
-from port.platforms.flow_builder import FlowBuilder
-from port.helpers.emoji_pattern import EMOJI_PATTERN
+from port.platforms.flow_builder import FlowBuilder, ExtractionStep
+import port.helpers.emoji_pattern as emoji_pattern
 
 logger = logging.getLogger(__name__)
 
@@ -237,8 +246,7 @@ def read_chat_file(path_to_chat_file: str) -> list[str]:
         file_list = z.namelist()
         print(f"{file_list}")
         with z.open(file_list[0]) as f:
-            lines = f.readlines()
-            lines = [line.decode("utf-8") for line in lines]
+            lines = list(eh.read_lines_from_bytes(f))
 
     else:
         with open(path_to_chat_file, encoding="utf-8") as f:
@@ -298,7 +306,7 @@ def find_emojis(df):
 
         emojis = []
         for text in df['chat_message']:
-            chars = EMOJI_PATTERN.findall(text)
+            chars = emoji_pattern.EMOJI_PATTERN.findall(text)
             emojis.extend(chars)
 
         emoji_counter = Counter(emojis)
@@ -363,7 +371,7 @@ def favorite_emoji(df: pd.DataFrame, name: str) -> str:
     emojis = []
 
     for message in messages:
-        emojis.extend(EMOJI_PATTERN.findall(message))
+        emojis.extend(emoji_pattern.EMOJI_PATTERN.findall(message))
 
     emoji_counter_list = Counter(emojis).most_common(1)
     most_common_emoji = ""
@@ -384,11 +392,26 @@ def user_statistics_to_df(df, user):
     return pd.DataFrame(statistics, columns=["Description", "Statistic"]) # pyright: ignore
 
 
-def extraction(df: pd.DataFrame) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
-    tables = [
-        d3i_props.PropsUIPromptConsentFormTableViz(
+def group_chat_to_df(df: pd.DataFrame) -> pd.DataFrame:
+    return df.rename(columns={"date": "Timestamp", "name": "Name", "chat_message": "Message"})
+
+
+def extraction(chat_file: str) -> Generator[ExtractionStep, None, None]:
+    """
+    Parses the chat and yields the steps that extract the tables from it
+
+    The chat is parsed when the first step is requested, while the first extraction progress page is shown.
+    """
+    df = parse_chat(chat_file)
+    df = remove_empty_chats(df)
+    df = keep_users(df, extract_users(df))
+
+    yield ExtractionStep(
+        to_df=group_chat_to_df,
+        args=(df,),
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="whatsapp_grou_chat",
-            data_frame=df.rename(columns={"date": "Timestamp", "name": "Name", "chat_message": "Message"}),
             title=props.Translatable({
                 "en": "Your group chat", 
                 "nl": "Your group chat"
@@ -433,10 +456,14 @@ def extraction(df: pd.DataFrame) -> list[d3i_props.PropsUIPromptConsentFormTable
                 }
             ]
         ),
-        
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=find_emojis,
+        args=(df,),
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="emoji_usage",
-            data_frame=find_emojis(df),
             title=props.Translatable({
                 "en": "The 100 most used emojis in the group",
                 "nl": "De 100 meest gebbruikte emojis in the groep"
@@ -445,15 +472,17 @@ def extraction(df: pd.DataFrame) -> list[d3i_props.PropsUIPromptConsentFormTable
                 "en": "Analysis of emoji frequency used by all members in the chat",
                 "nl": "Analyse van emoji-frequentie gebruikt door alle leden in de chat"
             })
-        )
-    ]
-    
+        ),
+    )
+
     users = extract_users(df)
     for i, user in enumerate(users):
-        tables.append(
-            d3i_props.PropsUIPromptConsentFormTableViz(
+        yield ExtractionStep(
+            to_df=user_statistics_to_df,
+            args=(df, user),
+            table=partial(
+                d3i_props.PropsUIPromptConsentFormTableViz,
                 id=f"user_statistics_{i}",
-                data_frame=user_statistics_to_df(df, user),
                 title=props.Translatable({
                     "en": f"Chat statistics for user: {user}",
                     "nl": f"Chat statistics for user: {user}"
@@ -462,10 +491,8 @@ def extraction(df: pd.DataFrame) -> list[d3i_props.PropsUIPromptConsentFormTable
                     "en": f"Detailed messaging patterns and activity metrics for {user}",
                     "nl": f"Gedetailleerde berichtpatronen en activiteitsgegevens voor {user}"
                 })
-            )
+            ),
         )
-    
-    return [table for table in tables if not table.data_frame.empty]
 
 
 class WhatsAppFlow(FlowBuilder):
@@ -480,11 +507,7 @@ class WhatsAppFlow(FlowBuilder):
             return validate.BaseValidation(status_code=1)
         
     def extract_data(self, file, validation):
-        df = parse_chat(file)
-        df = remove_empty_chats(df)
-        users = extract_users(df)
-        df = keep_users(df, users)
-        return extraction(df)
+        return self.extract_with_progress(extraction(file), file)
 
 
 def process(session_id):
@@ -7,19 +7,29 @@ Assumptions:
 It handles DDPs in the english language with filetype js.
 """
 
+from __future__ import annotations
 import logging
-import json
-import io
+import posixpath
 import re
-from typing import Any
+import zipfile
+from functools import partial
+from typing import Any, Generator, Iterator, TYPE_CHECKING
 
-import pandas as pd
+from port.helpers.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.extraction_helpers as eh
+import port.helpers.json_stream as json_stream
+import port.helpers.sampling as sampling
 import port.helpers.validate as validate
-from port.platforms.flow_builder import FlowBuilder
+import port.helpers.zip_index as zip_index
+from port.platforms.flow_builder import FlowBuilder, ExtractionStep
 
 from port.helpers.validate import (
     DDPCategory,
@@ -29,6 +39,9 @@ from port.helpers.validate import (
 
 logger = logging.getLogger(__name__)
 
+# Files split in parts by X: tweets.js, tweets-part1.js, tweets-part2.js
+JS_PART = re.compile(r"-part(\d+)\.js$")
+
 DDP_CATEGORIES = [
     DDPCategory(
         id="json_en",
@@ -41,53 +54,94 @@ DDP_CATEGORIES = [
 ]
 
 
-def bytesio_to_listdict(bytes_to_read: io.BytesIO) -> list[dict[Any, Any]]:
-    """
-    Converts a io.BytesIO buffer containing a twitter.js file, to a list of dicts
+def _part_number(name: str) -> int:
+    match = JS_PART.search(name)
+    return int(match.group(1)) if match and match.group(1) else 0
+
 
-    A list of dicts is the current structure of twitter.js files
+def find_js_parts(x_zip: str, file_name: str) -> list[str]:
     """
+    Returns the members of a .js file in the zip, with its parts in order
 
+    Large files are split by X in parts: tweets.js, tweets-part1.js, tweets-part2.js and so on.
+    Only the parts in the directory of the first member found are returned.
+
+    Args:
+        x_zip (str): Path to the zip file.
+        file_name (str): Name of the file, for example "tweets.js".
+    """
     out = []
-    lines = []
 
     try:
-        with io.TextIOWrapper(bytes_to_read, encoding="utf8") as f:
-            lines = f.readlines()
+        stem = zip_index.basename(file_name).removesuffix(".js")
+        pattern = re.compile(rf"(?:^|/){re.escape(stem)}(?:-part(\d+))?\.js$")
+        members = [name for name in zip_index.get_index(x_zip).names if pattern.search(name)]
+        if members:
+            directory = posixpath.dirname(members[0])
+            members = [name for name in members if posixpath.dirname(name) == directory]
+            out = sorted(members, key=_part_number)
+
+    except zipfile.BadZipFile as e:
+        logger.error("BadZipFile:  %s", e)
+    except Exception as e:
+        logger.error("Exception was caught:  %s", e)
 
-        # change first line so its a valid json
-        lines[0] = re.sub("^.*? = ", "", lines[0])
+    return out
 
-        # convert to a list of dicts
-        out = json.loads("".join(lines))
 
-    except json.decoder.JSONDecodeError as e:
-        logger.error("The input buffer did not contain a valid JSON: %s", e)
-    except IndexError as e:
-        logger.error("No lines were read, could be empty input buffer: %s", e)
-    except Exception as e:
-        logger.error("Exception was caught: %s", e)
+def iter_js_from_zip(x_zip: str, file_name: str, paths: list[json_stream.Path]) -> Iterator[tuple[Any, ...]]:
+    """
+    Yields the items of a .js file and its parts one by one, projected to the values at paths
 
-    finally:
-        return out
+    Only the projected values of an item are kept, see json_stream.iter_array.
+    The iterator raises json.JSONDecodeError if a part is not valid, extractors catch it.
 
+    Examples::
 
-def ad_engagement_to_df(x_zip: str) -> pd.DataFrame:
+        >>> paths = [("tweet", "created_at"), ("tweet", "full_text")]
+        >>> for created_at, full_text in iter_js_from_zip("x.zip", "tweets.js", paths):
+        ...     print(created_at, full_text)
+    """
+    members = find_js_parts(x_zip, file_name)
+    if not members:
+        logger.error("File not found:  %s", file_name)
 
-    b = eh.extract_file_from_zip(x_zip, "ad-engagements.js")
-    items = bytesio_to_listdict(b)
+    for member in members:
+        with eh.open_file_from_zip(x_zip, member) as b:
+            yield from json_stream.iter_array(b, paths)
+
+
+def _to_str(value: Any) -> str:
+    """
+    Converts a projected value to a string like extraction_helpers.find_item, an empty string if it is missing
+    """
+    return "" if value is None else str(value)
+
+
+def ad_engagement_to_df(
+    x_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
+
+    engagement = ("ad", "adsUserData", "adEngagements", "engagements", 0, "impressionAttributes")
+    items = iter_js_from_zip(x_zip, "ad-engagements.js", [
+        (*engagement, "promotedTweetInfo", "tweetText"),
+        (*engagement, "impressionTime"),
+    ])
 
     out = pd.DataFrame()
     datapoints = []
 
     try:
-        for item in items:
-            d = eh.dict_denester(item)
+        rows, total_rows = sampling.sample(items, max_rows, strategy)
+        for text, impression_time in rows:
             datapoints.append((
-                eh.find_item(d, "tweetText"),
-                eh.find_item(d, "impressionTime"),
+                _to_str(text),
+                _to_str(impression_time),
             ))
         out = pd.DataFrame(datapoints, columns=["Text", "Impression time"]) # pyright: ignore
+        out = sampling.mark_sampled(out, total_rows)
 
     except Exception as e:
         logger.error("Exception caught: %s", e)
@@ -95,23 +149,27 @@ def ad_engagement_to_df(x_zip: str) -> pd.DataFrame:
     return out
 
 
-def personalization_to_df(x_zip: str) -> pd.DataFrame:
+def personalization_to_df(
+    x_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
 
-    b = eh.extract_file_from_zip(x_zip, "personalization.js")
-    items = bytesio_to_listdict(b)
+    items = iter_js_from_zip(x_zip, "personalization.js", [("p13nData", "interests", "interests")])
 
     out = pd.DataFrame()
     datapoints = []
 
     try:
-        l = items[0]["p13nData"]["interests"]["interests"]
-        for item in l:
-            d = eh.dict_denester(item)
+        l, = next(items)
+        rows, total_rows = sampling.sample(l, max_rows, strategy)
+        for item in rows:
             datapoints.append((
-                eh.find_item(d, "name"),
-                eh.find_item(d, "isDisabled"),
+                _to_str(item.get("name")),
+                _to_str(item.get("isDisabled")),
             ))
         out = pd.DataFrame(datapoints, columns=["Interest", "is disabled"]) # pyright: ignore
+        out = sampling.mark_sampled(out, total_rows)
 
     except Exception as e:
         logger.error("Exception caught: %s", e)
@@ -119,7 +177,11 @@ def personalization_to_df(x_zip: str) -> pd.DataFrame:
     return out
 
 
-def follower_to_df(x_zip: str) -> pd.DataFrame:
+def follower_to_df(
+    x_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
     """
     following.js
     """
@@ -127,22 +189,26 @@ def follower_to_df(x_zip: str) -> pd.DataFrame:
     datapoints = []
     out = pd.DataFrame()
 
-    b = eh.extract_file_from_zip(x_zip, "follower.js")
-    ld = bytesio_to_listdict(b)
-
     try:
-        for item in ld:
+        items = iter_js_from_zip(x_zip, "follower.js", [("follower", "userLink")])
+        rows, total_rows = sampling.sample(items, max_rows, strategy)
+        for user_link, in rows:
             datapoints.append((
-                item.get("follower", {}).get("userLink", None)
+                user_link
             ))
         out = pd.DataFrame(datapoints, columns=["Link to user"]) # pyright: ignore
+        out = sampling.mark_sampled(out, total_rows)
     except Exception as e:
         logger.error("Exception was caught: %s", e)
 
     return out
 
 
-def following_to_df(twitter_zip: str) -> pd.DataFrame:
+def following_to_df(
+    twitter_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
     """
     following.js
     """
@@ -150,15 +216,15 @@ def following_to_df(twitter_zip: str) -> pd.DataFrame:
     datapoints = []
     out = pd.DataFrame()
 
-    b = eh.extract_file_from_zip(twitter_zip, "following.js")
-    ld = bytesio_to_listdict(b)
-
     try:
-        for item in ld:
+        items = iter_js_from_zip(twitter_zip, "following.js", [("following", "userLink")])
+        rows, total_rows = sampling.sample(items, max_rows, strategy)
+        for user_link, in rows:
             datapoints.append((
-                item.get("following", {}).get("userLink", None)
+                user_link
             ))
         out = pd.DataFrame(datapoints, columns=["Link to user"]) # pyright: ignore
+        out = sampling.mark_sampled(out, total_rows)
     except Exception as e:
         logger.error("Exception was caught: %s", e)
 
@@ -166,7 +232,11 @@ def following_to_df(twitter_zip: str) -> pd.DataFrame:
 
 
 
-def like_to_df(twitter_zip: str) -> pd.DataFrame:
+def like_to_df(
+    twitter_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
     """
     like.js
     """
@@ -174,16 +244,16 @@ def like_to_df(twitter_zip: str) -> pd.DataFrame:
     datapoints = []
     out = pd.DataFrame()
 
-    b = eh.extract_file_from_zip(twitter_zip, "like.js")
-    ld = bytesio_to_listdict(b)
-
     try:
-        for item in ld:
+        items = iter_js_from_zip(twitter_zip, "like.js", [("like", "tweetId"), ("like", "fullText")])
+        rows, total_rows = sampling.sample(items, max_rows, strategy)
+        for tweet_id, full_text in rows:
             datapoints.append((
-                item.get("like", {}).get("tweetId", None),
-                item.get("like", {}).get("fullText", None)
+                tweet_id,
+                full_text,
             ))
         out = pd.DataFrame(datapoints, columns=["Tweet Id", "Tweet"]) #pyright: ignore
+        out = sampling.mark_sampled(out, total_rows)
         out["Tweet Id"] = "https://twitter.com/a/status/" + out["Tweet Id"]
     except Exception as e:
         logger.error("Exception was caught: %s", e)
@@ -191,7 +261,11 @@ def like_to_df(twitter_zip: str) -> pd.DataFrame:
     return out
 
 
-def tweets_to_df(twitter_zip: str) -> pd.DataFrame:
+def tweets_to_df(
+    twitter_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
     """
     tweets.js
     """
@@ -199,40 +273,49 @@ def tweets_to_df(twitter_zip: str) -> pd.DataFrame:
     datapoints = []
     out = pd.DataFrame()
 
-    b = eh.extract_file_from_zip(twitter_zip, "/tweets.js")
-    ld = bytesio_to_listdict(b)
+    items = iter_js_from_zip(twitter_zip, "tweets.js", [
+        ("tweet", "created_at"),
+        ("tweet", "full_text"),
+        ("tweet", "retweeted"),
+    ])
 
     try:
-        for item in ld:
+        rows, total_rows = sampling.sample(items, max_rows, strategy)
+        for created_at, full_text, retweeted in rows:
             datapoints.append((
-                item.get("tweet", {}).get("created_at", None),
-                item.get("tweet", {}).get("full_text", None),
-                str(item.get("tweet", {}).get("retweeted", ""))
+                created_at,
+                full_text,
+                str(retweeted if retweeted is not None else "")
             ))
         out = pd.DataFrame(datapoints, columns=["Date", "Tweet", "Retweeted"]) #pyright: ignore
+        out = sampling.mark_sampled(out, total_rows)
     except Exception as e:
         logger.error("Exception was caught: %s", e)
 
     return out
 
 
-def block_to_df(x_zip: str) -> pd.DataFrame:
+def block_to_df(
+    x_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
     """
     block.js
     """
 
-    b = eh.extract_file_from_zip(x_zip, "/block.js")
-    ld = bytesio_to_listdict(b)
-
     datapoints = []
     out = pd.DataFrame()
 
     try:
-        for item in ld:
+        items = iter_js_from_zip(x_zip, "block.js", [("blocking", "userLink")])
+        rows, total_rows = sampling.sample(items, max_rows, strategy)
+        for user_link, in rows:
             datapoints.append((
-                item.get("blocking", {}).get("userLink", "")
+                user_link if user_link is not None else ""
             ))
         out = pd.DataFrame(datapoints, columns=["Blocked users"]) # pyright: ignore
+        out = sampling.mark_sampled(out, total_rows)
 
     except Exception as e:
         logger.error("Exception was caught: %s", e)
@@ -240,7 +323,11 @@ def block_to_df(x_zip: str) -> pd.DataFrame:
     return out
 
 
-def mute_to_df(twitter_zip: str) -> pd.DataFrame:
+def mute_to_df(
+    twitter_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
     """
     mute.js
     """
@@ -248,61 +335,80 @@ def mute_to_df(twitter_zip: str) -> pd.DataFrame:
     datapoints = []
     out = pd.DataFrame()
 
-    b = eh.extract_file_from_zip(twitter_zip, "mute.js")
-    ld = bytesio_to_listdict(b)
-
     try:
-        for item in ld:
+        items = iter_js_from_zip(twitter_zip, "mute.js", [("muting", "userLink")])
+        rows, total_rows = sampling.sample(items, max_rows, strategy)
+        for user_link, in rows:
             datapoints.append((
-                item.get("muting", {}).get("userLink", "")
+                user_link if user_link is not None else ""
             ))
         out = pd.DataFrame(datapoints, columns=["Muted users"]) # pyright: ignore
+        out = sampling.mark_sampled(out, total_rows)
     except Exception as e:
         logger.error("Exception was caught: %s", e)
 
     return out
 
 
-def tweet_headers_to_df(twitter_zip: str) -> pd.DataFrame:
+def tweet_headers_to_df(
+    twitter_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
     datapoints = []
     out = pd.DataFrame()
 
-    b = eh.extract_file_from_zip(twitter_zip, "/tweet-headers.js")
-    ld = bytesio_to_listdict(b)
+    items = iter_js_from_zip(twitter_zip, "tweet-headers.js", [
+        ("tweet", "tweet_id"),
+        ("tweet", "user_id"),
+        ("tweet", "created_at"),
+    ])
 
     try:
-        for item in ld:
-            d = eh.dict_denester(item)
+        rows, total_rows = sampling.sample(items, max_rows, strategy)
+        for tweet_id, user_id, created_at in rows:
             datapoints.append((
-                eh.find_item(d, "tweet_id"),
-                eh.find_item(d, "user_id"),
-                eh.find_item(d, "created_at"),
+                _to_str(tweet_id),
+                _to_str(user_id),
+                _to_str(created_at),
             ))
 
         out = pd.DataFrame(datapoints, columns=["Tweet id", "User id", "Created at"]) # pyright: ignore
+
+        out = sampling.mark_sampled(out, total_rows)
     except Exception as e:
         logger.error("Exception was caught: %s", e)
 
     return out
 
 
-def user_link_clicks_to_df(twitter_zip: str) -> pd.DataFrame:
+def user_link_clicks_to_df(
+    twitter_zip: str,
+    max_rows: int | None = None,
+    strategy: str = sampling.HEAD_TAIL,
+) -> pd.DataFrame:
     datapoints = []
     out = pd.DataFrame()
 
-    b = eh.extract_file_from_zip(twitter_zip, "/user-link-clicks.js")
-    ld = bytesio_to_listdict(b)
+    link_click = ("userInteractionsData", "linkClick")
+    items = iter_js_from_zip(twitter_zip, "user-link-clicks.js", [
+        (*link_click, "tweetId"),
+        (*link_click, "finalUrl"),
+        (*link_click, "timeStampOfInteraction"),
+    ])
 
     try:
-        for item in ld:
-            d = eh.dict_denester(item)
+        rows, total_rows = sampling.sample(items, max_rows, strategy)
+        for tweet_id, final_url, timestamp in rows:
             datapoints.append((
-                eh.find_item(d, "tweetId"),
-                eh.find_item(d, "finalUrl"),
-                eh.find_item(d, "timeStampOfInteraction"),
+                _to_str(tweet_id),
+                _to_str(final_url),
+                _to_str(timestamp),
             ))
 
         out = pd.DataFrame(datapoints, columns=["Tweet id", "Link", "Datum en tijd"]) # pyright: ignore
+
+        out = sampling.mark_sampled(out, total_rows)
     except Exception as e:
         logger.error("Exception was caught: %s", e)
 
@@ -310,11 +416,14 @@ def user_link_clicks_to_df(twitter_zip: str) -> pd.DataFrame:
 
 
 
-def extraction(x_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
-    tables = [
-        d3i_props.PropsUIPromptConsentFormTableViz(
+def extraction(x_zip: str) -> Generator[ExtractionStep, None, None]:
+    yield ExtractionStep(
+        to_df=ad_engagement_to_df,
+        args=(x_zip,),
+        members=["ad-engagements.js"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="x_ad_engagement",
-            data_frame=ad_engagement_to_df(x_zip),
             title=props.Translatable({
                 "en": "Your engagement with ads",
                 "nl": "Ad engagement"
@@ -324,9 +433,15 @@ def extraction(x_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
                 "nl": "Toont gegevens over uw interacties met advertenties op het platform"
             })
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=follower_to_df,
+        args=(x_zip,),
+        members=["follower.js"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="x_follower",
-            data_frame=follower_to_df(x_zip),
             title=props.Translatable({
                 "en": "Your followers",
                 "nl": "Follower"
@@ -336,9 +451,15 @@ def extraction(x_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
                 "nl": "Lijst van accounts die jouw profiel volgen"
             })
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=following_to_df,
+        args=(x_zip,),
+        members=["following.js"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="x_following",
-            data_frame=following_to_df(x_zip),
             title=props.Translatable({
                 "en": "Accounts you follow",
                 "nl": "Following"
@@ -348,9 +469,15 @@ def extraction(x_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
                 "nl": "Lijst van accounts die je volgt"
             })
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=block_to_df,
+        args=(x_zip,),
+        members=["/block.js"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="x_block",
-            data_frame=block_to_df(x_zip),
             title=props.Translatable({
                 "en": "Accounts you blocked",
                 "nl": "Block"
@@ -360,9 +487,15 @@ def extraction(x_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
                 "nl": "Lijst van accounts die je hebt geblokkeerd"
             })
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=like_to_df,
+        args=(x_zip,),
+        members=["like.js"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="x_like",
-            data_frame=like_to_df(x_zip),
             title=props.Translatable({
                 "en": "Posts that you liked",
                 "nl": "Like"
@@ -383,9 +516,15 @@ def extraction(x_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
                 }
             ]
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=tweets_to_df,
+        args=(x_zip,),
+        members=["/tweets.js"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="x_tweet",
-            data_frame=tweets_to_df(x_zip),
             title=props.Translatable({
                 "en": "Your tweets",
                 "nl": "Jouw Tweets"
@@ -406,9 +545,15 @@ def extraction(x_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
                 }
             ]
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=personalization_to_df,
+        args=(x_zip,),
+        members=["personalization.js"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="x_personalization",
-            data_frame=personalization_to_df(x_zip),
             title=props.Translatable({
                 "en": "Your personalization",
                 "nl": "Personalization"
@@ -418,9 +563,15 @@ def extraction(x_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
                 "nl": "Informatie over uw personalisatie-instellingen en voorkeuren"
             })
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=mute_to_df,
+        args=(x_zip,),
+        members=["mute.js"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="x_mute",
-            data_frame=mute_to_df(x_zip),
             title=props.Translatable({
                 "en": "Accounts you muted",
                 "nl": "Mute"
@@ -430,9 +581,15 @@ def extraction(x_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
                 "nl": "Lijst van accounts die je hebt gedempt"
             })
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=tweet_headers_to_df,
+        args=(x_zip,),
+        members=["/tweet-headers.js"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="x_tweet_headers",
-            data_frame=tweet_headers_to_df(x_zip),
             title=props.Translatable({
                 "en": "Tweet headers",
                 "nl": "Tweet headers"
@@ -442,9 +599,15 @@ def extraction(x_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
                 "nl": "Metadata-informatie over uw tweets"
             })
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=user_link_clicks_to_df,
+        args=(x_zip,),
+        members=["/user-link-clicks.js"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="x_user_link_clicks",
-            data_frame=user_link_clicks_to_df(x_zip),
             title=props.Translatable({
                 "en": "Links you clicked",
                 "nl": "User link clicks"
@@ -453,12 +616,8 @@ def extraction(x_zip: str) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
                 "en": "Record of links you've clicked on while using the platform",
                 "nl": "Overzicht van links waarop je hebt geklikt tijdens het gebruik van het platform"
             })
-        )
-    ]
-
-    # Filter out tables with empty dataframes
-    return [table for table in tables if not table.data_frame.empty]
-
+        ),
+    )
 
 
 class XFlow(FlowBuilder):
@@ -469,7 +628,7 @@ class XFlow(FlowBuilder):
         return validate.validate_zip(DDP_CATEGORIES, file)
         
     def extract_data(self, file_value, validation):
-        return extraction(file_value)
+        return self.extract_with_progress(extraction(file_value), file_value)
 
 
 def process(session_id):
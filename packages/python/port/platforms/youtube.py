@@ -6,15 +6,23 @@ This module provides an example flow of a YouTube data donation study
 Assumptions:
 It handles DDPs in the dutch and english language with filetype JSON.
 """
+from __future__ import annotations
+from functools import partial
+from typing import Generator, TYPE_CHECKING
 import logging
 
-import pandas as pd
+from port.helpers.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
 
 import port.api.props as props
 import port.api.d3i_props as d3i_props
 import port.helpers.extraction_helpers as eh
 import port.helpers.validate as validate
-from port.platforms.flow_builder import FlowBuilder
+from port.platforms.flow_builder import FlowBuilder, ExtractionStep
 
 from port.helpers.validate import (
     DDPCategory,
@@ -52,12 +60,12 @@ DDP_CATEGORIES = [
 def watch_history_to_df(zip: str, validation) -> pd.DataFrame:
     
     if validation.current_ddp_category.language == Language.NL:
-        b = eh.extract_file_from_zip(zip, "kijkgeschiedenis.json")
-        d = eh.read_json_from_bytes(b)
+        with eh.open_file_from_zip(zip, "kijkgeschiedenis.json") as b:
+            d = eh.read_json_from_bytes(b)
 
     elif validation.current_ddp_category.language == Language.EN:
-        b = eh.extract_file_from_zip(zip, "watch-history.json")
-        d = eh.read_json_from_bytes(b)
+        with eh.open_file_from_zip(zip, "watch-history.json") as b:
+            d = eh.read_json_from_bytes(b)
 
     else:
         d = {}
@@ -84,12 +92,12 @@ def watch_history_to_df(zip: str, validation) -> pd.DataFrame:
 def search_history_to_df(zip: str, validation) -> pd.DataFrame:
     
     if validation.current_ddp_category.language == Language.NL:
-        b = eh.extract_file_from_zip(zip, "zoekgeschiedenis.json")
-        d = eh.read_json_from_bytes(b)
+        with eh.open_file_from_zip(zip, "zoekgeschiedenis.json") as b:
+            d = eh.read_json_from_bytes(b)
 
     elif validation.current_ddp_category.language == Language.EN:
-        b = eh.extract_file_from_zip(zip, "search-history.json")
-        d = eh.read_json_from_bytes(b)
+        with eh.open_file_from_zip(zip, "search-history.json") as b:
+            d = eh.read_json_from_bytes(b)
 
     else:
         d = {}
@@ -125,16 +133,19 @@ def subscriptions_to_df(youtube_zip: str, validation) -> pd.DataFrame:
     else:
         file_name = ""
 
-    ratings_bytes = eh.extract_file_from_zip(youtube_zip, file_name)
-    df = eh.read_csv_from_bytes_to_df(ratings_bytes)
+    with eh.open_file_from_zip(youtube_zip, file_name) as ratings_bytes:
+        df = eh.read_csv_from_bytes_to_df(ratings_bytes)
     return df
 
 
-def extraction(zip: str, validation: ValidateInput) -> list[d3i_props.PropsUIPromptConsentFormTableViz]:
-    tables = [
-        d3i_props.PropsUIPromptConsentFormTableViz(
+def extraction(zip: str, validation: ValidateInput) -> Generator[ExtractionStep, None, None]:
+    yield ExtractionStep(
+        to_df=watch_history_to_df,
+        args=(zip, validation),
+        members=["kijkgeschiedenis.json", "watch-history.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="youtube_kijkgeschiedenis",
-            data_frame=watch_history_to_df(zip, validation),
             title=props.Translatable({
                 "nl": "Your watch history",
                 "en": "Your watch history"
@@ -155,9 +166,15 @@ def extraction(zip: str, validation: ValidateInput) -> list[d3i_props.PropsUIPro
                 }
             ]
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=search_history_to_df,
+        args=(zip, validation),
+        members=["zoekgeschiedenis.json", "search-history.json"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="youtube_zoekgeschiedenis",
-            data_frame=search_history_to_df(zip, validation),
             title=props.Translatable({
                 "nl": "Your search history",
                 "en": "Your search history"
@@ -178,9 +195,15 @@ def extraction(zip: str, validation: ValidateInput) -> list[d3i_props.PropsUIPro
                 }
             ]
         ),
-        d3i_props.PropsUIPromptConsentFormTableViz(
+    )
+
+    yield ExtractionStep(
+        to_df=subscriptions_to_df,
+        args=(zip, validation),
+        members=["abonnementen.csv", "subscriptions.csv"],
+        table=partial(
+            d3i_props.PropsUIPromptConsentFormTableViz,
             id="youtube_abonnementen",
-            data_frame=subscriptions_to_df(zip, validation),
             title=props.Translatable({
                 "nl": "Abonnementen",
                 "en": "Subscriptions"
@@ -189,10 +212,8 @@ def extraction(zip: str, validation: ValidateInput) -> list[d3i_props.PropsUIPro
                 "en": "List of YouTube channels you're subscribed to", 
                 "nl": "Lijst van YouTube-kanalen waarop je bent geabonneerd"
             })
-        )
-    ]
-    
-    return [table for table in tables if not table.data_frame.empty]
+        ),
+    )
 
 
 class YouTubeFlow(FlowBuilder):
@@ -203,7 +224,7 @@ class YouTubeFlow(FlowBuilder):
         return validate.validate_zip(DDP_CATEGORIES, file)
         
     def extract_data(self, file, validation):
-        return extraction(file, validation)
+        return self.extract_with_progress(extraction(file, validation), file)
 
 
 def process(session_id):
@@ -0,0 +1,153 @@
+"""
+Tests of following the visible path and the branches of ChatGPT conversations, and of selecting a question
+and its answer from them, see port.platforms.chatgpt
+"""
+import json
+import zipfile
+
+import pytest
+
+import port.platforms.chatgpt as chatgpt
+
+
+def node(node_id, parent, children, role=None, text=""):
+    message = None
+    if role is not None:
+        message = {"author": {"role": role}, "content": {"parts": [text]}, "create_time": 1700000000}
+    return {"id": node_id, "parent": parent, "children": children, "message": message}
+
+
+def branched_conversation(current_node="a2"):
+    """
+    root - q1 - a1
+              - a2 (regenerated answer, shown)
+         - q1b (edited question) - a1b
+    """
+    mapping = {
+        "root": node("root", None, ["q1", "q1b"]),
+        "q1": node("q1", "root", ["a1", "a2"], "user", "question"),
+        "a1": node("a1", "q1", [], "assistant", "first answer"),
+        "a2": node("a2", "q1", [], "assistant", "second answer"),
+        "q1b": node("q1b", "root", ["a1b"], "user", "edited question"),
+        "a1b": node("a1b", "q1b", [], "assistant", "answer to edit"),
+    }
+    conversation = {"title": "Conversation", "mapping": mapping}
+    if current_node is not None:
+        conversation["current_node"] = current_node
+    return conversation
+
+
+def test_visible_path_follows_current_node_to_the_root():
+    assert chatgpt.visible_path(branched_conversation("a2")) == ["root", "q1", "a2"]
+    assert chatgpt.visible_path(branched_conversation("a1b")) == ["root", "q1b", "a1b"]
+
+
+@pytest.mark.parametrize("current_node", [None, "missing"])
+def test_visible_path_falls_back_to_the_last_child_from_the_root(current_node):
+    assert chatgpt.visible_path(branched_conversation(current_node)) == ["root", "q1b", "a1b"]
+
+
+def test_visible_path_skips_children_missing_from_the_mapping():
+    conversation = branched_conversation(None)
+    conversation["mapping"]["q1b"]["children"].append("missing")
+
+    assert chatgpt.visible_path(conversation) == ["root", "q1b", "a1b"]
+
+
+def test_visible_path_stops_at_a_cycle_in_the_parents():
+    mapping = {
+        "a": node("a", "c", ["b"]),
+        "b": node("b", "a", ["c"]),
+        "c": node("c", "b", ["a"]),
+    }
+
+    assert chatgpt.visible_path({"mapping": mapping, "current_node": "c"}) == ["a", "b", "c"]
+
+
+def test_visible_path_without_a_root_is_empty():
+    mapping = {
+        "a": node("a", "b", ["b"]),
+        "b": node("b", "a", ["a"]),
+    }
+
+    assert chatgpt.visible_path({"mapping": mapping}) == []
+
+
+def test_visible_path_stops_at_a_cycle_in_the_children():
+    mapping = {
+        "root": node("root", None, ["a"]),
+        "a": node("a", "root", ["b"]),
+        "b": node("b", "a", ["a"]),
+    }
+
+    assert chatgpt.visible_path({"mapping": mapping}) == ["root", "a", "b"]
+
+
+def turns(conversation, branches=False):
+    return [(branch, turn["id"]) for branch, turn in chatgpt.conversation_turns(conversation, branches)]
+
+
+def test_conversation_turns_follow_the_visible_path():
+    assert turns(branched_conversation()) == [(0, "root"), (0, "q1"), (0, "a2")]
+
+
+def test_conversation_turns_with_branches():
+    assert turns(branched_conversation(), branches=True) == [
+        (0, "root"), (0, "q1"), (0, "a2"),
+        (1, "q1b"), (1, "a1b"),
+        (2, "a1"),
+    ]
+
+
+def test_conversation_turns_without_a_path_yield_every_node():
+    mapping = {
+        "a": node("a", "b", ["b"]),
+        "b": node("b", "a", ["a"]),
+    }
+
+    assert turns({"mapping": mapping}, branches=True) == [(0, "a"), (0, "b")]
+
+
+def test_conversations_to_df(tmp_path):
+    path = tmp_path / "chatgpt.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("conversations.json", json.dumps([branched_conversation()]))
+
+    df = chatgpt.conversations_to_df(str(path))
+    assert df["message"].tolist() == ["question", "second answer"]
+    assert "branch" not in df.columns
+
+    df = chatgpt.conversations_to_df(str(path), branches=True)
+    assert df[["branch", "message"]].values.tolist() == [
+        [0, "question"],
+        [0, "second answer"],
+        [1, "edited question"],
+        [1, "answer to edit"],
+        [2, "first answer"],
+    ]
+
+
+def write_conversations(path, conversations):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("conversations.json", json.dumps(conversations))
+    return str(path)
+
+
+def two_turn_conversation(first_role, second_role):
+    mapping = {
+        "root": node("root", None, ["q"]),
+        "q": node("q", "root", ["a"], first_role, "question"),
+        "a": node("a", "q", [], second_role, "answer"),
+    }
+    return {"title": "Conversation", "mapping": mapping, "current_node": "a"}
+
+
+def test_select_random_qa_takes_the_first_question_and_its_answer(tmp_path):
+    path = write_conversations(tmp_path / "chatgpt.zip", [branched_conversation()])
+    assert chatgpt.select_random_qa(path) == ("question", "second answer")
+
+
+@pytest.mark.parametrize("first_role, second_role", [("user", "tool"), ("user", "user"), ("assistant", "user")])
+def test_select_random_qa_requires_a_user_question_and_an_assistant_answer(tmp_path, first_role, second_role):
+    path = write_conversations(tmp_path / "chatgpt.zip", [two_turn_conversation(first_role, second_role)])
+    assert chatgpt.select_random_qa(path) == ("", "")
@@ -0,0 +1,59 @@
+"""
+Tests of donating in sequenced, checksummed parts and reassembling the parts, see port_helpers.donate_in_parts
+"""
+import hashlib
+import json
+
+import pytest
+
+import port.helpers.port_helpers as ph
+from port.batch import reassemble
+
+
+def donations(key, json_string, max_part_bytes):
+    commands = [command.toDict() for command in ph.donate_in_parts(key, json_string, max_part_bytes)]
+    return {command["key"]: command["json_string"] for command in commands}
+
+
+def test_small_donation_is_donated_unchanged():
+    assert donations("session", '{"a": 1}', 1024) == {"session": '{"a": 1}'}
+
+
+def test_parts_are_within_budget_and_do_not_split_characters():
+    json_string = json.dumps([{"text": "café ☕ 𝄞 " * 20}], ensure_ascii=False)
+    donated = donations("session", json_string, 16)
+
+    manifest = json.loads(donated.pop("session-manifest"))
+    assert list(donated) == [f"session-part-{n}" for n in range(1, len(donated) + 1)]
+    assert all(len(part.encode("utf-8")) <= 16 for part in donated.values())
+    assert "".join(donated.values()) == json_string
+
+    assert manifest["key"] == "session"
+    assert manifest["number_of_parts"] == len(donated)
+    assert manifest["bytes"] == len(json_string.encode("utf-8"))
+    assert manifest["sha256"] == hashlib.sha256(json_string.encode("utf-8")).hexdigest()
+    for part in manifest["parts"]:
+        part_bytes = donated[part["key"]].encode("utf-8")
+        assert part["bytes"] == len(part_bytes)
+        assert part["sha256"] == hashlib.sha256(part_bytes).hexdigest()
+
+
+def test_part_budget_below_largest_character_is_rejected():
+    with pytest.raises(ValueError):
+        list(ph.donate_in_parts("session", "𝄞" * 10, 3))
+
+
+def test_reassemble_restores_donations():
+    json_string = json.dumps({"rows": list(range(100))})
+    donated = donations("session", json_string, 32)
+    donated["other"] = "[]"
+
+    assert reassemble(donated) == {"session": json_string, "other": "[]"}
+
+
+def test_reassemble_rejects_a_changed_part():
+    donated = donations("session", json.dumps({"rows": list(range(100))}), 32)
+    donated["session-part-2"] = donated["session-part-2"][::-1]
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        reassemble(donated)
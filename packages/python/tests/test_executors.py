@@ -0,0 +1,57 @@
+"""
+Tests of the executors that run extraction steps, see port.helpers.executors
+"""
+import pytest
+
+import port.helpers.executors as executors
+
+
+def test_deferred_future_runs_when_its_result_is_requested():
+    calls = []
+    with executors.SequentialExecutor() as executor:
+        first = executor.submit(calls.append, "first")
+        second = executor.submit(calls.append, "second")
+        assert calls == []
+
+        second.result()
+        first.result()
+        assert calls == ["second", "first"]
+
+
+def test_deferred_future_runs_once():
+    calls = []
+    future = executors.SequentialExecutor().submit(lambda: calls.append(1) or len(calls))
+
+    assert future.result() == 1
+    assert future.result() == 1
+    assert calls == [1]
+
+
+def test_deferred_future_passes_arguments():
+    future = executors.SequentialExecutor().submit(sorted, [3, 1, 2], reverse=True)
+    assert future.result() == [3, 2, 1]
+
+
+def test_deferred_future_raises_the_exception_of_its_call():
+    future = executors.SequentialExecutor().submit(int, "not a number")
+
+    assert isinstance(future.exception(), ValueError)
+    with pytest.raises(ValueError):
+        future.result()
+
+
+@pytest.mark.parametrize("kind", [executors.SEQUENTIAL, executors.THREAD])
+def test_create_executor_keeps_the_order_of_the_steps(kind):
+    with executors.create_executor(kind, max_workers=2) as executor:
+        futures = [executor.submit(pow, i, 2) for i in range(10)]
+        assert [future.result() for future in futures] == [i ** 2 for i in range(10)]
+
+
+def test_create_executor_rejects_unknown_kinds():
+    with pytest.raises(ValueError):
+        executors.create_executor("fibers")
+
+
+def test_create_executor_is_sequential_in_pyodide(monkeypatch):
+    monkeypatch.setattr(executors, "is_pyodide", lambda: True)
+    assert isinstance(executors.create_executor(executors.PROCESS), executors.SequentialExecutor)
@@ -0,0 +1,73 @@
+"""
+Tests of the streaming JSON array reader, see port.helpers.json_stream
+"""
+import io
+import json
+
+import pytest
+
+from port.helpers.json_stream import iter_array, project
+
+ARRAY = [
+    12345, -2.5e10, 1e-3, 0, -7, 3.25,
+    {"n": 6789012345, "text": "café ☕", "nested": [1.5, -0.25e2]},
+    [], "]", None,
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64])
+def test_numbers_split_over_chunks_are_read_whole(chunk_size):
+    text = "window.YTD.tweets.part0 = " + json.dumps(ARRAY, ensure_ascii=False)
+    stream = io.BytesIO(text.encode("utf-8"))
+
+    assert list(iter_array(stream, chunk_size=chunk_size)) == ARRAY
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 64])
+def test_numbers_at_the_end_of_the_stream(chunk_size):
+    stream = io.BytesIO(b"[1, 22, 333e3, 4444.5]")
+    assert list(iter_array(stream, chunk_size=chunk_size)) == [1, 22, 333e3, 4444.5]
+
+
+def test_byte_order_mark_and_whitespace_are_skipped():
+    stream = io.BytesIO(b"\xef\xbb\xbf \n[ \n{\"a\": 1} ,\n {\"a\": 2}\n ]\n")
+    assert list(iter_array(stream, chunk_size=2)) == [{"a": 1}, {"a": 2}]
+
+
+def test_empty_array():
+    assert list(iter_array(io.BytesIO(b"x = [ ]"))) == []
+
+
+def test_elements_are_projected_to_paths():
+    stream = io.BytesIO(b'[{"tweet": {"id": "1", "urls": [{"url": "a"}]}}, {"tweet": {}}]')
+    paths = [("tweet", "id"), ("tweet", "urls", 0, "url")]
+
+    assert list(iter_array(stream, paths, chunk_size=3)) == [("1", "a"), (None, None)]
+
+
+def test_project_returns_default_for_missing_paths():
+    item = {"a": [{"b": 1}]}
+    assert project(item, ("a", 0, "b")) == 1
+    assert project(item, ("a", -1, "b")) == 1
+    assert project(item, ("a", 1, "b"), default="") == ""
+    assert project(item, ("a", "b")) is None
+    assert project(item, ()) is item
+
+
+def test_stream_without_array_raises():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_array(io.BytesIO(b'{"a": 1}'), chunk_size=2))
+
+
+def test_invalid_array_raises_after_the_valid_elements():
+    elements = iter_array(io.BytesIO(b'[{"a": 1}, {"a": 2} {"a": 3}]'), chunk_size=4)
+
+    assert next(elements) == {"a": 1}
+    assert next(elements) == {"a": 2}
+    with pytest.raises(json.JSONDecodeError):
+        next(elements)
+
+
+def test_truncated_array_raises():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_array(io.BytesIO(b'[{"a": 1}, {"a": '), chunk_size=4))
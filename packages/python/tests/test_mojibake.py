@@ -0,0 +1,137 @@
+"""
+Tests of the repair of Meta mojibake while decoding JSON, see port.helpers.extraction_helpers.fix_mojibake
+"""
+import codecs
+import io
+import json
+
+import pytest
+
+import port.helpers.extraction_helpers as eh
+
+
+def meta_escape(text):
+    """
+    Escapes text the way Meta does: every UTF-8 byte of a non-ASCII character becomes a \\u00XX escape
+    """
+    return "".join(
+        char if ord(char) < 0x80 else "".join(f"\\u00{byte:02x}" for byte in char.encode("utf-8"))
+        for char in text
+    )
+
+
+def fix_per_string(data):
+    """
+    The repair as it was done before, with fix_latin1_string on every string
+    """
+    if isinstance(data, dict):
+        return {fix_per_string(key): fix_per_string(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [fix_per_string(value) for value in data]
+    if isinstance(data, str):
+        return eh.fix_latin1_string(data)
+    return data
+
+
+TEXTS = [
+    "café",
+    "naïve façade",
+    "Ελληνικά",
+    "日本語のテキスト",
+    "emoji 😀👍🏽",
+    "ascii only",
+    "",
+]
+
+
+def test_fix_mojibake_docstring_example():
+    assert eh.fix_mojibake('{"name": "caf\\u00c3\\u00a9"}') == '{"name": "café"}'
+
+
+def test_fix_mojibake_without_byte_escapes_returns_the_text():
+    text = '{"name": "plain", "snowman": "\\u2603"}'
+    assert eh.fix_mojibake(text) is text
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_fix_mojibake_repairs_meta_escapes(text):
+    json_text = '{"value": "' + meta_escape(text) + '"}'
+    assert json.loads(eh.fix_mojibake(json_text)) == {"value": text}
+
+
+def test_fix_mojibake_keeps_runs_that_are_not_utf8():
+    # \u00e9 alone is a latin1 é, not the first byte of a valid UTF-8 sequence
+    json_text = '{"a": "caf\\u00e9", "b": "caf\\u00c3\\u00a9"}'
+    fixed = eh.fix_mojibake(json_text)
+
+    assert fixed == '{"a": "caf\\u00e9", "b": "café"}'
+    assert json.loads(fixed) == {"a": "café", "b": "café"}
+
+
+def test_fix_mojibake_keeps_escaped_backslashes():
+    # The string is a backslash followed by the text u00c3u00a9, it contains no escapes to repair
+    json_text = '{"path": "\\\\u00c3\\\\u00a9", "name": "\\\\\\u00c3\\u00a9"}'
+    fixed = eh.fix_mojibake(json_text)
+
+    assert json.loads(fixed) == {"path": "\\u00c3\\u00a9", "name": "\\é"}
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_fix_mojibake_matches_fix_latin1_string(text):
+    json_text = json.dumps({"key " + meta_escape(text): [meta_escape(text), {"nested": meta_escape(text)}]})
+    data = json.loads(json_text.replace("\\\\u00", "\\u00"))
+
+    assert json.loads(eh.fix_mojibake(json_text.replace("\\\\u00", "\\u00"))) == fix_per_string(data)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_decode_meta_json_fast_path(text):
+    json_bytes = ('{"value": "' + meta_escape(text) + '"}').encode("utf-8")
+    assert json.loads(eh.decode_meta_json(json_bytes)) == {"value": text}
+
+
+@pytest.mark.parametrize("other", ["\\u2603", "\\u0022", "\\u005c", "\\n", "\\\""])
+def test_decode_meta_json_with_other_escapes(other):
+    json_text = '{"value": "caf\\u00c3\\u00a9 ' + other + '"}'
+    expected = {"value": "café " + json.loads('"' + other + '"')}
+
+    assert json.loads(eh.decode_meta_json(json_text.encode("utf-8"))) == expected
+
+
+def test_decode_meta_json_keeps_escaped_backslashes():
+    json_bytes = b'{"path": "C:\\\\u00c3\\\\u00a9", "name": "caf\\u00c3\\u00a9"}'
+    assert json.loads(eh.decode_meta_json(json_bytes)) == {"path": "C:\\u00c3\\u00a9", "name": "café"}
+
+
+def test_decode_meta_json_keeps_runs_that_are_not_utf8():
+    json_bytes = b'{"a": "caf\\u00e9", "b": "caf\\u00c3\\u00a9"}'
+    assert json.loads(eh.decode_meta_json(json_bytes)) == {"a": "café", "b": "café"}
+
+
+def test_decode_meta_json_with_raw_utf8():
+    json_bytes = '{"raw": "café", "escaped": "caf\\u00c3\\u00a9"}'.encode("utf-8")
+    assert json.loads(eh.decode_meta_json(json_bytes)) == {"raw": "café", "escaped": "café"}
+
+
+def test_decode_meta_json_utf8_sig():
+    json_bytes = codecs.BOM_UTF8 + b'{"name": "caf\\u00c3\\u00a9"}'
+    assert json.loads(eh.decode_meta_json(json_bytes, "utf-8-sig")) == {"name": "café"}
+
+
+@pytest.mark.parametrize("encoding", ["utf-16", "utf-16-le", "utf-32"])
+def test_decode_meta_json_other_encodings(encoding):
+    json_bytes = '{"name": "caf\\u00c3\\u00a9"}'.encode(encoding)
+    assert json.loads(eh.decode_meta_json(json_bytes, encoding)) == {"name": "café"}
+
+
+@pytest.mark.parametrize("prefix, encoding", [(b"", "utf-8"), (codecs.BOM_UTF8, "utf-8"), (b"", "utf-16")])
+def test_read_json_from_bytes_repair_mojibake(prefix, encoding):
+    json_text = '[{"title": "' + meta_escape("Ελληνικά café") + '", "n": 1}]'
+    buffer = io.BytesIO(prefix + json_text.encode(encoding))
+
+    assert eh.read_json_from_bytes(buffer, repair_mojibake=True) == [{"title": "Ελληνικά café", "n": 1}]
+
+
+def test_read_json_from_bytes_without_repair():
+    buffer = io.BytesIO(b'{"name": "caf\\u00c3\\u00a9"}')
+    assert eh.read_json_from_bytes(buffer) == {"name": "cafÃ©"}
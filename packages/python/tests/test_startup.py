@@ -0,0 +1,30 @@
+"""
+Guards the import graph before the first prompt, see benchmarks/startup.py
+"""
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+import port.platforms.registry as registry
+
+PACKAGE_DIR = Path(__file__).parent.parent
+
+# The wall time depends on the machine, only the import graph is guarded here
+MAX_SECONDS = 10.0
+
+
+@pytest.mark.parametrize("platform", registry.names())
+def test_startup_within_budget(platform):
+    completed = subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.startup",
+            "--platform", platform,
+            "--repeat", "1",
+            "--max-seconds", str(MAX_SECONDS),
+        ],
+        capture_output=True, text=True, cwd=PACKAGE_DIR,
+    )
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    assert "Within budget" in completed.stdout
@@ -0,0 +1,282 @@
+"""
+Tests of declarative table specs, see port.helpers.table_spec
+
+The golden tables in data/facebook_tables.json were extracted from write_facebook_zip() by the Facebook extractors
+as they were before they were replaced by table specs. The five extractors that referenced the undefined
+datapoints_sorted, and always returned an empty table, were run with datapoints instead:
+comments, group posts and comments, comments in groups, event responses and saved items.
+"""
+from pathlib import Path
+import json
+import logging
+import zipfile
+
+import pytest
+
+import port.helpers.extraction_helpers as eh
+import port.helpers.sampling as sampling
+import port.platforms.facebook as facebook
+from port.helpers.table_spec import Column, TableSpec, compile_columns
+from benchmarks import generators
+
+GOLDEN = Path(__file__).parent / "data" / "facebook_tables.json"
+
+FACEBOOK_TABLES = [
+    "who_youve_followed_to_df",
+    "news_your_locations_to_df",
+    "notifications_to_df",
+    "content_sharing_you_have_created_to_df",
+    "facebook_reels_usage_to_df",
+    "last_28_days_to_df",
+    "your_search_history_to_df",
+    "your_friends_to_df",
+    "ads_interests_to_df",
+    "recently_viewed_to_df",
+    "recently_visited_to_df",
+    "profile_update_history_to_df",
+    "your_event_responses_to_df",
+    "group_posts_and_comments_to_df",
+    "your_answers_to_membership_questions_to_df",
+    "your_comments_in_groups_to_df",
+    "your_group_membership_activity_to_df",
+    "pages_and_profiles_you_follow_to_df",
+    "pages_youve_liked_to_df",
+    "your_saved_items_to_df",
+    "comments_to_df",
+    "likes_and_reactions_to_df",
+    "your_comment_active_days_to_df",
+    "your_pages_to_df",
+    "story_reactions_to_df",
+    "your_posts_check_ins_to_df",
+]
+
+
+def mojibake(text):
+    return text.encode("utf-8").decode("latin1")
+
+
+# Members the generator does not write, with values of other types and missing keys
+FACEBOOK_EXTRA = {
+    "extra/facebook_news/your_locations.json": {"news_your_locations_v2": ["Amsterdam", mojibake("Zürich")]},
+    "extra/content_sharing_links_you_have_created.json": [
+        {"label_values": [{"href": "http://example.com", "timestamp": 1600000000}]},
+        {"other": {"timestamp": "1700000000.5"}},
+    ],
+    "extra/facebook_reels_usage_information.json": {"label_values": [
+        {"dict": [{"label": "Views", "value": 3}, {"label": "Other", "value": {"nested": 1}}]},
+    ]},
+    "extra/your_facebook_watch_activity_in_the_last_28_days.json": {"activity": [{"value": "12"}]},
+    "extra/recently_visited.json": {"visited_things_v2": [
+        {"name": "Profiles", "entries": [
+            {"data": {"name": mojibake("Jörg"), "uri": "https://example.com"}, "timestamp": 1},
+            {"timestamp": None},
+        ]},
+        {"name": "No entries"},
+    ]},
+    "extra/profile_update_history.json": {"profile_updates_v2": [{"title": "Title", "timestamp": 99999999999999}]},
+    "extra/your_event_responses.json": {"event_responses_v2": {"events_joined": [
+        {"name": mojibake("Fête"), "start_timestamp": 1},
+        {"start_timestamp": 2},
+    ]}},
+    "extra/group_posts_and_comments.json": {"group_posts_v2": [
+        {
+            "title": "Group post",
+            "data": [{"post": "Post"}],
+            "timestamp": 2,
+            "attachments": [{"data": [{"external_context": {"url": "https://example.com"}}]}],
+        },
+        {"title": "Without post"},
+    ]},
+    "extra/your_answers_to_membership_questions.json": {"group_membership_questions_answers_v2": {
+        "group_answers": [{"group_name": "Group"}, {}],
+    }},
+    "extra/your_comments_in_groups.json": {"group_comments_v2": [
+        {"title": "Title", "data": [{"comment": {"comment": "Comment", "group": "Group"}}], "timestamp": 3},
+    ]},
+    "extra/your_saved_items.json": {"saves_v2": [{"title": "Saved", "timestamp": 4}, {"title": "Undated"}]},
+    "extra/likes_and_reactions_2.json": [
+        {"title": "Second part", "data": [{"reaction": {"reaction": "LIKE"}}], "timestamp": 8},
+    ],
+    "extra/likes_and_reactions_3.json": [],
+    "extra/likes_and_reactions_4.json": [{"title": "After an empty part"}],
+    "extra/your_comment_active_days.json": {"label_values": [{"label": "Days", "value": 1}, {"label": "Weeks"}]},
+    "extra/your_pages.json": {"pages_v2": [{"name": "Page", "url": "https://example.com", "timestamp": 6}]},
+    "extra/story_reactions.json": {"stories_feedback_v2": [{"title": "Story"}]},
+}
+
+
+def write_facebook_zip(path):
+    generators.facebook(str(path), 5)
+    with zipfile.ZipFile(path, "a") as zf:
+        for name, content in FACEBOOK_EXTRA.items():
+            zf.writestr(name, json.dumps(content))
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def facebook_zip(tmp_path_factory):
+    return write_facebook_zip(tmp_path_factory.mktemp("facebook") / "facebook.zip")
+
+
+@pytest.fixture(autouse=True)
+def quiet_extraction_errors(caplog):
+    caplog.set_level(logging.CRITICAL)
+
+
+def write_zip(path, members):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, content in members.items():
+            zf.writestr(name, json.dumps(content))
+    return str(path)
+
+
+RECORDS = [
+    {"title": "a", "data": [{"comment": {"comment": "deep", "title": "nested title"}}], "timestamp": 1},
+    {"data": [{"comment": {"comment": "only nested"}}], "attachments": [{"data": [{"title": "x", "url": "u"}]}]},
+    {"label_values": [{"label": "first"}, {"label": "second"}], "unread": True, "value": None},
+    {"timestamp": 1.5, "other": {"value": 0}},
+    {},
+]
+
+
+@pytest.mark.parametrize("find", ["title", "comment-comment", "label", "timestamp", "value", "unread", "url", "absent"])
+def test_find_columns_match_find_item(find):
+    extract = compile_columns((Column("Value", find=find),))
+
+    expected = [eh.find_item(eh.dict_denester(record), find) for record in RECORDS]
+    assert extract(RECORDS) == [expected]
+
+
+def test_find_is_least_nested_match_as_string():
+    extract = compile_columns((
+        Column("Title", find="title"),
+        Column("Comment", find="comment-comment"),
+        Column("Unread", find="unread"),
+        Column("Missing", find="absent"),
+    ))
+
+    assert extract(RECORDS[:3]) == [
+        ["a", "x", ""],
+        ["deep", "only nested", ""],
+        ["", "", "True"],
+        ["", "", ""],
+    ]
+
+
+def test_path_columns():
+    records = [
+        {"name": "a", "entry": {"data": [{"uri": "u"}], "timestamp": 1}},
+        {"name": "b", "entry": {"data": []}},
+        "not a dict",
+    ]
+    extract = compile_columns((
+        Column("Name", ("name",)),
+        Column("Uri", ("entry", "data", 0, "uri"), default=None),
+        Column("Timestamp", ("entry", "timestamp"), default=0),
+        Column("Record"),
+    ))
+
+    assert extract(records) == [
+        ["a", "b", ""],
+        ["u", None, None],
+        [1, 0, 0],
+        records,
+    ]
+
+
+def test_spec_has_the_name_of_its_extractor():
+    spec = TableSpec(name="items_to_df", member="items.json", columns=(Column("Name", ("name",)),))
+    assert spec.__name__ == "items_to_df"
+
+
+def test_transform_is_applied_to_whole_columns_of_all_parts(tmp_path):
+    path = write_zip(tmp_path / "ddp.zip", {
+        "items_1.json": [{"n": 1}, {"n": 2}],
+        "items_2.json": [{"n": 3}],
+    })
+    calls = []
+
+    def double(series):
+        calls.append(series.tolist())
+        return series * 2
+
+    spec = TableSpec(
+        name="items_to_df",
+        member="items_{}.json",
+        parts=True,
+        columns=(Column("N", ("n",), transform=double),),
+    )
+
+    assert spec(path)["N"].tolist() == [2, 4, 6]
+    assert calls == [[1, 2, 3]]
+
+
+def test_parts_are_read_until_a_part_is_missing_or_empty(tmp_path):
+    path = write_zip(tmp_path / "ddp.zip", {
+        "items_1.json": [{"n": 1}],
+        "items_2.json": [{"n": 2}],
+        "items_3.json": [],
+        "items_4.json": [{"n": 4}],
+    })
+    spec = TableSpec(name="items_to_df", member="items_{}.json", parts=True, columns=(Column("N", ("n",)),))
+
+    assert spec(path)["N"].tolist() == [1, 2]
+
+
+def test_root_and_records(tmp_path):
+    path = write_zip(tmp_path / "ddp.zip", {
+        "items.json": {"items_v2": {"groups": [{"entries": [{"n": 1}, {"n": 2}]}, {"entries": [{"n": 3}]}]}},
+    })
+    spec = TableSpec(
+        name="items_to_df",
+        member="items.json",
+        root=("items_v2", "groups"),
+        records=lambda groups: (entry for group in groups for entry in group["entries"]),
+        columns=(Column("N", ("n",)),),
+    )
+
+    assert spec(path)["N"].tolist() == [1, 2, 3]
+
+
+@pytest.mark.parametrize("members", [{}, {"items.json": {"other": []}}, {"items.json": {"items_v2": 1}}])
+def test_missing_member_or_structure_is_an_empty_table(tmp_path, members):
+    path = write_zip(tmp_path / "ddp.zip", members)
+    spec = TableSpec(name="items_to_df", member="items.json", root=("items_v2",), columns=(Column("N", ("n",)),))
+
+    assert spec(path).empty
+
+
+def test_records_are_sampled_before_extraction(tmp_path):
+    path = write_zip(tmp_path / "ddp.zip", {
+        "items_1.json": [{"n": i} for i in range(6)],
+        "items_2.json": [{"n": i} for i in range(6, 10)],
+    })
+    spec = TableSpec(name="items_to_df", member="items_{}.json", parts=True, columns=(Column("N", ("n",)),))
+
+    df = spec(path, max_rows=4)
+    assert df["N"].tolist() == [0, 1, 8, 9]
+    assert sampling.total_rows(df) == 10
+
+    df = spec(path, max_rows=20)
+    assert len(df) == 10
+    assert sampling.total_rows(df) == 10
+
+
+@pytest.mark.parametrize("name", FACEBOOK_TABLES)
+def test_facebook_tables_match_golden_tables(facebook_zip, name):
+    with open(GOLDEN, encoding="utf-8") as f:
+        golden = json.load(f)[name]
+
+    df = getattr(facebook, name)(facebook_zip)
+    assert list(df.columns) == golden["columns"]
+    assert df.to_dict("records") == golden["records"]
+
+
+@pytest.mark.parametrize("name", FACEBOOK_TABLES)
+def test_facebook_tables_of_an_invalid_zip_have_no_values(tmp_path, name):
+    # last_28_days_to_df denests the whole document, it has a single row of "" like before
+    path = write_zip(tmp_path / "ddp.zip", {"unrelated.json": {}})
+    df = getattr(facebook, name)(path)
+
+    assert len(df) <= 1
+    assert (df == "").all().all()
@@ -0,0 +1,75 @@
+"""
+Tests of the cached central directory index of zip files, see port.helpers.zip_index
+"""
+import os
+import zipfile
+
+import pytest
+
+import port.helpers.zip_index as zip_index
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    zip_index.clear_cache()
+    yield
+    zip_index.clear_cache()
+
+
+def write_zip(path, members):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, content in members.items():
+            zf.writestr(name, content)
+    return str(path)
+
+
+def test_index_is_cached_per_path(tmp_path):
+    path = write_zip(tmp_path / "ddp.zip", {"data/a.json": "[]"})
+
+    index = zip_index.get_index(path)
+    assert zip_index.get_index(path) is index
+    assert zip_index.get_index(os.path.relpath(path)) is index
+    assert index.names == ["data/a.json"]
+    assert index.find("a.json").filename == "data/a.json"
+
+
+def test_index_is_rebuilt_when_the_file_changes(tmp_path):
+    path = write_zip(tmp_path / "ddp.zip", {"a.json": "[]"})
+    index = zip_index.get_index(path)
+
+    write_zip(path, {"b.json": "[]"})
+    # the same size and modification time would go unnoticed if the file was replaced in the same tick
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, index.stat_key[3] + 1_000_000_000))
+
+    assert not index.is_current()
+    rebuilt = zip_index.get_index(path)
+    assert rebuilt is not index
+    assert rebuilt.names == ["b.json"]
+
+
+def test_index_is_not_current_in_another_process(tmp_path, monkeypatch):
+    index = zip_index.get_index(write_zip(tmp_path / "ddp.zip", {"a.json": "[]"}))
+    monkeypatch.setattr(os, "getpid", lambda: index.pid + 1)
+
+    assert not index.is_current()
+
+
+def test_least_recently_used_index_is_evicted(tmp_path):
+    paths = [write_zip(tmp_path / f"ddp{i}.zip", {"a.json": "[]"}) for i in range(zip_index.CACHE_SIZE + 1)]
+    first = zip_index.get_index(paths[0])
+    for path in paths[1:]:
+        zip_index.get_index(path)
+
+    assert zip_index.get_index(paths[0]) is not first
+
+
+def test_clear_cache_closes_the_indexes(tmp_path):
+    path = write_zip(tmp_path / "ddp.zip", {"a.json": "[]"})
+    index = zip_index.get_index(path)
+
+    zip_index.clear_cache()
+
+    assert zip_index.get_index(path) is not index
+    with pytest.raises(ValueError):
+        index.read(index.infos[0])